@@ -2,6 +2,8 @@ from flask import Flask
 from flask_cors import CORS
 import logging
 from routes import routes  # Import after initializing Flask
+import inference_engine
+import metrics
 
 # Enable full error logging
 logging.basicConfig(level=logging.DEBUG)
@@ -15,6 +17,21 @@ CORS(app)
 # Register routes
 app.register_blueprint(routes)
 
+# In-flight requests and request time for /metrics
+metrics.instrument_app(app)
+
+# Live webcam streaming over WebSocket (optional: needs flask-sock)
+try:
+    from routes_stream import sock
+    sock.init_app(app)
+except ImportError:
+    print("[WARNING] flask-sock not installed, /stream is disabled.")
+
+# Warm up the resident models so the first request is not slower than the rest
+inference_engine.warm_up()
+
 # Run the Flask app
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Each request works in its own job folder, so requests can be served concurrently.
+    # In production use several workers, e.g. `gunicorn -w 4 --threads 4 app:app`.
+    app.run(debug=True, threaded=True)
@@ -1,7 +1,8 @@
 from flask import Flask
 from flask_cors import CORS
 import logging
-from routes_arduino import routes  # Import after initializing Flask
+from routes_arduino import routes, get_serial  # Import after initializing Flask
+import inference_engine
 
 # Enable full error logging
 logging.basicConfig(level=logging.DEBUG)
@@ -15,6 +16,12 @@ CORS(app)
 # Register routes from routes.py
 app.register_blueprint(routes)
 
+# Warm up the resident models so the first request is not slower than the rest
+inference_engine.warm_up()
+
+# Open the serial port now: the board resets on open, better at startup than on the first /arduino/start
+get_serial()
+
 # Run the Flask app
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,28 @@
+import numpy as np
+
+# ==========================
+# 🔹 Batched Frame Inference
+# ==========================
+# Calling model.predict once per 64x64 frame pays Keras' full per-call
+# overhead on every frame. A whole stream is loaded as one array
+# (image_loader.load_frames) and run through one forward pass per micro-batch.
+
+MAX_BATCH_SIZE = 256  # Largest number of frames sent through the model in one pass (None = whole stream)
+
+def predict_classes(model, batch, max_batch_size=MAX_BATCH_SIZE):
+    """Runs one forward pass per micro-batch and returns the argmax class of every frame, in order."""
+    if len(batch) == 0:
+        return []
+
+    step = max_batch_size or len(batch)
+    preds = []
+    for start in range(0, len(batch), step):
+        probs = np.asarray(model.predict_on_batch(batch[start:start + step]))
+        preds.extend(int(p) for p in np.argmax(probs, axis=1))
+    return preds
+
+def majority_vote(preds):
+    """Most frequent class, picked exactly like the per-frame loop did. None if there are no predictions."""
+    if not preds:
+        return None
+    return max(set(preds), key=preds.count)
@@ -0,0 +1,65 @@
+import numpy as np
+
+# ==========================
+# 🔹 Vectorized Landmark Cropping
+# ==========================
+# MediaPipe landmark lists are converted to a NumPy array once and the crop
+# box is found with array min/max instead of a Python loop per landmark.
+# Shared by baara_preprocessing.feature_extract and preprocessing.feature_extract.
+
+PADDING = 30  # Padding around detected features
+
+# Holistic result attribute for each stream
+LANDMARK_FIELDS = {
+    "face": "face_landmarks",
+    "right_hand": "right_hand_landmarks",
+    "left_hand": "left_hand_landmarks",
+}
+
+def landmarks_to_array(landmarks):
+    """Normalized (x, y) of every landmark as an (N, 2) float64 array (float64 keeps int() truncation identical)."""
+    points = landmarks.landmark
+    coords = np.fromiter((c for lm in points for c in (lm.x, lm.y)), dtype=np.float64, count=2 * len(points))
+    return coords.reshape(-1, 2)
+
+def raw_box(points, w, h):
+    """
+    Pixel bounding box (x_min, y_min, x_max, y_max) of normalized points, without padding.
+    Matches the old per-landmark loop: int() truncation, starting from (w, h, 0, 0).
+    """
+    xs = (points[:, 0] * w).astype(np.int64)
+    ys = (points[:, 1] * h).astype(np.int64)
+    return min(w, int(xs.min())), min(h, int(ys.min())), max(0, int(xs.max())), max(0, int(ys.max()))
+
+def pad_box(box, w, h, padding=PADDING):
+    """Grows a box by padding on every side, clipped to the frame."""
+    x_min, y_min, x_max, y_max = box
+    return max(0, x_min - padding), max(0, y_min - padding), min(w, x_max + padding), min(h, y_max + padding)
+
+def landmark_box(points, w, h, padding=PADDING):
+    """Padded, clipped pixel box around normalized points."""
+    return pad_box(raw_box(points, w, h), w, h, padding)
+
+def crop_box(frame, box):
+    """Crops box out of frame. Returns None if the crop is empty."""
+    x_min, y_min, x_max, y_max = box
+    crop = frame[y_min:y_max, x_min:x_max]
+    return crop if crop.size > 0 else None
+
+def crop_features(frame, results, padding=PADDING, streams=None):
+    """
+    Crops every stream (or only the given streams) out of one frame from its Holistic results.
+    Returns {"face", "right_hand", "left_hand"} -> (crop or None, box or None).
+    """
+    h, w = frame.shape[:2]
+    crops = {}
+    for stream, field in LANDMARK_FIELDS.items():
+        if streams is not None and stream not in streams:
+            continue
+        landmarks = getattr(results, field)
+        if not landmarks:
+            crops[stream] = (None, None)
+            continue
+        box = landmark_box(landmarks_to_array(landmarks), w, h, padding)
+        crops[stream] = (crop_box(frame, box), box)
+    return crops
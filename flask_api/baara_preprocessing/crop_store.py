@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+from baara_preprocessing import feature_extract
+from baara_preprocessing.feature_extract import sampling_interval
+from baara_preprocessing.image_ops import MODEL_FRAME_SIZE, sharpen_frame, resize_frame
+from baara_preprocessing.video_io import VideoReader
+from baara_preprocessing.detections import DETECTIONS_FILE, load_detections
+
+# ==========================
+# 🔹 Compact Crop Store
+# ==========================
+# Alternative to the frames/ + preprocessed/ JPEG folders: one file per stream
+# (<folder>/<stream>.crops.npy) holding a record per sampled frame:
+#   frame_index  int32    index in the extracted feature video
+#   timestamp    float64  seconds into the clip
+#   pixels       uint8    64x64 grayscale model input (before /255)
+# Records are appended as frames are produced and the header is patched with
+# the final count on close, so the file is a plain .npy that the predictors
+# memory-map. With compress=True it is rewritten as a deflated .crops.npz
+# (smaller, but loaded fully instead of mapped). export_jpegs dumps a store
+# back to JPEG files for debugging.
+
+STORE_SUFFIX = ".crops.npy"
+COMPRESSED_SUFFIX = ".crops.npz"
+COMPRESS = False
+HEADER_BYTES = 256  # Fixed .npy header size so it can be rewritten in place once the count is known
+
+def record_dtype(frame_size=MODEL_FRAME_SIZE):
+    width, height = frame_size
+    return np.dtype([("frame_index", "<i4"), ("timestamp", "<f8"), ("pixels", "u1", (height, width))])
+
+def _npy_header(dtype, count):
+    """Version 1.0 .npy header padded to HEADER_BYTES."""
+    header = repr({"descr": dtype.descr, "fortran_order": False, "shape": (count,)})
+    padding = HEADER_BYTES - 10 - len(header) - 1
+    if padding < 0:
+        raise ValueError("Crop store header does not fit in HEADER_BYTES")
+    header = (header + " " * padding + "\n").encode("latin1")
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header
+
+class CropStoreWriter:
+    """Appends frames to <path> (a .crops.npy file) one record at a time."""
+
+    def __init__(self, path, frame_size=MODEL_FRAME_SIZE):
+        self.path = path
+        self.frame_size = frame_size
+        self.dtype = record_dtype(frame_size)
+        self.count = 0
+        self.file = open(path, "wb")
+        self.file.write(_npy_header(self.dtype, 0))
+        self._record = np.zeros(1, dtype=self.dtype)
+
+    def append(self, frame, frame_index, timestamp):
+        """Stores one BGR or grayscale frame (resized to frame_size if needed)."""
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            frame = cv2.resize(frame, self.frame_size)
+
+        self._record["frame_index"] = frame_index
+        self._record["timestamp"] = timestamp
+        self._record["pixels"] = frame
+        self.file.write(self._record.tobytes())
+        self.count += 1
+
+    def close(self, compress=COMPRESS):
+        """Finalizes the header. Returns the path of the finished store (.npz when compressed)."""
+        self.file.seek(0)
+        self.file.write(_npy_header(self.dtype, self.count))
+        self.file.close()
+
+        if not compress:
+            return self.path
+        records = np.load(self.path)
+        compressed_path = self.path[:-len(STORE_SUFFIX)] + COMPRESSED_SUFFIX
+        np.savez_compressed(compressed_path, records=records)
+        os.remove(self.path)
+        return compressed_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def find_store(folder, stream):
+    """Path of the stream's store in folder (plain or compressed), None if there is none."""
+    for suffix in (STORE_SUFFIX, COMPRESSED_SUFFIX):
+        path = os.path.join(folder, stream + suffix)
+        if os.path.exists(path):
+            return path
+    return None
+
+def open_store(path):
+    """The store's records: memory-mapped for .crops.npy, loaded for .crops.npz."""
+    if path.endswith(COMPRESSED_SUFFIX):
+        with np.load(path) as data:
+            return data["records"]
+    return np.load(path, mmap_mode="r")
+
+def load_model_input(path):
+    """(N, 64, 64, 1) float32 model input scaled to 0-1, straight from the store."""
+    pixels = open_store(path)["pixels"]
+    batch = np.empty(pixels.shape + (1,), dtype=np.float32)
+    batch[..., 0] = pixels
+    batch /= 255.0
+    return batch
+
+def export_jpegs(path, output_folder, name):
+    """Debug helper: writes every stored frame as <output_folder>/<name>_frame_0000.jpg."""
+    os.makedirs(output_folder, exist_ok=True)
+    for i, pixels in enumerate(open_store(path)["pixels"]):
+        cv2.imwrite(os.path.join(output_folder, f"{name}_frame_{i:04d}.jpg"), pixels)
+
+# ==========================
+# 🔹 Feature videos → stores
+# ==========================
+def store_stream(video_path, store_path, frame_rate=5, compress=COMPRESS, timestamps=None):
+    """
+    Samples, sharpens and resizes one extracted feature video into a crop store (frame.py + preprocessing_image.py in one pass).
+    timestamps: clip time of every frame in the video (the feature video only holds detected frames), else frame_index / fps.
+    """
+    reader = VideoReader(video_path)
+    fps = reader.get(cv2.CAP_PROP_FPS)
+    if not fps or not reader.isOpened():
+        print(f"⚠️ Skipping {video_path}: Invalid video file or FPS = 0")
+        reader.release()
+        return None
+
+    writer = CropStoreWriter(store_path)
+    for frame_index, frame in reader.frames(sampling_interval(fps, frame_rate)):
+        timestamp = timestamps[frame_index] if timestamps is not None and frame_index < len(timestamps) else frame_index / fps
+        writer.append(resize_frame(sharpen_frame(frame)), frame_index, timestamp)
+    reader.release()
+    return writer.close(compress)
+
+def store_streams(feature_path, output_folder, streams, frame_rate=5, compress=COMPRESS):
+    """
+    Builds <output_folder>/<stream>.crops.npy from <feature_path>/<stream>/test_<stream>.mp4
+    for every stream, one stream per thread. Returns {stream: store path} for the streams that had a video.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    detections = load_detections(os.path.join(feature_path, DETECTIONS_FILE))
+    jobs = {}
+    for stream in streams:
+        video_path = os.path.join(feature_path, stream, f"test_{stream}.mp4")
+        if os.path.exists(video_path):
+            # Clip time of each frame in the stream's video, when it only holds the detected frames
+            timestamps = None
+            if detections is not None and feature_extract.SKIP_FILLER_FRAMES:
+                timestamps = detections["timestamps"][detections[f"{stream}_mask"]]
+            jobs[stream] = (video_path, os.path.join(output_folder, stream + STORE_SUFFIX), timestamps)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+        futures = {stream: pool.submit(store_stream, video, store, frame_rate, compress, timestamps)
+                   for stream, (video, store, timestamps) in jobs.items()}
+        paths = {stream: future.result() for stream, future in futures.items()}
+    return {stream: path for stream, path in paths.items() if path}
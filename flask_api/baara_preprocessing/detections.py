@@ -0,0 +1,59 @@
+import os
+import numpy as np
+
+# ==========================
+# 🔹 Per-Frame Detection Masks
+# ==========================
+# When a stream's landmarks are missing, the crop pipeline repeats the last good
+# crop (or a black frame) so the crop videos keep the clip's duration. Those
+# filler frames carry no new information: sharpening, resizing and classifying
+# them only costs time and tilts the majority vote towards whatever was seen
+# last. Instead, every sampled frame records its timestamp and whether each
+# stream was actually detected (and cropped):
+#   timestamps     (N,) float32 seconds from the start of the clip
+#   <stream>_mask  (N,) bool
+# and only the frames whose mask is set go downstream. Disk runs save the
+# arrays as one .npz next to the feature videos.
+
+DETECTION_STREAMS = ("face", "left_hand", "right_hand")
+DETECTIONS_FILE = "detections.npz"
+
+def new_detections():
+    """Empty lists for record_detections."""
+    return {"timestamps": [], **{stream: [] for stream in DETECTION_STREAMS}}
+
+def record_detections(detections, timestamp, detected):
+    """Appends one sampled frame: its timestamp and detected ({stream: bool})."""
+    detections["timestamps"].append(timestamp)
+    for stream in DETECTION_STREAMS:
+        detections[stream].append(bool(detected[stream]))
+
+def to_arrays(detections):
+    """Turns record_detections lists into the {timestamps, <stream>_mask} arrays."""
+    arrays = {"timestamps": np.asarray(detections["timestamps"], dtype=np.float32)}
+    for stream in DETECTION_STREAMS:
+        arrays[f"{stream}_mask"] = np.asarray(detections[stream], dtype=bool)
+    return arrays
+
+def detection_keys():
+    return ["timestamps"] + [f"{stream}_mask" for stream in DETECTION_STREAMS]
+
+def save_detections(path, arrays):
+    """Writes the detection arrays to one compressed .npz."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez_compressed(path, **{key: arrays[key] for key in detection_keys()})
+    return path
+
+def load_detections(path):
+    """Reads arrays written by save_detections (None if there is no file)."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {key: data[key] for key in detection_keys()}
+
+def coverage(arrays, streams=DETECTION_STREAMS):
+    """Fraction of sampled frames in which each stream was detected ({stream: 0.0-1.0})."""
+    if arrays is None:
+        return {}
+    return {stream: round(float(arrays[f"{stream}_mask"].mean()), 4) if len(arrays[f"{stream}_mask"]) else 0.0
+            for stream in streams if f"{stream}_mask" in arrays}
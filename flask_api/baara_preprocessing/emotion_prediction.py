@@ -1,8 +1,13 @@
 import os
-import numpy as np
-import tensorflow as tf
+import sys
 import json
-from tensorflow.keras.preprocessing import image
+
+try:
+    from baara_preprocessing.batch_predict import MAX_BATCH_SIZE, predict_classes, majority_vote
+    from baara_preprocessing.image_loader import load_frames
+except ImportError:  # Running as a script from inside baara_preprocessing/
+    from batch_predict import MAX_BATCH_SIZE, predict_classes, majority_vote
+    from image_loader import load_frames
 
 # ==========================
 # 🔹 Suppress TensorFlow Warnings (Optional)
@@ -10,79 +15,75 @@ from tensorflow.keras.preprocessing import image
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suppress unnecessary TF logs
 
 # ==========================
-# 🔹 Load Trained Model
+# 🔹 Paths & Class Labels
 # ==========================
 MODEL_PATH = r"A:/Softwares/laragon/www/signnsync/flask_api/model/emotion_model.h5"
+INPUT_FOLDER = r"A:/Softwares/laragon/www/signnsync/interpretation/preprocessed"
 
-if not os.path.exists(MODEL_PATH):
-    print(json.dumps({"error": "❌ Emotion model file not found! Train and save the model first."}))
-    exit()
-
-# ✅ Load the trained model
-model = tf.keras.models.load_model(MODEL_PATH)
+# ✅ Class labels (Modify this if needed)
+CLASS_LABELS = ["Angry", "Anticipation", "Disgust", "Fear", "Happy", "Neutral", "Sad", "Surprised", "Trust"]
 
 # ==========================
-# 🔹 Function to Preprocess Image
+# 🔹 Load Trained Model
 # ==========================
-def preprocess_image(img_path, target_size=(64, 64)):
-    """Loads and preprocesses an image for emotion detection."""
-    try:
-        img = image.load_img(img_path, target_size=target_size, color_mode='grayscale')
-        img_array = image.img_to_array(img)
-        img_array = np.expand_dims(img_array, axis=0) / 255.0  # Normalize
-        return img_array
-    except Exception as e:
-        return {"error": f"❌ Image preprocessing failed: {str(e)}"}
+def load_model(model_path=MODEL_PATH):
+    """Loads the trained emotion model. Only used when this file runs as a script;
+    the Flask API reuses the copy already held by model_loader."""
+    if not os.path.exists(model_path):
+        print(json.dumps({"error": "❌ Emotion model file not found! Train and save the model first."}))
+        sys.exit()
+
+    import tensorflow as tf  # Imported here so the API can run on a TFLite/ONNX backend without TensorFlow
+    tf.get_logger().setLevel("ERROR")  # ✅ Suppress TensorFlow verbose logs
+    return tf.keras.models.load_model(model_path)
 
 # ==========================
 # 🔹 Function to Predict Emotion
 # ==========================
-def predict_emotion():
-    input_folder = r"A:/Softwares/laragon/www/signnsync/interpretation/preprocessed"
-    face_folder = os.path.join(input_folder, "face")
-
-    emotion_preds = []
-
-    # ✅ Ensure input folder exists and contains frames
-    if not os.path.exists(face_folder) or not os.listdir(face_folder):
-        return json.dumps({"error": "❌ No preprocessed face frames found!"})
+def emotion_from_batch(model, face_batch, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the emotion for a (N, 64, 64, 1) batch of face frames and returns the majority vote as a dict."""
+    if len(face_batch) == 0:
+        return {"error": "❌ No preprocessed face frames found!"}
 
     try:
-        # ✅ Predict for face frames
-        for img_name in sorted(os.listdir(face_folder)):  # Ensure ordered processing
-            img_path = os.path.join(face_folder, img_name)
-            img_array = preprocess_image(img_path)
-            
-            if isinstance(img_array, dict) and "error" in img_array:
-                return json.dumps(img_array)  # Return JSON error if preprocessing fails
-
-            # ✅ Suppress TensorFlow verbose logs
-            tf.get_logger().setLevel("ERROR")
-
-            # ✅ Make prediction
-            emotion_pred = model.predict(img_array, verbose=0)  # Suppressed verbose output
-            emotion_preds.append(np.argmax(emotion_pred))
+        # ✅ One forward pass per micro-batch instead of one per frame
+        emotion_preds = predict_classes(model, face_batch, max_batch_size)
 
         # ✅ Ensure at least one prediction is made
         if not emotion_preds:
-            return json.dumps({"error": "❌ No valid predictions made!"})
+            return {"error": "❌ No valid predictions made!"}
 
         # ✅ Get the most frequent prediction
-        final_emotion_pred = max(set(emotion_preds), key=emotion_preds.count)
-
-        # ✅ Class labels (Modify this if needed)
-        class_labels = ["Angry", "Anticipation", "Disgust", "Fear", "Happy", "Neutral", "Sad", "Surprised", "Trust"]
+        final_emotion_pred = majority_vote(emotion_preds)
 
         # ✅ Determine final prediction text
-        prediction_text = class_labels[final_emotion_pred]
+        prediction_text = CLASS_LABELS[final_emotion_pred]
 
-        return json.dumps({"emotion_prediction": prediction_text})
+        return {"emotion_prediction": prediction_text}
 
     except Exception as e:
-        return json.dumps({"error": f"⚠️ Prediction error: {str(e)}"})
+        return {"error": f"⚠️ Prediction error: {str(e)}"}
+
+def emotion_from_folder(model, face_folder, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the emotion for every frame in face_folder and returns the majority vote as a dict."""
+    # ✅ Ensure input folder exists and contains frames
+    if not os.path.exists(face_folder) or not os.listdir(face_folder):
+        return {"error": "❌ No preprocessed face frames found!"}
+
+    face_batch = load_frames(face_folder)
+    if isinstance(face_batch, dict):
+        return face_batch  # Return error if preprocessing fails
+
+    return emotion_from_batch(model, face_batch, max_batch_size)
+
+def predict_emotion(model, input_folder=INPUT_FOLDER):
+    """Script entry point: predicts on <input_folder>/face and returns the result as JSON text."""
+    return json.dumps(emotion_from_folder(model, os.path.join(input_folder, "face")))
 
 # ==========================
 # 🔹 Run Prediction
 # ==========================
 if __name__ == "__main__":
-    print(predict_emotion())
\ No newline at end of file
+    # Optional argument: preprocessed folder to read instead of INPUT_FOLDER
+    input_folder = sys.argv[1] if len(sys.argv) > 1 else INPUT_FOLDER
+    print(predict_emotion(load_model(), input_folder))
@@ -1,17 +1,127 @@
 import os
 import cv2
 import mediapipe as mp
-import subprocess  # For calling frame.py
-import sys
 import time
 import numpy as np  # For creating blank frames
 
-# Ensure frame.py is in the same directory or adjust the path
-FRAME_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "frame.py")
-
-def extract_features(input_video_path, output_folder):
-    """Extracts face, left hand, and right hand from video and saves as separate videos, maintaining original duration."""
+try:
+    from baara_preprocessing import frame as frame_script
+    from baara_preprocessing.crop import LANDMARK_FIELDS, crop_features
+    from baara_preprocessing.landmarks import new_sequences, record_hands, to_arrays, save_landmarks
+    from baara_preprocessing import detections as detection_masks
+    from baara_preprocessing.landmark_detector import LandmarkDetector
+    from baara_preprocessing.video_io import VideoReader, AsyncVideoWriter, iter_frames
+except ImportError:  # Running as a script from inside baara_preprocessing/
+    import frame as frame_script
+    from crop import LANDMARK_FIELDS, crop_features
+    from landmarks import new_sequences, record_hands, to_arrays, save_landmarks
+    import detections as detection_masks
+    from landmark_detector import LandmarkDetector
+    from video_io import VideoReader, AsyncVideoWriter, iter_frames
+
+DEFAULT_FRAME_RATE = 5  # Frames scored per second (same as frame.py)
+
+STREAMS = ("face", "right_hand", "left_hand")
+
+# Only frames in which a stream was detected go downstream (see detections.py); the repeated
+# last crop / black frame that fills the gaps is still yielded for live previews but never
+# written, sharpened, resized or classified. False restores the old fixed-length crop videos.
+SKIP_FILLER_FRAMES = True
+
+def sampling_interval(fps, frame_rate):
+    """Keep every n-th frame to get frame_rate frames per second (1 = keep all, same formula as frame.py)."""
+    if not fps or not frame_rate:
+        return 1
+    return max(1, int(fps / frame_rate))
+
+def track_features(frame, holistic, last_frames, frame_width, frame_height, landmarks=None, timings=None):
+    """
+    Runs MediaPipe Holistic on one BGR frame and returns (crops, detected) like iter_feature_frames.
+    holistic: a landmark_detector.LandmarkDetector (downscaled / ROI-tracked detection, landmarks in
+        full-frame coordinates so the crops come from the full-resolution frame) or a bare Holistic.
+    last_frames ({feature: crop}) holds the previous crops and is updated in place; only its
+    features are cropped, and for those detected means a new crop was taken from this frame.
+    landmarks: optional landmarks.new_sequences() dict, this frame's hand landmarks are appended to it.
+    timings: optional dict, seconds spent in Holistic and in cropping are added to "holistic" and "crop".
+    """
+    start = time.perf_counter()
+    if isinstance(holistic, LandmarkDetector):
+        results = holistic.process(frame)  # Converts only what Holistic runs on
+    else:
+        results = holistic.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    if timings is not None:
+        crop_start = time.perf_counter()
+        timings["holistic"] = timings.get("holistic", 0.0) + crop_start - start
+    if landmarks is not None:
+        record_hands(landmarks, results)
+
+    # Default frames as last detected features
+    crops = dict(last_frames)
+    detected = {feature: bool(getattr(results, field)) for feature, field in LANDMARK_FIELDS.items()}
+    for feature, (crop, box) in crop_features(frame, results, streams=last_frames).items():
+        if crop is not None:
+            crop = cv2.resize(crop, (frame_width, frame_height))
+            crops[feature] = crop
+            last_frames[feature] = crop
+        else:
+            detected[feature] = False  # Empty box: crops[feature] is a repeat
+    if timings is not None:
+        timings["crop"] = timings.get("crop", 0.0) + time.perf_counter() - crop_start
+    return crops, detected
+
+def iter_feature_frames(cap, holistic, frame_width, frame_height, frame_interval=1, streams=STREAMS, landmarks=None,
+                        timings=None):
+    """
+    Runs MediaPipe Holistic on every frame_interval-th frame of cap and yields (frame_index, crops, detected):
+    - crops: {"face", "right_hand", "left_hand"} -> BGR crop resized to frame size.
+      When a feature is missing, the last detected crop (or a black frame) is repeated.
+    - detected: {"face", "right_hand", "left_hand"} -> whether the landmarks were found (and, for the
+      cropped streams, a crop taken) in this frame. False means crops[feature] is a filler frame.
+
+    cap is a cv2.VideoCapture or a video_io.VideoReader (decodes ahead on its own thread).
+    Frames in between are skipped without being run through Holistic (nor decoded, for OpenCV).
+    streams: features to crop (others are left out of crops, detected always has all three).
+    landmarks: optional landmarks.new_sequences() dict that collects the hand landmarks of every yielded frame.
+    timings: optional dict accumulating "decode" (waiting for the next sampled frame), "holistic" and "crop" seconds.
+    """
+    # Create blank frame (black) to maintain frame count
+    blank_frame = np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
 
+    # Store last valid frames to prevent flickering
+    last_frames = {feature: blank_frame for feature in streams}
+
+    frames = iter_frames(cap, frame_interval)
+    while True:
+        start = time.perf_counter()
+        item = next(frames, None)
+        if timings is not None:
+            timings["decode"] = timings.get("decode", 0.0) + time.perf_counter() - start
+        if item is None:
+            break
+        frame_index, frame = item
+        crops, detected = track_features(frame, holistic, last_frames, frame_width, frame_height, landmarks, timings)
+        yield frame_index, crops, detected
+
+def extract_features(input_video_path, output_folder, run_frame_script=True, frame_rate=None,
+                     streams=STREAMS, landmark_path=None):
+    """
+    Extracts face, left hand, and right hand from video and saves as separate videos, as fast as the
+    frames decode (the crop videos keep the clip's duration through their FPS, not by pacing the loop).
+    With SKIP_FILLER_FRAMES each video only holds the frames its stream was detected in; the timestamp
+    and per-stream detection mask of every processed frame are saved to <output_folder>/detections.npz.
+    Otherwise undetected frames repeat the last crop so the videos keep the original duration.
+
+    run_frame_script: also run frame.main (sharpening, then preprocessing_image) on output_folder once
+        extraction finishes, in this process. The API leaves it off and runs those stages itself.
+    frame_rate: if set, only this many frames per second go through Holistic and into the output videos
+        (written at the reduced FPS so the duration is unchanged). None keeps every frame.
+    streams: features written as crop videos (default all three).
+    landmark_path: if set, the hand landmarks of every processed frame are also saved there (.npz, see landmarks.py).
+
+    Returns a dict with the frame count, elapsed seconds, throughput (frames/sec), detected feature counts
+    and the seconds spent decoding, in Holistic and cropping ("timings").
+    The detection arrays (detections.to_arrays) are returned under "detections".
+    """
     if not os.path.exists(input_video_path):
         print(f"❌ Error: Video file {input_video_path} not found.")
         return
@@ -21,14 +131,14 @@ def extract_features(input_video_path, output_folder):
     right_hand_video_path = os.path.join(output_folder, "right_hand", "test_right_hand.mp4")
     left_hand_video_path = os.path.join(output_folder, "left_hand", "test_left_hand.mp4")
 
-    os.makedirs(os.path.dirname(face_video_path), exist_ok=True)
-    os.makedirs(os.path.dirname(right_hand_video_path), exist_ok=True)
-    os.makedirs(os.path.dirname(left_hand_video_path), exist_ok=True)
+    video_paths = {"face": face_video_path, "right_hand": right_hand_video_path, "left_hand": left_hand_video_path}
+    for feature in streams:
+        os.makedirs(os.path.dirname(video_paths[feature]), exist_ok=True)
 
     print(f"✅ Created feature extraction folders at: {output_folder}")
 
-    # Open video file
-    cap = cv2.VideoCapture(input_video_path)
+    # Open video file (decoded ahead on a background thread)
+    cap = VideoReader(input_video_path)
     if not cap.isOpened():
         print(f"❌ Error: Unable to open video file {input_video_path}")
         return
@@ -38,113 +148,72 @@ def extract_features(input_video_path, output_folder):
     fps = cap.get(cv2.CAP_PROP_FPS)  # Preserve original FPS
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
-    print(f"🎥 Processing video: {input_video_path}, FPS: {fps}, Frames: {total_frames}, Resolution: {frame_width}x{frame_height}")
+    frame_interval = sampling_interval(fps, frame_rate)
+    # Sources that report no FPS keep every frame (sampling_interval) and are written at DEFAULT_FRAME_RATE
+    output_fps = fps / frame_interval if fps else DEFAULT_FRAME_RATE
+
+    print(f"🎥 Processing video: {input_video_path}, FPS: {fps}, Frames: {total_frames}, Resolution: {frame_width}x{frame_height}, Holistic on every {frame_interval} frame(s)")
 
-    # Define video writers with correct FPS
+    # Video writers with correct FPS (each encodes on its own thread), opened on a stream's first
+    # written frame so a stream that is never detected leaves no video behind
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    face_output = cv2.VideoWriter(face_video_path, fourcc, fps, (frame_width, frame_height))
-    right_hand_output = cv2.VideoWriter(right_hand_video_path, fourcc, fps, (frame_width, frame_height))
-    left_hand_output = cv2.VideoWriter(left_hand_video_path, fourcc, fps, (frame_width, frame_height))
+    writers = {}
+    landmarks = new_sequences() if landmark_path else None
+    detections = detection_masks.new_detections()
 
     detected_features = {"face": 0, "right_hand": 0, "left_hand": 0}
-
-    # Create blank frame (black) to maintain frame count
-    blank_frame = np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
-
-    # Store last valid frames to prevent flickering
-    last_face_frame = blank_frame.copy()
-    last_right_hand_frame = blank_frame.copy()
-    last_left_hand_frame = blank_frame.copy()
+    stage_timings = {"decode": 0.0, "holistic": 0.0, "crop": 0.0}
 
     mp_holistic = mp.solutions.holistic
-    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
+    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic, \
+            LandmarkDetector(holistic) as detector:  # DETECTION_MODE: full / downscaled / ROI-tracked
         frame_count = 0
         start_time = time.time()
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break  # Stop if video ends
+        for frame_index, crops, detected in iter_feature_frames(cap, detector, frame_width, frame_height, frame_interval,
+                                                                 streams, landmarks, stage_timings):
             frame_count += 1
+            detection_masks.record_detections(detections, frame_index / fps if fps else 0.0, detected)
+
+            for feature in detected_features:
+                detected_features[feature] += detected[feature]
+            for feature in streams:
+                if SKIP_FILLER_FRAMES and not detected[feature]:
+                    continue  # Filler frame, nothing downstream needs it
+                if feature not in writers:
+                    writers[feature] = AsyncVideoWriter(video_paths[feature], fourcc, output_fps, (frame_width, frame_height))
+                writers[feature].write(crops[feature])
 
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = holistic.process(image)
-
-            h, w, _ = frame.shape
-            padding = 30  # Padding around detected features
-
-            # Default frames as last detected features
-            face_frame = last_face_frame.copy()
-            right_hand_frame = last_right_hand_frame.copy()
-            left_hand_frame = last_left_hand_frame.copy()
-
-            # Face Extraction
-            if results.face_landmarks:
-                detected_features["face"] += 1
-                x_min, y_min, x_max, y_max = w, h, 0, 0
-                for lm in results.face_landmarks.landmark:
-                    x, y = int(lm.x * w), int(lm.y * h)
-                    x_min, x_max = min(x_min, x), max(x_max, x)
-                    y_min, y_max = min(y_min, y), max(y_max, y)
-                x_min, x_max = max(0, x_min - padding), min(w, x_max + padding)
-                y_min, y_max = max(0, y_min - padding), min(h, y_max + padding)
-                face_crop = frame[y_min:y_max, x_min:x_max]
-                if face_crop.size > 0:
-                    face_frame = cv2.resize(face_crop, (frame_width, frame_height))
-                    last_face_frame = face_frame.copy()
-
-            # Right Hand Extraction
-            if results.right_hand_landmarks:
-                detected_features["right_hand"] += 1
-                x_min, y_min, x_max, y_max = w, h, 0, 0
-                for lm in results.right_hand_landmarks.landmark:
-                    x, y = int(lm.x * w), int(lm.y * h)
-                    x_min, x_max = min(x_min, x), max(x_max, x)
-                    y_min, y_max = min(y_min, y), max(y_max, y)
-                x_min, x_max = max(0, x_min - padding), min(w, x_max + padding)
-                y_min, y_max = max(0, y_min - padding), min(h, y_max + padding)
-                right_hand_crop = frame[y_min:y_max, x_min:x_max]
-                if right_hand_crop.size > 0:
-                    right_hand_frame = cv2.resize(right_hand_crop, (frame_width, frame_height))
-                    last_right_hand_frame = right_hand_frame.copy()
-
-            # Left Hand Extraction
-            if results.left_hand_landmarks:
-                detected_features["left_hand"] += 1
-                x_min, y_min, x_max, y_max = w, h, 0, 0
-                for lm in results.left_hand_landmarks.landmark:
-                    x, y = int(lm.x * w), int(lm.y * h)
-                    x_min, x_max = min(x_min, x), max(x_max, x)
-                    y_min, y_max = min(y_min, y), max(y_max, y)
-                x_min, x_max = max(0, x_min - padding), min(w, x_max + padding)
-                y_min, y_max = max(0, y_min - padding), min(h, y_max + padding)
-                left_hand_crop = frame[y_min:y_max, x_min:x_max]
-                if left_hand_crop.size > 0:
-                    left_hand_frame = cv2.resize(left_hand_crop, (frame_width, frame_height))
-                    last_left_hand_frame = left_hand_frame.copy()
-
-            # Write frames to maintain original FPS and duration
-            face_output.write(face_frame)
-            right_hand_output.write(right_hand_frame)
-            left_hand_output.write(left_hand_frame)
-
-            # ⏳ Maintain original frame duration
-            elapsed_time = time.time() - start_time
-            expected_time = frame_count / fps
-            if elapsed_time < expected_time:
-                time.sleep(expected_time - elapsed_time)
+        elapsed_time = time.time() - start_time
 
     # Release everything
     cap.release()
-    face_output.release()
-    right_hand_output.release()
-    left_hand_output.release()
+    for writer in writers.values():
+        writer.release()
+
+    if landmarks is not None:
+        save_landmarks(landmark_path, to_arrays(landmarks))
+    detection_arrays = detection_masks.to_arrays(detections)
+    detection_masks.save_detections(os.path.join(output_folder, detection_masks.DETECTIONS_FILE), detection_arrays)
 
     print(f"✅ Feature extraction complete: Face ({detected_features['face']} frames), Right Hand ({detected_features['right_hand']} frames), Left Hand ({detected_features['left_hand']} frames).")
 
-    # Call frame.py to process extracted videos
-    print("🚀 Calling frame.py for frame extraction...")
-    subprocess.run([sys.executable, FRAME_SCRIPT_PATH, face_video_path, right_hand_video_path, left_hand_video_path])
+    throughput = frame_count / elapsed_time if elapsed_time > 0 else 0.0
+    print(f"⚡ {frame_count} frames in {elapsed_time:.2f}s ({throughput:.1f} frames/sec)")
+
+    if run_frame_script:
+        # Sharpen + preprocess the extracted videos
+        print("🚀 Running frame.py stages for frame extraction...")
+        frame_script.main(input_folder=output_folder)
+
+    return {
+        "frames": frame_count,
+        "seconds": elapsed_time,
+        "frames_per_second": throughput,
+        "detected_features": detected_features,
+        "timings": stage_timings,
+        "detections": detection_arrays,
+    }
 
 # Example usage
 if __name__ == "__main__":
@@ -1,10 +1,18 @@
 import cv2
 import os
-import subprocess  # To call preprocessing_image.py
-import sys
 
-# Ensure preprocess_image.py is in the same directory or adjust the path
-PREPROCESS_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "preprocessing_image.py")
+try:
+    from baara_preprocessing import preprocessing_image
+    from baara_preprocessing.image_ops import sharpen_frame
+    from baara_preprocessing.video_io import VideoReader
+except ImportError:  # Running as a script from inside baara_preprocessing/
+    import preprocessing_image
+    from image_ops import sharpen_frame
+    from video_io import VideoReader
+
+# 🔹 Define paths
+base_input_folder = r"A:/Softwares/laragon/www/signnsync/interpretation/feature_extracted"
+base_output_folder = r"A:/Softwares/laragon/www/signnsync/interpretation/frames"
 
 def extract_sharpened_frames(input_folder, output_folder, frame_rate=5):
     """
@@ -23,7 +31,7 @@ def extract_sharpened_frames(input_folder, output_folder, frame_rate=5):
             video_path = os.path.normpath(os.path.join(input_folder, video_file))
             video_name = os.path.splitext(video_file)[0]  # Extract name without extension
 
-            cap = cv2.VideoCapture(video_path)
+            cap = VideoReader(video_path)
             fps = cap.get(cv2.CAP_PROP_FPS)
 
             if fps == 0 or not cap.isOpened():
@@ -32,57 +40,42 @@ def extract_sharpened_frames(input_folder, output_folder, frame_rate=5):
                 continue
 
             frame_interval = max(1, int(fps / frame_rate))  # Corrected frame interval calculation
-            frame_count = 0
             saved_count = 0
 
             print(f"🎥 Processing video: {video_file} ({fps:.2f} FPS, extracting every {frame_interval} frames)")
 
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break  # End of video
-
-                # Extract 5 frames per second
-                if frame_count % frame_interval == 0:
-                    # Apply Sharpening to Reduce Motion Blur
-                    blurred = cv2.GaussianBlur(frame, (5, 5), 0)
-                    sharpened = cv2.addWeighted(frame, 1.5, blurred, -0.5, 0)
-
-                    # Save sharpened frame directly in output_folder
-                    frame_filename = os.path.normpath(os.path.join(output_folder, f"{video_name}_frame_{saved_count:04d}.jpg"))
-                    cv2.imwrite(frame_filename, sharpened)
-                    saved_count += 1
+            # Extract 5 frames per second (decoded ahead on a background thread)
+            for _, frame in cap.frames(frame_interval):
+                # Apply Sharpening to Reduce Motion Blur
+                sharpened = sharpen_frame(frame)
 
-                frame_count += 1
+                # Save sharpened frame directly in output_folder
+                frame_filename = os.path.normpath(os.path.join(output_folder, f"{video_name}_frame_{saved_count:04d}.jpg"))
+                cv2.imwrite(frame_filename, sharpened)
+                saved_count += 1
 
             cap.release()
             print(f"✅ {saved_count} frames extracted and saved in: {output_folder}")
 
-# 🔹 Define paths
-base_input_folder = r"A:/Softwares/laragon/www/signnsync/interpretation/feature_extracted"
-base_output_folder = r"A:/Softwares/laragon/www/signnsync/interpretation/frames"
-
-# Process face videos
-face_input = os.path.normpath(os.path.join(base_input_folder, "face"))
-face_output = os.path.normpath(os.path.join(base_output_folder, "face"))
-if os.path.exists(face_input):
-    extract_sharpened_frames(face_input, face_output)
-
-# Process left-hand videos
-left_hand_input = os.path.normpath(os.path.join(base_input_folder, "left_hand"))
-left_hand_output = os.path.normpath(os.path.join(base_output_folder, "left_hand"))
-if os.path.exists(left_hand_input):
-    extract_sharpened_frames(left_hand_input, left_hand_output)
-
-# Process right-hand videos
-right_hand_input = os.path.normpath(os.path.join(base_input_folder, "right_hand"))
-right_hand_output = os.path.normpath(os.path.join(base_output_folder, "right_hand"))
-if os.path.exists(right_hand_input):
-    extract_sharpened_frames(right_hand_input, right_hand_output)
-
-print("✅ All feature-extracted videos converted to sharpened frames successfully!")
-
-# 🚀 Call preprocess_image.py to preprocess extracted frames
-print("🔄 Calling preprocess_image.py for preprocessing...")
-subprocess.run([sys.executable, PREPROCESS_SCRIPT_PATH])
-print("✅ Preprocessing completed successfully!")
+def main(input_folder=base_input_folder, output_folder=base_output_folder, run_preprocessing=True):
+    """
+    Script entry point: sharpens <input_folder>/<stream> videos into <output_folder>/<stream>,
+    then (run_preprocessing) resizes them with preprocessing_image.main, in this process.
+    Nothing runs on import; the API calls extract_sharpened_frames through its stage graph.
+    """
+    for stream in ("face", "left_hand", "right_hand"):
+        stream_input = os.path.normpath(os.path.join(input_folder, stream))
+        stream_output = os.path.normpath(os.path.join(output_folder, stream))
+        if os.path.exists(stream_input):
+            extract_sharpened_frames(stream_input, stream_output)
+
+    print("✅ All feature-extracted videos converted to sharpened frames successfully!")
+
+    if run_preprocessing:
+        # 🚀 Preprocess the extracted frames (same process, no second interpreter)
+        print("🔄 Running preprocessing_image for preprocessing...")
+        preprocessing_image.main(frames_path=output_folder)
+        print("✅ Preprocessing completed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+try:
+    from baara_preprocessing.image_ops import MODEL_FRAME_SIZE, to_model_input
+except ImportError:  # Running as a script from inside baara_preprocessing/
+    from image_ops import MODEL_FRAME_SIZE, to_model_input
+
+# ==========================
+# 🔹 Bulk Frame Loader
+# ==========================
+# Keras' load_img goes through PIL, img_to_array, expand_dims and a divide
+# per file. This decodes a whole folder of preprocessed JPEGs straight to
+# grayscale with cv2 on a thread pool (cv2 releases the GIL while decoding),
+# each worker writing into its slot of one preallocated (N, 64, 64, 1)
+# float32 buffer that goes to predict_classes as-is.
+#
+# Optionally the finished buffer is saved as <folder>.npy and memory-mapped
+# on the next load of the same, unchanged folder.
+
+LOADER_WORKERS = min(8, os.cpu_count() or 1)
+NPY_CACHE = False  # Save/reuse <folder>.npy next to each frame folder
+
+def _decode_into(batch, index, path, frame_size):
+    """Decodes one image into batch[index]. Returns None, or an error message."""
+    image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return f"❌ Image preprocessing failed: could not read {path}"
+    if (image.shape[1], image.shape[0]) != frame_size:
+        image = cv2.resize(image, frame_size, interpolation=cv2.INTER_NEAREST)  # Same interpolation as load_img
+    batch[index, :, :, 0] = image
+    return None
+
+def _cache_is_fresh(cache_path, folder, count):
+    """The .npy is newer than the folder (no frames added/removed/rewritten since) and has the right length."""
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(folder):
+        return False
+    if any(os.path.getmtime(os.path.join(folder, name)) > os.path.getmtime(cache_path) for name in os.listdir(folder)):
+        return False
+    return np.load(cache_path, mmap_mode="r").shape[0] == count
+
+def load_frames(source, frame_size=MODEL_FRAME_SIZE, workers=LOADER_WORKERS, use_cache=None):
+    """
+    Loads frames into one contiguous (N, 64, 64, 1) float32 array scaled to 0-1.
+
+    source: a folder (every file, sorted by name), a list of image paths, or a list of
+        BGR/grayscale frames already in memory.
+    use_cache: for folders, memory-map <folder>.npy when it is up to date, otherwise
+        build it (defaults to NPY_CACHE).
+
+    Returns the array, or {"error": ...} if an image cannot be read.
+    """
+    if not isinstance(source, str):
+        if source and not isinstance(source[0], str):
+            return to_model_input([cv2.resize(frame, frame_size) if frame.shape[:2] != frame_size[::-1] else frame
+                                   for frame in source], frame_size)
+        paths, folder = list(source), None
+    else:
+        folder = source
+        paths = [os.path.join(folder, name) for name in sorted(os.listdir(folder))]  # Ensure ordered processing
+
+    use_cache = NPY_CACHE if use_cache is None else use_cache
+    cache_path = folder.rstrip("/\\") + ".npy" if folder and use_cache else None
+    if cache_path and _cache_is_fresh(cache_path, folder, len(paths)):
+        return np.load(cache_path, mmap_mode="r")
+
+    width, height = frame_size
+    batch = np.empty((len(paths), height, width, 1), dtype=np.float32)
+    if not paths:
+        return batch
+
+    if workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            errors = list(pool.map(lambda item: _decode_into(batch, item[0], item[1], frame_size), enumerate(paths)))
+    else:
+        errors = [_decode_into(batch, i, path, frame_size) for i, path in enumerate(paths)]
+
+    error = next((e for e in errors if e), None)
+    if error:
+        return {"error": error}
+
+    batch /= 255.0  # Normalize, in place
+    if cache_path:
+        np.save(cache_path, batch)
+    return batch
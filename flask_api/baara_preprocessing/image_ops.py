@@ -0,0 +1,38 @@
+import cv2
+import numpy as np
+
+# ==========================
+# 🔹 Shared Per-Frame Image Operations
+# ==========================
+# Used by both the on-disk scripts (frame.py, preprocessing_image.py) and the
+# in-memory stream pipeline so the two paths transform frames identically.
+
+MODEL_FRAME_SIZE = (64, 64)
+
+def sharpen_frame(frame):
+    """Applies unsharp masking to reduce motion blur."""
+    blurred = cv2.GaussianBlur(frame, (5, 5), 0)
+    return cv2.addWeighted(frame, 1.5, blurred, -0.5, 0)
+
+def resize_frame(frame, frame_size=MODEL_FRAME_SIZE):
+    """Resizes a frame to the model input size."""
+    return cv2.resize(frame, frame_size)
+
+def preprocess_frame(frame, frame_size=MODEL_FRAME_SIZE):
+    """Resize + 0-1 normalization as done by preprocess_images, returned as uint8 for saving."""
+    image = resize_frame(frame, frame_size)
+    image = image.astype(np.float32) / 255.0  # Normalize pixel values (0-1)
+    return (image * 255).astype(np.uint8)  # Convert back to uint8 for saving
+
+def to_model_input(frames, frame_size=MODEL_FRAME_SIZE):
+    """
+    Converts a list of BGR frames (already resized to frame_size) into the
+    (N, 64, 64, 1) grayscale float32 array the models expect, scaled to 0-1.
+    """
+    width, height = frame_size
+    batch = np.empty((len(frames), height, width, 1), dtype=np.float32)
+    for i, frame in enumerate(frames):
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        batch[i, :, :, 0] = gray
+    batch /= 255.0
+    return batch
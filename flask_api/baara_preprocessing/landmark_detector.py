@@ -0,0 +1,156 @@
+import cv2
+import mediapipe as mp
+
+try:
+    from baara_preprocessing.crop import LANDMARK_FIELDS, landmarks_to_array, raw_box
+except ImportError:  # Running as a script from inside baara_preprocessing/
+    from crop import LANDMARK_FIELDS, landmarks_to_array, raw_box
+
+# ==========================
+# 🔹 Detection Modes
+# ==========================
+# "full":      BGR→RGB of the whole frame, Holistic on the full resolution (previous behaviour)
+# "downscale": Holistic on a copy whose longest side is DETECT_MAX_SIDE; landmarks are normalized,
+#              so they map straight back onto the full-resolution frame and the crops stay sharp
+# "roi":       downscale + region of interest: only the padded union of the previous frame's
+#              face/hand boxes is converted and run through Holistic, and its landmarks are mapped
+#              back to full-frame coordinates. The whole frame is re-detected every REDETECT_EVERY
+#              frames, and straight away when the tracked region loses the face and both hands
+#              (a hand entering the frame outside the region waits for the next full detection).
+#              Regions change size and position every frame, so they go through a second Holistic in
+#              static_image_mode: feeding them to the tracking graph would make it "track" landmarks
+#              between unrelated images. The tracking graph only ever sees full frames.
+#
+# Trade-off: static_image_mode runs the pose, face and hand detectors on every region instead of
+# tracking, which costs about what the smaller conversion saves. bench_detection on
+# interpretation/test.mp4 (MediaPipe 0.10.14, 1 CPU, ms/frame full / downscale / roi):
+#   720p 52.5 / 47.9 / 46.9    1080p 45.9 / 41.7 / 56.3    4K 55.0 / 49.0 / 53.9
+# so "roi" is opt-in: it only pays off when the tracked region is a small part of a large frame.
+# "downscale" is the cheaper option at 1080p and above. Re-measure before switching the default.
+DETECTION_MODES = ("full", "downscale", "roi")
+DETECTION_MODE = "full"  # "roi" is opt-in, see the trade-off above
+DETECT_MAX_SIDE = 960   # Longest side of the image Holistic sees in "downscale"/"roi" mode
+REDETECT_EVERY = 10     # "roi": frames between full-frame detections
+ROI_PADDING = 0.25      # "roi": margin added on every side of the tracked box, as a fraction of its size
+MIN_ROI_SIDE = 64       # "roi": smaller tracked regions are grown to this many pixels
+
+class _Point:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+class _LandmarkList:
+    """Stand-in for a MediaPipe NormalizedLandmarkList (only .landmark is used downstream)."""
+
+    def __init__(self, landmark):
+        self.landmark = landmark
+
+class _Results:
+    """Holistic results with every landmark list in full-frame normalized coordinates."""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+RESULT_FIELDS = tuple(LANDMARK_FIELDS.values()) + ("pose_landmarks",)
+
+def map_landmarks(landmarks, region, frame_width, frame_height):
+    """Landmarks normalized to region (x0, y0, x1, y1 in pixels) re-normalized to the whole frame."""
+    if not landmarks:
+        return None
+    x0, y0, x1, y1 = region
+    sx, sy = (x1 - x0) / frame_width, (y1 - y0) / frame_height
+    ox, oy = x0 / frame_width, y0 / frame_height
+    return _LandmarkList([_Point(ox + lm.x * sx, oy + lm.y * sy, lm.z * sx) for lm in landmarks.landmark])
+
+class LandmarkDetector:
+    """
+    Wraps a Holistic instance: process(bgr_frame) returns results whose landmarks are normalized
+    to the full frame whatever mode is used, so crop_features and record_hands work unchanged.
+    One detector per video or stream (the region of interest carries over between frames).
+    Use it as a context manager (or call close()) so the "roi" mode's region Holistic is released.
+    """
+
+    def __init__(self, holistic, mode=None, max_side=None, redetect_every=None, roi_padding=None, region_holistic=None):
+        self.holistic = holistic
+        self.region_holistic = region_holistic  # "roi": static_image_mode instance for the regions
+        self.owns_region_holistic = region_holistic is None
+        self.mode = mode or DETECTION_MODE
+        if self.mode not in DETECTION_MODES:
+            raise ValueError(f"Unknown detection mode '{self.mode}', expected one of {DETECTION_MODES}")
+        self.max_side = max_side or DETECT_MAX_SIDE
+        self.redetect_every = redetect_every or REDETECT_EVERY
+        self.roi_padding = ROI_PADDING if roi_padding is None else roi_padding
+        self.roi = None
+        self.roi_shape = None  # Frame size the region was tracked in
+        self.since_full = 0
+        self.stats = {"frames": 0, "full": 0, "roi": 0, "roi_lost": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Releases the region Holistic if this detector created it (the tracking one belongs to the caller)."""
+        if self.owns_region_holistic and self.region_holistic is not None:
+            self.region_holistic.close()
+        self.region_holistic = None
+
+    def _region_holistic(self):
+        if self.region_holistic is None:
+            self.region_holistic = mp.solutions.holistic.Holistic(static_image_mode=True, min_detection_confidence=0.5)
+        return self.region_holistic
+
+    def _run(self, image, holistic=None):
+        """Downscales (if needed), converts to RGB and runs Holistic (the tracking one by default) on a BGR image or region."""
+        if self.mode != "full":
+            height, width = image.shape[:2]
+            scale = self.max_side / max(height, width)
+            if scale < 1:
+                # Linear: INTER_AREA costs more than the conversion it saves, and Holistic resamples its input anyway
+                image = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                                   interpolation=cv2.INTER_LINEAR)
+        return (holistic or self.holistic).process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+    def _track(self, results, frame_width, frame_height):
+        """Padded pixel box around the face/hands found in results (the crops), None if none were found."""
+        boxes = [raw_box(landmarks_to_array(getattr(results, field)), frame_width, frame_height)
+                 for field in LANDMARK_FIELDS.values() if getattr(results, field, None)]
+        if not boxes:
+            return None
+        x0, y0 = min(box[0] for box in boxes), min(box[1] for box in boxes)
+        x1, y1 = max(box[2] for box in boxes), max(box[3] for box in boxes)
+        pad_x = max(self.roi_padding * (x1 - x0), (MIN_ROI_SIDE - (x1 - x0)) / 2)
+        pad_y = max(self.roi_padding * (y1 - y0), (MIN_ROI_SIDE - (y1 - y0)) / 2)
+        box = (max(0, int(x0 - pad_x)), max(0, int(y0 - pad_y)),
+               min(frame_width, int(x1 + pad_x)), min(frame_height, int(y1 + pad_y)))
+        return box if box[2] > box[0] and box[3] > box[1] else None
+
+    def process(self, frame):
+        """Holistic results for one BGR frame, landmarks normalized to the whole frame."""
+        self.stats["frames"] += 1
+        if self.mode != "roi":
+            return self._run(frame)
+
+        frame_height, frame_width = frame.shape[:2]
+        if self.roi is not None and self.roi_shape == (frame_height, frame_width) and self.since_full < self.redetect_every:
+            self.since_full += 1
+            x0, y0, x1, y1 = self.roi
+            region_results = self._run(frame[y0:y1, x0:x1], self._region_holistic())
+            results = _Results(**{field: map_landmarks(getattr(region_results, field, None), self.roi, frame_width, frame_height)
+                                  for field in RESULT_FIELDS})
+            if any(getattr(results, field) for field in LANDMARK_FIELDS.values()):
+                self.stats["roi"] += 1
+                self.roi = self._track(results, frame_width, frame_height)
+                self.roi_shape = (frame_height, frame_width)
+                return results
+            self.stats["roi_lost"] += 1  # Everything left the region: look at the whole frame again
+
+        self.stats["full"] += 1
+        self.since_full = 0
+        results = self._run(frame)
+        self.roi = self._track(results, frame_width, frame_height)
+        self.roi_shape = (frame_height, frame_width)
+        return results
@@ -0,0 +1,124 @@
+import os
+import numpy as np
+
+# ==========================
+# 🔹 Hand Landmark Features
+# ==========================
+# Alternative sign model input. Instead of cropping each hand out of the frame,
+# resizing the crop to full frame size, encoding it and shrinking it back to
+# 64x64 grayscale, the 21 (x, y, z) hand landmarks MediaPipe already returns
+# are kept: 63 floats per hand per frame instead of a crop.
+#
+# Each hand's landmarks are made position and scale invariant (wrist at the
+# origin, farthest landmark at distance 1). Per stream the sequence is stored as
+#   <stream>_landmarks  (N, 21, 3) float32, zeros where the hand was not detected
+#   <stream>_present    (N,) bool
+# one entry per sampled frame, saved together in one compressed .npz for disk runs.
+
+HAND_STREAMS = ("left_hand", "right_hand")
+HAND_LANDMARKS = 21
+LANDMARK_DIMS = 3
+FEATURE_SIZE = HAND_LANDMARKS * LANDMARK_DIMS  # Classifier input per frame
+LANDMARKS_FILE = "hand_landmarks.npz"
+
+# Holistic result attribute for each hand
+HAND_FIELDS = {"left_hand": "left_hand_landmarks", "right_hand": "right_hand_landmarks"}
+
+def hand_features(landmarks):
+    """(21, 3) float32 normalized landmarks of one hand: wrist-relative, scaled to unit size."""
+    points = landmarks.landmark
+    points = np.fromiter((c for lm in points for c in (lm.x, lm.y, lm.z)), dtype=np.float32,
+                         count=LANDMARK_DIMS * len(points)).reshape(-1, LANDMARK_DIMS)
+    points -= points[0]  # Landmark 0 is the wrist
+    scale = np.linalg.norm(points, axis=1).max()
+    if scale > 0:
+        points /= scale
+    return points
+
+def new_sequences():
+    """Empty per-hand lists for record_hands."""
+    return {stream: [] for stream in HAND_STREAMS}
+
+def record_hands(sequences, results):
+    """Appends this frame's features for each hand (None when the hand wasn't detected)."""
+    for stream, field in HAND_FIELDS.items():
+        landmarks = getattr(results, field)
+        sequences[stream].append(hand_features(landmarks) if landmarks else None)
+
+def to_arrays(sequences):
+    """Turns record_hands lists into the {<stream>_landmarks, <stream>_present} arrays."""
+    arrays = {}
+    for stream in HAND_STREAMS:
+        frames = sequences[stream]
+        points = np.zeros((len(frames), HAND_LANDMARKS, LANDMARK_DIMS), dtype=np.float32)
+        present = np.zeros(len(frames), dtype=bool)
+        for i, features in enumerate(frames):
+            if features is not None:
+                points[i] = features
+                present[i] = True
+        arrays[f"{stream}_landmarks"] = points
+        arrays[f"{stream}_present"] = present
+    return arrays
+
+def save_landmarks(path, arrays):
+    """Writes the landmark arrays to one compressed .npz."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez_compressed(path, **{key: arrays[key] for key in landmark_keys()})
+    return path
+
+def load_landmarks(path):
+    """Reads arrays written by save_landmarks."""
+    with np.load(path) as data:
+        return {key: data[key] for key in landmark_keys()}
+
+def landmark_keys():
+    return [f"{stream}_{kind}" for stream in HAND_STREAMS for kind in ("landmarks", "present")]
+
+def landmark_model_input(arrays, stream):
+    """(M, 63) float32 classifier input for the frames where the hand was detected."""
+    points = arrays[f"{stream}_landmarks"][arrays[f"{stream}_present"]]
+    return points.reshape(len(points), FEATURE_SIZE)
+
+# ==========================
+# 🔹 Lightweight Landmark Classifier
+# ==========================
+class LandmarkClassifier:
+    """
+    Small NumPy MLP over (N, 63) hand features: dense + ReLU layers, softmax output.
+    Exposes predict_on_batch like the image model backends, so batch_predict works on it.
+
+    Weights are stored in an .npz as W0, b0, W1, b1, ... (W: (inputs, outputs)),
+    e.g. exported from a Keras model's get_weights() with save().
+    """
+
+    def __init__(self, weights, biases):
+        if len(weights) != len(biases) or not weights:
+            raise ValueError("LandmarkClassifier needs one bias per weight matrix")
+        if weights[0].shape[0] != FEATURE_SIZE:
+            raise ValueError(f"First layer expects {weights[0].shape[0]} inputs, landmark features have {FEATURE_SIZE}")
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"[ERROR] Landmark model not found: {path}")
+        with np.load(path) as data:
+            layers = sum(1 for key in data.files if key.startswith("W"))
+            return cls([data[f"W{i}"] for i in range(layers)], [data[f"b{i}"] for i in range(layers)])
+
+    def save(self, path):
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"W{i}"], arrays[f"b{i}"] = w, b
+        np.savez(path, **arrays)
+        return path
+
+    def predict_on_batch(self, batch):
+        x = np.asarray(batch, dtype=np.float32).reshape(len(batch), FEATURE_SIZE)
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = np.maximum(x @ w + b, 0.0)
+        logits = x @ self.weights[-1] + self.biases[-1]
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
@@ -0,0 +1,167 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import cv2
+
+from baara_preprocessing.image_ops import MODEL_FRAME_SIZE, sharpen_frame, preprocess_frame
+
+# ==========================
+# 🔹 Parallel Per-Stream Post-Processing
+# ==========================
+# Sharpening (frame.py) and resizing (preprocessing_image.py) for face,
+# left_hand and right_hand are independent and CPU-bound OpenCV work. Each
+# stream is split into frame chunks that run on a pool of workers; file names
+# are derived from frame indexes, so output is identical to the serial loops
+# whatever the worker count or completion order.
+
+POSTPROCESS_WORKERS = os.cpu_count() or 1
+# "thread" or "process". Threads by default: OpenCV releases the GIL, and the server is multithreaded,
+# so a pool started lazily there must not fork (process pools are started with "spawn")
+POSTPROCESS_EXECUTOR = "thread"
+CHUNK_FRAMES = 32  # Sampled frames per work item
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+def get_executor(kind=POSTPROCESS_EXECUTOR, workers=POSTPROCESS_WORKERS):
+    """Returns a long-lived pool (created on first use) so worker start-up is paid once per process."""
+    with _executors_lock:
+        key = (kind, workers)
+        if key not in _executors:
+            if kind == "process":
+                # Forking copies whatever locks other threads (Flask, jobs, Holistic) hold at that moment
+                _executors[key] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            elif kind == "thread":
+                _executors[key] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="postprocess")
+            else:
+                raise ValueError(f"Unknown executor '{kind}', expected 'process' or 'thread'")
+        return _executors[key]
+
+# ---------- work items (module level so they can be pickled) ----------
+def sharpen_chunk(video_path, output_folder, video_name, start, stop, frame_interval):
+    """
+    Sharpens and saves sampled frames start <= index < stop (stop None = until the end) of one video.
+    Frame index i is saved as <video_name>_frame_<i // frame_interval>.jpg, exactly like frame.py.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    saved = 0
+    frame_index = start
+    while stop is None or frame_index < stop:
+        if frame_index % frame_interval:
+            if not cap.grab():
+                break
+        else:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            filename = os.path.normpath(os.path.join(output_folder, f"{video_name}_frame_{frame_index // frame_interval:04d}.jpg"))
+            cv2.imwrite(filename, sharpen_frame(frame))
+            saved += 1
+        frame_index += 1
+
+    cap.release()
+    return saved
+
+def preprocess_chunk(input_folder, output_folder, image_files, frame_size=MODEL_FRAME_SIZE):
+    """Resizes/normalizes image_files from input_folder into output_folder (same names), like preprocess_images."""
+    processed = 0
+    for image_file in image_files:
+        image = cv2.imread(os.path.normpath(os.path.join(input_folder, image_file)))
+        if image is None:
+            print(f"⚠️ Skipping corrupted file: {os.path.join(input_folder, image_file)}")
+            continue
+        cv2.imwrite(os.path.normpath(os.path.join(output_folder, image_file)), preprocess_frame(image, frame_size))
+        processed += 1
+    return processed
+
+# ---------- planning ----------
+def plan_sharpen_chunks(input_folder, output_folder, frame_rate, chunk_frames=CHUNK_FRAMES):
+    """Splits every video in input_folder into sharpen_chunk argument tuples."""
+    chunks = []
+    for video_file in sorted(os.listdir(input_folder)):
+        if not video_file.endswith(VIDEO_EXTENSIONS):
+            continue
+        video_path = os.path.normpath(os.path.join(input_folder, video_file))
+        video_name = os.path.splitext(video_file)[0]
+
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        opened = cap.isOpened()
+        cap.release()
+        if fps == 0 or not opened:
+            print(f"⚠️ Skipping {video_file}: Invalid video file or FPS = 0")
+            continue
+
+        frame_interval = max(1, int(fps / frame_rate))
+        step = chunk_frames * frame_interval  # Chunk boundaries fall on sampled frames
+        starts = list(range(0, max(total_frames, 1), step))
+        for i, start in enumerate(starts):
+            # The frame count is only an estimate, so the last chunk reads until the video ends
+            stop = starts[i + 1] if i + 1 < len(starts) else None
+            chunks.append((video_path, output_folder, video_name, start, stop, frame_interval))
+    return chunks
+
+def sharpen_streams(feature_path, frame_path, streams, frame_rate=5,
+                    workers=POSTPROCESS_WORKERS, executor=POSTPROCESS_EXECUTOR, chunk_frames=CHUNK_FRAMES):
+    """
+    Parallel equivalent of extract_sharpened_frames for every stream: all chunks of all streams at once.
+    Returns {stream: frame folder} for streams that had a feature video folder.
+    """
+    pool = get_executor(executor, workers)
+    jobs = []
+    frame_paths = {}
+    for stream in streams:
+        input_folder = os.path.join(feature_path, stream)
+        output_folder = os.path.join(frame_path, stream)
+        if not os.path.isdir(input_folder):
+            continue
+        os.makedirs(output_folder, exist_ok=True)
+        jobs += [pool.submit(sharpen_chunk, *chunk) for chunk in plan_sharpen_chunks(input_folder, output_folder, frame_rate, chunk_frames)]
+        frame_paths[stream] = output_folder
+    for job in jobs:
+        job.result()
+    return frame_paths
+
+def resize_streams(frame_path, preprocessed_path, streams,
+                   workers=POSTPROCESS_WORKERS, executor=POSTPROCESS_EXECUTOR, chunk_frames=CHUNK_FRAMES):
+    """
+    Parallel equivalent of preprocess_images for every stream: each stream's frame list is split into chunks.
+    Returns {stream: preprocessed folder} for streams that had frames.
+    """
+    pool = get_executor(executor, workers)
+    jobs = []
+    preprocessed_paths = {}
+    for stream in streams:
+        input_folder = os.path.join(frame_path, stream)
+        if not os.path.isdir(input_folder):
+            continue
+        image_files = sorted(f for f in os.listdir(input_folder) if f.endswith(IMAGE_EXTENSIONS))
+        if not image_files:
+            continue
+        output_folder = os.path.join(preprocessed_path, stream)
+        os.makedirs(output_folder, exist_ok=True)
+        for i in range(0, len(image_files), chunk_frames):
+            jobs.append(pool.submit(preprocess_chunk, input_folder, output_folder, image_files[i:i + chunk_frames]))
+        preprocessed_paths[stream] = output_folder
+    for job in jobs:
+        job.result()
+    return preprocessed_paths
+
+def postprocess_streams(feature_path, frame_path, preprocessed_path, streams, frame_rate=5,
+                        workers=POSTPROCESS_WORKERS, executor=POSTPROCESS_EXECUTOR, chunk_frames=CHUNK_FRAMES):
+    """
+    Parallel equivalent of extract_sharpened_frames + preprocess_images for every stream.
+    Returns {stream: preprocessed folder} for streams that produced frames.
+    """
+    # 1️⃣ Sharpen, then 2️⃣ resize
+    sharpen_streams(feature_path, frame_path, streams, frame_rate, workers, executor, chunk_frames)
+    return resize_streams(frame_path, preprocessed_path, streams, workers, executor, chunk_frames)
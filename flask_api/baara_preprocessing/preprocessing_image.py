@@ -1,18 +1,16 @@
 import cv2
 import os
-import numpy as np
-import subprocess
-import sys
+
+try:
+    from baara_preprocessing.image_ops import preprocess_frame
+except ImportError:  # Running as a script from inside baara_preprocessing/
+    from image_ops import preprocess_frame
 
 # Paths
 BASE_PATH = "A:/Softwares/laragon/www/signnsync/interpretation/"
 FRAMES_PATH = os.path.normpath(os.path.join(BASE_PATH, "frames"))
 PREPROCESSED_PATH = os.path.normpath(os.path.join(BASE_PATH, "preprocessed"))
-ROUTES_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "routes.py")  # Path to routes.py
-
-# Ensure output folders exist
-for subfolder in ["face", "left_hand", "right_hand"]:
-    os.makedirs(os.path.normpath(os.path.join(PREPROCESSED_PATH, subfolder)), exist_ok=True)
+STREAMS = ("face", "left_hand", "right_hand")
 
 def preprocess_images(input_folder, output_folder, frame_size=(64, 64)):
     """
@@ -30,6 +28,7 @@ def preprocess_images(input_folder, output_folder, frame_size=(64, 64)):
         print(f"⚠️ No frames found in: {input_folder}")
         return  # Skip if no images found
 
+    os.makedirs(output_folder, exist_ok=True)  # Ensure output folder exists
     processed_count = 0
 
     for image_file in sorted(os.listdir(input_folder)):  # Ensure sorted order
@@ -43,24 +42,19 @@ def preprocess_images(input_folder, output_folder, frame_size=(64, 64)):
                 print(f"⚠️ Skipping corrupted file: {input_image_path}")
                 continue
 
-            # Resize and normalize
-            image = cv2.resize(image, frame_size)  # Resize to 64x64
-            image = image.astype(np.float32) / 255.0  # Normalize pixel values (0-1)
-
-            # Convert back to uint8 for saving
-            image_uint8 = (image * 255).astype(np.uint8)
+            # Resize to 64x64, normalize and convert back to uint8 for saving
+            image_uint8 = preprocess_frame(image, frame_size)
             cv2.imwrite(output_image_path, image_uint8)
             processed_count += 1
 
     print(f"✅ {processed_count} images preprocessed and saved in: {output_folder}")
 
-# Process face images
-preprocess_images(os.path.normpath(os.path.join(FRAMES_PATH, "face")), os.path.normpath(os.path.join(PREPROCESSED_PATH, "face")))
-
-# Process left-hand images
-preprocess_images(os.path.normpath(os.path.join(FRAMES_PATH, "left_hand")), os.path.normpath(os.path.join(PREPROCESSED_PATH, "left_hand")))
+def main(frames_path=FRAMES_PATH, preprocessed_path=PREPROCESSED_PATH):
+    """Script entry point: preprocesses <frames_path>/<stream> into <preprocessed_path>/<stream>. Nothing runs on import."""
+    for stream in STREAMS:
+        preprocess_images(os.path.normpath(os.path.join(frames_path, stream)), os.path.normpath(os.path.join(preprocessed_path, stream)))
 
-# Process right-hand images
-preprocess_images(os.path.normpath(os.path.join(FRAMES_PATH, "right_hand")), os.path.normpath(os.path.join(PREPROCESSED_PATH, "right_hand")))
+    print("✅ All images preprocessed successfully!")
 
-print("✅ All images preprocessed successfully!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 import os
-import numpy as np
-import tensorflow as tf
+import sys
 import json
-from tensorflow.keras.preprocessing import image
+
+try:
+    from baara_preprocessing.batch_predict import MAX_BATCH_SIZE, predict_classes, majority_vote
+    from baara_preprocessing.image_loader import load_frames
+    from baara_preprocessing.landmarks import landmark_model_input
+except ImportError:  # Running as a script from inside baara_preprocessing/
+    from batch_predict import MAX_BATCH_SIZE, predict_classes, majority_vote
+    from image_loader import load_frames
+    from landmarks import landmark_model_input
 
 # ==========================
 # 🔹 Suppress TensorFlow Warnings (Optional)
@@ -10,107 +17,113 @@ from tensorflow.keras.preprocessing import image
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suppress unnecessary TF logs
 
 # ==========================
-# 🔹 Load Trained Model
+# 🔹 Paths & Class Labels
 # ==========================
 MODEL_PATH = r"A:/Softwares/laragon/www/signnsync/flask_api/model/sign_language_model.h5"
+INPUT_FOLDER = r"A:/Softwares/laragon/www/signnsync/interpretation/preprocessed"
 
-if not os.path.exists(MODEL_PATH):
-    print(json.dumps({"error": "❌ Model file not found! Train and save the model first."}))
-    exit()
-
-# ✅ Load the trained model
-model = tf.keras.models.load_model(MODEL_PATH)
+# ✅ Class labels (Modify this as needed)
+CLASS_LABELS = ["Angry", "Disgust", "Happy", "Trust", "Surprised", "Fear", "Sad", "Hope", "Neutral"]
 
 # ==========================
-# 🔹 Function to Preprocess Image
+# 🔹 Load Trained Model
 # ==========================
-def preprocess_image(img_path, target_size=(64, 64)):
-    """Loads and preprocesses an image for model prediction."""
-    try:
-        img = image.load_img(img_path, target_size=target_size, color_mode='grayscale')
-        img_array = image.img_to_array(img)
-        img_array = np.expand_dims(img_array, axis=0) / 255.0  # Normalize
-        return img_array
-    except Exception as e:
-        return {"error": f"❌ Image preprocessing failed: {str(e)}"}
+def load_model(model_path=MODEL_PATH):
+    """Loads the trained sign language model. Only used when this file runs as a script;
+    the Flask API reuses the copy already held by model_loader."""
+    if not os.path.exists(model_path):
+        print(json.dumps({"error": "❌ Model file not found! Train and save the model first."}))
+        sys.exit()
+
+    import tensorflow as tf  # Imported here so the API can run on a TFLite/ONNX backend without TensorFlow
+    tf.get_logger().setLevel("ERROR")  # ✅ Suppress TensorFlow verbose logs
+    return tf.keras.models.load_model(model_path)
 
 # ==========================
 # 🔹 Function to Predict Sign Language
 # ==========================
-def predict_sign_language():
-    input_folder = r"A:/Softwares/laragon/www/signnsync/interpretation/preprocessed"
-    left_hand_folder = os.path.join(input_folder, "left_hand")
-    right_hand_folder = os.path.join(input_folder, "right_hand")
-
-    left_hand_preds = []
-    right_hand_preds = []
-
-    # ✅ Ensure both input folders exist and contain frames
-    if not os.path.exists(left_hand_folder) or not os.listdir(left_hand_folder):
-        return json.dumps({"error": "❌ No preprocessed left-hand frames found!"})
-
-    if not os.path.exists(right_hand_folder) or not os.listdir(right_hand_folder):
-        return json.dumps({"error": "❌ No preprocessed right-hand frames found!"})
+def combine_hands(left_pred, right_pred):
+    """Prediction text for the left/right hand votes (either may be None)."""
+    if left_pred is not None and right_pred is not None:
+        if left_pred == right_pred:
+            return CLASS_LABELS[right_pred]
+        return "⚠️ Left and right hands detected different signs."
+    if left_pred is not None:
+        return CLASS_LABELS[left_pred]
+    if right_pred is not None:
+        return CLASS_LABELS[right_pred]
+    return "❌ No valid sign detected."
+
+def sign_from_batches(model, left_hand_batch, right_hand_batch, max_batch_size=MAX_BATCH_SIZE):
+    """
+    Predicts the sign for (N, 64, 64, 1) batches of both hands and returns the combined majority vote as a dict.
+    A hand with no frames (never detected) is left out of the vote.
+    """
+    if len(left_hand_batch) == 0 and len(right_hand_batch) == 0:
+        return {"error": "❌ No preprocessed hand frames found!"}
 
     try:
-        # ✅ Predict for left hand
-        for img_name in sorted(os.listdir(left_hand_folder)):
-            img_path = os.path.join(left_hand_folder, img_name)
-            img_array = preprocess_image(img_path)
-
-            if isinstance(img_array, dict) and "error" in img_array:
-                return json.dumps(img_array)  # Return JSON error if preprocessing fails
-
-            # ✅ Suppress TensorFlow verbose logs
-            tf.get_logger().setLevel("ERROR")
-
-            # ✅ Make prediction
-            left_pred = model.predict(img_array, verbose=0)  # Suppressed verbose output
-            left_hand_preds.append(np.argmax(left_pred))
-
-        # ✅ Predict for right hand
-        for img_name in sorted(os.listdir(right_hand_folder)):
-            img_path = os.path.join(right_hand_folder, img_name)
-            img_array = preprocess_image(img_path)
-
-            if isinstance(img_array, dict) and "error" in img_array:
-                return json.dumps(img_array)  # Return JSON error if preprocessing fails
-
-            # ✅ Make prediction
-            right_pred = model.predict(img_array, verbose=0)
-            right_hand_preds.append(np.argmax(right_pred))
+        # ✅ One forward pass per micro-batch instead of one per frame
+        left_hand_preds = predict_classes(model, left_hand_batch, max_batch_size)
+        right_hand_preds = predict_classes(model, right_hand_batch, max_batch_size)
 
         # ✅ Ensure at least one prediction is made
         if not left_hand_preds and not right_hand_preds:
-            return json.dumps({"error": "❌ No valid predictions made!"})
+            return {"error": "❌ No valid predictions made!"}
 
         # ✅ Determine the most frequent prediction
-        final_left_pred = max(set(left_hand_preds), key=left_hand_preds.count) if left_hand_preds else None
-        final_right_pred = max(set(right_hand_preds), key=right_hand_preds.count) if right_hand_preds else None
-
-        # ✅ Class labels (Modify this as needed)
-        class_labels = ["Angry", "Disgust", "Happy", "Trust", "Surprised", "Fear", "Sad", "Hope", "Neutral"]
-
-        # ✅ Determine final prediction text
-        if final_left_pred is not None and final_right_pred is not None:
-            if final_left_pred == final_right_pred:
-                prediction_text = class_labels[final_right_pred]
-            else:
-                prediction_text = "⚠️ Left and right hands detected different signs."
-        elif final_left_pred is not None:
-            prediction_text = class_labels[final_left_pred]
-        elif final_right_pred is not None:
-            prediction_text = class_labels[final_right_pred]
-        else:
-            prediction_text = "❌ No valid sign detected."
-
-        return json.dumps({"sign_prediction": prediction_text})
+        final_left_pred = majority_vote(left_hand_preds)
+        final_right_pred = majority_vote(right_hand_preds)
+
+        return {"sign_prediction": combine_hands(final_left_pred, final_right_pred)}
 
     except Exception as e:
-        return json.dumps({"error": f"⚠️ Prediction error: {str(e)}"})
+        return {"error": f"⚠️ Prediction error: {str(e)}"}
+
+def sign_from_folders(model, left_hand_folder, right_hand_folder, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the sign for both hand folders and returns the combined majority vote as a dict.
+    A missing or empty folder (hand never detected) is left out of the vote."""
+    batches = []
+    for folder in (left_hand_folder, right_hand_folder):
+        # ✅ Only folders that exist and contain frames are loaded
+        if not os.path.exists(folder) or not os.listdir(folder):
+            batches.append([])
+            continue
+        batch = load_frames(folder)
+        if isinstance(batch, dict):
+            return batch  # Return error if preprocessing fails
+        batches.append(batch)
+
+    left_hand_batch, right_hand_batch = batches
+
+    return sign_from_batches(model, left_hand_batch, right_hand_batch, max_batch_size)
+
+def sign_from_landmarks(model, arrays, max_batch_size=MAX_BATCH_SIZE):
+    """
+    Predicts the sign from hand landmark sequences (landmarks.to_arrays / load_landmarks) with a
+    landmark classifier and returns the combined majority vote as a dict. Only frames where a
+    hand was detected are classified.
+    """
+    try:
+        left_hand_preds = predict_classes(model, landmark_model_input(arrays, "left_hand"), max_batch_size)
+        right_hand_preds = predict_classes(model, landmark_model_input(arrays, "right_hand"), max_batch_size)
+        return {"sign_prediction": combine_hands(majority_vote(left_hand_preds), majority_vote(right_hand_preds))}
+
+    except Exception as e:
+        return {"error": f"⚠️ Prediction error: {str(e)}"}
+
+def predict_sign_language(model, input_folder=INPUT_FOLDER):
+    """Script entry point: predicts on <input_folder>/left_hand and right_hand and returns JSON text."""
+    return json.dumps(sign_from_folders(
+        model,
+        os.path.join(input_folder, "left_hand"),
+        os.path.join(input_folder, "right_hand"),
+    ))
 
 # ==========================
 # 🔹 Run Prediction
 # ==========================
 if __name__ == "__main__":
-    print(predict_sign_language())
\ No newline at end of file
+    # Optional argument: preprocessed folder to read instead of INPUT_FOLDER
+    input_folder = sys.argv[1] if len(sys.argv) > 1 else INPUT_FOLDER
+    print(predict_sign_language(load_model(), input_folder))
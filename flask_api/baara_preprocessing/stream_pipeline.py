@@ -0,0 +1,119 @@
+import os
+import time
+import cv2
+import mediapipe as mp
+
+from baara_preprocessing import feature_extract
+from baara_preprocessing.feature_extract import DEFAULT_FRAME_RATE, iter_feature_frames, sampling_interval
+from baara_preprocessing.image_ops import sharpen_frame, resize_frame, to_model_input
+from baara_preprocessing.video_io import VideoReader
+from baara_preprocessing.landmarks import new_sequences, to_arrays
+from baara_preprocessing import detections as detection_masks
+from baara_preprocessing.landmark_detector import LandmarkDetector
+
+# ==========================
+# 🔹 In-Memory Video → Model Input Pipeline
+# ==========================
+# Same stages as extract_features → frame.py → preprocessing_image.py, but the
+# crops are passed along as NumPy arrays instead of being encoded to mp4v,
+# decoded, written as JPEGs and read back again. Disk writes only happen when
+# a debug folder is given.
+
+STREAMS = ("face", "left_hand", "right_hand")
+
+def extract_stream_batches(input_video_path, frame_rate=DEFAULT_FRAME_RATE, debug_folder=None, streams=STREAMS,
+                           hand_landmarks=False):
+    """
+    Runs MediaPipe cropping, frame sampling, sharpening and resizing without intermediate files.
+
+    Args:
+        input_video_path (str): Uploaded video.
+        frame_rate (int): Number of frames to score per second (same as frame.py).
+        debug_folder (str): Optional folder; if given, the 64x64 frames are also saved
+            as <debug_folder>/<stream>/test_<stream>_frame_0000.jpg for inspection.
+        streams (tuple): Streams turned into pixel model input (e.g. only "face" when the
+            sign model runs on landmarks).
+        hand_landmarks (bool): Also return the hand landmark arrays (landmarks.to_arrays keys).
+
+    Returns:
+        (batches, timings): batches maps each stream to a (N, 64, 64, 1) float32 array holding
+        only the frames the stream was detected in (every sampled frame without SKIP_FILLER_FRAMES),
+        plus the timestamps and per-stream masks of all sampled frames (detections.to_arrays keys)
+        and the landmark arrays when requested; timings holds the seconds spent per stage
+        ("landmarks" is split into "decode", "holistic" and "crop"), frame counts and the number
+        of sampled frames each stream was detected in ("detected").
+    """
+    timings = {"landmarks": 0.0, "decode": 0.0, "holistic": 0.0, "crop": 0.0, "sharpen": 0.0, "resize": 0.0,
+               "debug_writes": 0.0, "frames_total": 0, "frames_sampled": 0, "detected": dict.fromkeys(STREAMS, 0)}
+    frames = {stream: [] for stream in streams}
+    landmarks = new_sequences() if hand_landmarks else None
+    detections = detection_masks.new_detections()
+
+    def result():
+        batches = {stream: to_model_input(frames[stream]) for stream in streams}
+        batches.update(detection_masks.to_arrays(detections))
+        if landmarks is not None:
+            batches.update(to_arrays(landmarks))
+        return batches
+
+    cap = VideoReader(input_video_path)  # Decodes ahead while Holistic runs
+    if not cap.isOpened():
+        print(f"❌ Error: Unable to open video file {input_video_path}")
+        return result(), timings
+
+    frame_width = int(cap.get(3))
+    frame_height = int(cap.get(4))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_interval = sampling_interval(fps, frame_rate)
+
+    if debug_folder:
+        for stream in streams:
+            os.makedirs(os.path.join(debug_folder, stream), exist_ok=True)
+
+    mp_holistic = mp.solutions.holistic
+    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic, \
+            LandmarkDetector(holistic) as detector:  # DETECTION_MODE: full / downscaled / ROI-tracked
+        stage_start = time.perf_counter()
+        # Only sampled frames are decoded and run through Holistic
+        for frame_index, crops, detected in iter_feature_frames(cap, detector, frame_width, frame_height, frame_interval,
+                                                                 streams, landmarks, timings):
+            timings["landmarks"] += time.perf_counter() - stage_start
+            timings["frames_total"] = frame_index + 1
+            detection_masks.record_detections(detections, frame_index / fps if fps else 0.0, detected)
+            for stream in STREAMS:
+                timings["detected"][stream] += detected[stream]
+
+            for stream in streams:
+                if feature_extract.SKIP_FILLER_FRAMES and not detected[stream]:
+                    continue  # Filler frame: not sharpened, resized or classified
+
+                start = time.perf_counter()
+                sharpened = sharpen_frame(crops[stream])
+                timings["sharpen"] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                small = resize_frame(sharpened)
+                timings["resize"] += time.perf_counter() - start
+
+                if debug_folder:
+                    start = time.perf_counter()
+                    filename = f"test_{stream}_frame_{len(frames[stream]):04d}.jpg"
+                    cv2.imwrite(os.path.join(debug_folder, stream, filename), small)
+                    timings["debug_writes"] += time.perf_counter() - start
+
+                frames[stream].append(small)
+            timings["frames_sampled"] += 1
+
+            stage_start = time.perf_counter()
+        # Skipped frames after the last sampled one still count towards the clip length
+        timings["frames_total"] = max(timings["frames_total"], int(cap.get(cv2.CAP_PROP_POS_FRAMES)))
+
+    cap.release()
+
+    extraction_time = timings["landmarks"] + timings["sharpen"] + timings["resize"] + timings["debug_writes"]
+    timings["frames_per_second"] = timings["frames_total"] / extraction_time if extraction_time > 0 else 0.0
+
+    batches = result()
+    print(f"✅ In-memory pipeline: {timings['frames_sampled']} of {timings['frames_total']} frames sampled per stream "
+          f"({timings['frames_per_second']:.1f} frames/sec).")
+    return batches, timings
@@ -0,0 +1,282 @@
+import queue
+import threading
+import cv2
+
+# ==========================
+# 🔹 Threaded Video I/O
+# ==========================
+# Decoding and encoding used to run on the same thread as MediaPipe, so every
+# decode stall added straight to the Holistic time. VideoReader decodes ahead
+# on a background thread into a bounded queue, AsyncVideoWriter encodes from
+# one, and the caller only ever waits when the queue is empty (or full).
+#
+# Two decode backends:
+# "opencv": cv2.VideoCapture (FFmpeg), with hardware decoding when OpenCV has it.
+# "pyav":   PyAV (pip install av). Multi-threaded FFmpeg decoding, keyframe-based
+#           seeking, and a keyframes-only mode for cheap coarse sampling.
+
+VIDEO_BACKENDS = ("opencv", "pyav")
+VIDEO_BACKEND = "opencv"
+PREFETCH_FRAMES = 32      # Decoded frames buffered ahead of the consumer
+WRITE_QUEUE_FRAMES = 64   # Frames buffered ahead of each encoder
+HW_ACCELERATION = True    # Ask OpenCV for hardware decoding (falls back to software when unavailable)
+
+_END = object()  # Queue sentinel
+
+def _open_capture(path):
+    """cv2.VideoCapture, with hardware decoding requested when this OpenCV build supports it."""
+    if HW_ACCELERATION and hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(path)
+
+class _OpenCVSource:
+    def __init__(self, path):
+        self.cap = _open_capture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.position = 0  # Frames advanced so far (decoded or grabbed)
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def frames(self, frame_interval=1, start=0, keyframes_only=False):
+        """Yields (frame_index, BGR frame) for every frame_interval-th frame from start, skipped frames are only grabbed."""
+        if start:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        frame_index = start
+        while True:
+            if (frame_index - start) % frame_interval:
+                if not self.cap.grab():
+                    break
+            else:
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                yield frame_index, frame
+            frame_index += 1
+            self.position = frame_index
+
+    def release(self):
+        self.cap.release()
+
+class _PyAVSource:
+    def __init__(self, path):
+        import av  # Optional dependency, only needed for this backend
+
+        self.container = av.open(path)
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = "AUTO"  # Frame + slice threading inside FFmpeg
+        rate = self.stream.average_rate or self.stream.guessed_rate
+        self.fps = float(rate) if rate else 0.0
+        self.width = self.stream.codec_context.width
+        self.height = self.stream.codec_context.height
+        self.frame_count = self.stream.frames
+        self.position = 0
+
+    def is_opened(self):
+        return True
+
+    def _index(self, frame):
+        """Frame number from the presentation timestamp (exact for constant frame rate video)."""
+        if frame.pts is None or not self.fps:
+            return None
+        start_pts = self.stream.start_time or 0
+        return int(round(float((frame.pts - start_pts) * self.stream.time_base) * self.fps))
+
+    def frames(self, frame_interval=1, start=0, keyframes_only=False):
+        """
+        Yields (frame_index, BGR frame) like the OpenCV source. Skipped frames are still decoded
+        (later frames depend on them) but never converted to BGR.
+        keyframes_only: only keyframes are decoded at all and every one is yielded (frame_interval is ignored).
+        """
+        if keyframes_only:
+            self.stream.codec_context.skip_frame = "NONKEY"
+        if start and self.fps:
+            # Jump to the keyframe before start, then decode forward to it
+            self.container.seek(int(start / self.fps / self.stream.time_base) + (self.stream.start_time or 0),
+                                stream=self.stream, backward=True, any_frame=False)
+
+        frame_index = None
+        for frame in self.container.decode(self.stream):
+            if keyframes_only or frame_index is None:
+                # Position from the timestamp after a seek / between keyframes, then count frames
+                index = self._index(frame)
+                frame_index = index if index is not None else (0 if frame_index is None else frame_index + 1)
+            else:
+                frame_index += 1
+            if frame_index < start:
+                continue
+            self.position = frame_index + 1
+            if keyframes_only or (frame_index - start) % frame_interval == 0:
+                yield frame_index, frame.to_ndarray(format="bgr24")
+
+    def release(self):
+        self.container.close()
+
+class VideoReader:
+    """
+    Prefetching video reader. Iterate over reader.frames(frame_interval) to get
+    (frame_index, BGR frame) pairs; decoding runs on a background thread. Also
+    answers the cv2.VideoCapture calls the pipeline uses (isOpened, get, release).
+    """
+
+    def __init__(self, path, backend=None, prefetch=PREFETCH_FRAMES):
+        backend = backend or VIDEO_BACKEND
+        if backend not in VIDEO_BACKENDS:
+            raise ValueError(f"Unknown video backend '{backend}', expected one of {VIDEO_BACKENDS}")
+
+        self.path = path
+        self.backend = backend
+        self.prefetch = prefetch
+        try:
+            self.source = _PyAVSource(path) if backend == "pyav" else _OpenCVSource(path)
+        except Exception as e:  # PyAV raises on unreadable files, OpenCV just reports not opened
+            print(f"❌ Error: Unable to open video file {path}: {e}")
+            self.source = None
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def isOpened(self):
+        return self.source is not None and self.source.is_opened()
+
+    def get(self, prop):
+        """Subset of cv2.VideoCapture.get: FPS, width, height, frame count and position (frames advanced)."""
+        if self.source is None:
+            return 0
+        return {
+            cv2.CAP_PROP_FPS: self.source.fps,
+            cv2.CAP_PROP_FRAME_WIDTH: self.source.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.source.height,
+            cv2.CAP_PROP_FRAME_COUNT: self.source.frame_count,
+            cv2.CAP_PROP_POS_FRAMES: self.source.position,
+        }.get(prop, 0)
+
+    def frames(self, frame_interval=1, start=0, keyframes_only=False):
+        """Yields (frame_index, frame) for every frame_interval-th frame, decoded ahead on a background thread."""
+        if keyframes_only and self.backend != "pyav":
+            raise ValueError("keyframes_only needs the pyav backend")
+        if not self.isOpened():
+            return
+        frame_queue = queue.Queue(maxsize=max(1, self.prefetch))
+
+        def put(item):
+            """Queues item unless the consumer stopped; never blocks past a stop (the consumer joins this thread)."""
+            while not self._stop.is_set():
+                try:
+                    frame_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def decode():
+            try:
+                for item in self.source.frames(frame_interval, start, keyframes_only):
+                    if not put(item):
+                        return
+                put(_END)
+            except Exception as e:
+                put(e)
+
+        self._thread = threading.Thread(target=decode, name="video-reader", daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Consumer stopped early (or finished): let the decoder exit
+            self._stop.set()
+            self._thread.join()
+            self._stop.clear()
+
+    def release(self):
+        if self.source is not None:
+            self.source.release()
+
+def iter_frames(cap, frame_interval=1):
+    """
+    Yields (frame_index, frame) for every frame_interval-th frame of a VideoReader
+    or a plain cv2.VideoCapture (skipped frames are grabbed, not decoded).
+    """
+    if isinstance(cap, VideoReader):
+        yield from cap.frames(frame_interval)
+        return
+
+    frame_index = 0
+    while cap.isOpened():
+        if frame_index % frame_interval:
+            # ⏩ Not scored: advance without decoding
+            if not cap.grab():
+                break
+            frame_index += 1
+            continue
+
+        ret, frame = cap.read()
+        if not ret:
+            break  # Stop if video ends
+        yield frame_index, frame
+        frame_index += 1
+
+class AsyncVideoWriter:
+    """
+    cv2.VideoWriter that encodes on a background thread. write() only blocks when the queue is full.
+    An encoding error stops the thread; it is raised from the next write() or from release().
+    """
+
+    def __init__(self, path, fourcc, fps, frame_size, queue_size=WRITE_QUEUE_FRAMES):
+        self.writer = cv2.VideoWriter(path, fourcc, fps, frame_size)
+        self.frames = queue.Queue(maxsize=max(1, queue_size))
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="video-writer", daemon=True)
+        self.thread.start()
+
+    def isOpened(self):
+        return self.writer.isOpened()
+
+    def _run(self):
+        try:
+            while True:
+                frame = self.frames.get()
+                if frame is _END:
+                    break
+                self.writer.write(frame)
+        except Exception as e:
+            self.error = e
+
+    def _put(self, item):
+        """Queues item while the thread is alive. Returns False once it has stopped (nothing will drain the queue)."""
+        while self.thread.is_alive():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def write(self, frame):
+        self._raise_error()
+        if not self._put(frame):
+            self._raise_error()
+            raise RuntimeError("Video writer is already released")
+
+    def release(self):
+        """Waits for the queued frames to be encoded and closes the file. Raises the writer thread's error, if any."""
+        self._put(_END)
+        self.thread.join()
+        self.writer.release()
+        self._raise_error()
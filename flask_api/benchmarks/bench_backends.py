@@ -0,0 +1,141 @@
+"""
+Compares the inference backends (Keras, TFLite float32/fp16/int8, ONNX Runtime)
+on load time, per-batch latency, peak memory and agreement with the Keras
+model's per-frame classes. Each backend runs in its own interpreter so one
+runtime's imports don't inflate another's memory numbers. Backends whose
+files or runtime are missing are skipped; create them with model_export.py.
+
+The emotion model runs on the face frames and the sign model on the hand
+frames of a preprocessed folder (repeated up to --frames), so the agreement
+reflects real inputs. Without that folder the models get random noise, which
+still times them but says little about quantization accuracy.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_backends --frames 300 --runs 5
+    python -m benchmarks.bench_backends --preprocessed ../interpretation/preprocessed
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+FLASK_API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_FILES = {  # model_loader isn't imported here: it would load both models with its configured backend
+    "emotion": os.path.join(FLASK_API_DIR, "model", "emotion_model.h5"),
+    "sign": os.path.join(FLASK_API_DIR, "model", "sign_language_model.h5"),
+}
+DEFAULT_PREPROCESSED = os.path.join(os.path.dirname(FLASK_API_DIR), "interpretation", "preprocessed")
+MODEL_STREAMS = {"emotion": ("face",), "sign": ("left_hand", "right_hand")}
+CONFIGS = [("keras", None), ("tflite", None), ("tflite", "fp16"), ("tflite", "int8"), ("onnxruntime", None)]
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, None where the resource module is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+
+def load_batches(preprocessed, frames):
+    """
+    ({model: (frames, 64, 64, 1) batch}, None) from the preprocessed stream folders, each repeated
+    up to frames, or (None, reason) when a folder is missing, empty or unreadable.
+    """
+    from baara_preprocessing.image_loader import load_frames
+
+    batches = {}
+    for name, streams in MODEL_STREAMS.items():
+        loaded = []
+        for stream in streams:
+            folder = os.path.join(preprocessed, stream)
+            if not os.path.isdir(folder) or not os.listdir(folder):
+                return None, f"no frames in {folder}"
+            batch = load_frames(folder, use_cache=False)  # No .npy next to the sample frames
+            if isinstance(batch, dict):
+                return None, batch["error"]
+            loaded.append(np.asarray(batch))
+        batches[name] = np.resize(np.concatenate(loaded), (frames, 64, 64, 1))
+    return batches, None
+
+def run_worker(backend, variant, frames, runs, batch_size, preprocessed):
+    """Loads one backend, times it on the preprocessed frames (or a fixed random batch) and prints a JSON summary."""
+    from inference_backends import load_backend
+    from baara_preprocessing.batch_predict import predict_classes
+
+    batches, _ = load_batches(preprocessed, frames)
+    noise = np.random.default_rng(0).random((frames, 64, 64, 1), dtype=np.float32)
+    summary = {}
+    for name, h5_path in MODEL_FILES.items():
+        batch = batches[name] if batches else noise
+        start = time.perf_counter()
+        model = load_backend(backend, h5_path, variant)
+        load_seconds = time.perf_counter() - start
+
+        predict_classes(model, batch[:1], batch_size)  # Warm-up
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            preds = predict_classes(model, batch, batch_size)
+            latencies.append(time.perf_counter() - start)
+
+        summary[name] = {"load_seconds": load_seconds, "latency_seconds": min(latencies), "preds": preds}
+    summary["peak_rss_mb"] = peak_rss_mb()
+    print(json.dumps(summary))
+
+def run_config(backend, variant, args):
+    """Runs one backend in a fresh interpreter. Returns its summary dict, or an error string."""
+    cmd = [sys.executable, "-m", "benchmarks.bench_backends", "--worker", backend,
+           "--frames", str(args.frames), "--runs", str(args.runs), "--batch-size", str(args.batch_size),
+           "--preprocessed", args.preprocessed]
+    if variant:
+        cmd += ["--variant", variant]
+    result = subprocess.run(cmd, cwd=FLASK_API_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        return (result.stderr.strip().splitlines() or ["failed"])[-1]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--preprocessed", default=DEFAULT_PREPROCESSED, help="Folder with face/left_hand/right_hand frames")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--variant", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.variant, args.frames, args.runs, args.batch_size, args.preprocessed)
+        return
+
+    _, reason = load_batches(args.preprocessed, args.frames)
+    if reason:
+        print(f"⚠️ {reason}: timing on random noise, agreement says little about accuracy on real frames")
+    else:
+        print(f"🔹 Preprocessed frames: {args.preprocessed}")
+
+    reference = None
+    for backend, variant in CONFIGS:
+        label = f"{backend}{'-' + variant if variant else ''}"
+        summary = run_config(backend, variant, args)
+        if isinstance(summary, str):
+            print(f"⏭️ {label:<14} skipped: {summary}")
+            continue
+        if reference is None:
+            reference = summary  # First backend that runs (Keras when available) is the parity reference
+
+        rss = f"{summary['peak_rss_mb']:7.0f} MB" if summary["peak_rss_mb"] else "      n/a"
+        print(f"🔹 {label:<14} peak RSS {rss}")
+        for name in ("emotion", "sign"):
+            stats = summary[name]
+            ref_preds = reference[name]["preds"]
+            agreement = sum(a == b for a, b in zip(stats["preds"], ref_preds)) / max(len(ref_preds), 1)
+            print(f"   {name:<8} load {stats['load_seconds']:6.2f}s | {args.frames} frames "
+                  f"{stats['latency_seconds'] * 1000:8.1f} ms | agreement {agreement * 100:5.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Compares per-frame model calls (batch size 1) against batched
+inference through batch_predict.predict_classes for several micro-batch sizes,
+and checks that every configuration produces the same per-frame classes.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_batching --frames 300
+"""
+import time
+import argparse
+import numpy as np
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300, help="Frames per stream (5 fps sampling of a 60s clip = 300)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    import model_loader
+    from baara_preprocessing.batch_predict import predict_classes
+
+    rng = np.random.default_rng(0)
+    batch = rng.random((args.frames, 64, 64, 1), dtype=np.float32)
+
+    for name in ("emotion", "sign"):
+        model = model_loader.get_model(name)
+        model.predict_on_batch(batch[:1])  # Warm-up
+
+        start = time.perf_counter()
+        baseline = [int(np.argmax(model.predict_on_batch(batch[i:i + 1]))) for i in range(len(batch))]
+        per_frame = time.perf_counter() - start
+        print(f"🔹 {name}: per-frame calls    {per_frame * 1000:9.1f} ms ({args.frames} calls)")
+
+        for size in args.batch_sizes:
+            start = time.perf_counter()
+            preds = predict_classes(model, batch, size)
+            elapsed = time.perf_counter() - start
+            status = "✅" if preds == baseline else "⚠️ mismatch"
+            print(f"   batch size {size:<4}        {elapsed * 1000:9.1f} ms ({per_frame / elapsed:5.1f}x) {status}")
+
+if __name__ == "__main__":
+    main()
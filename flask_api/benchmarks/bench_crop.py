@@ -0,0 +1,68 @@
+"""
+Micro-benchmark of the crop box computation: the old per-landmark Python loop
+(three times per frame: face, right hand, left hand) against baara_preprocessing.crop,
+with a check that both give identical boxes.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_crop --frames 1000
+"""
+import time
+import argparse
+import types
+import numpy as np
+
+from baara_preprocessing.crop import LANDMARK_FIELDS, PADDING, crop_features
+
+LANDMARK_COUNTS = {"face_landmarks": 468, "right_hand_landmarks": 21, "left_hand_landmarks": 21}
+
+def fake_results(rng):
+    """Holistic-like results with random normalized landmarks (some slightly outside the frame)."""
+    results = types.SimpleNamespace()
+    for field, count in LANDMARK_COUNTS.items():
+        points = [types.SimpleNamespace(x=float(x), y=float(y)) for x, y in rng.uniform(-0.05, 1.05, (count, 2))]
+        setattr(results, field, types.SimpleNamespace(landmark=points))
+    return results
+
+def loop_box(landmarks, w, h, padding=PADDING):
+    """The original extract_features loop."""
+    x_min, y_min, x_max, y_max = w, h, 0, 0
+    for lm in landmarks.landmark:
+        x, y = int(lm.x * w), int(lm.y * h)
+        x_min, x_max = min(x_min, x), max(x_max, x)
+        y_min, y_max = min(y_min, y), max(y_max, y)
+    x_min, x_max = max(0, x_min - padding), min(w, x_max + padding)
+    y_min, y_max = max(0, y_min - padding), min(h, y_max + padding)
+    return x_min, y_min, x_max, y_max
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = np.zeros((args.height, args.width, 3), dtype=np.uint8)
+    all_results = [fake_results(rng) for _ in range(args.frames)]
+
+    start = time.perf_counter()
+    loop_boxes = [
+        {stream: loop_box(getattr(results, field), args.width, args.height) for stream, field in LANDMARK_FIELDS.items()}
+        for results in all_results
+    ]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector_boxes = [
+        {stream: box for stream, (_, box) in crop_features(frame, results).items()}
+        for results in all_results
+    ]
+    vector_time = time.perf_counter() - start
+
+    print(f"🔹 {args.frames} frames at {args.width}x{args.height} (468 face + 2x21 hand landmarks each)")
+    print(f"   python loop   {loop_time * 1e6 / args.frames:8.1f} µs/frame")
+    print(f"   vectorized    {vector_time * 1e6 / args.frames:8.1f} µs/frame ({loop_time / vector_time:.1f}x)")
+    print("   ✅ identical boxes" if loop_boxes == vector_boxes else "   ⚠️ boxes differ")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Per-frame landmark detection latency at 720p, 1080p and 4K for the detection
+modes of landmark_detector: the current path (full-frame BGR→RGB + Holistic on
+the full resolution) against Holistic on a downscaled copy and on a tracked
+region of interest, each followed by the full-resolution crops (track_features).
+Also reports how often the ROI mode fell back to a full-frame detection, and
+how closely each mode's face/hand boxes match the full-resolution ones (IoU).
+
+Frames come from --video (resized to each resolution, so detections are real)
+or from the synthetic generator, in which MediaPipe usually finds nothing and
+the ROI mode therefore keeps re-detecting the whole frame.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_detection --video ../interpretation/test.mp4 --frames 60
+    python -m benchmarks.bench_detection --resolutions 1080p 4k --max-side 640 --redetect-every 15
+"""
+import time
+import argparse
+import cv2
+import numpy as np
+import mediapipe as mp
+
+from baara_preprocessing.crop import LANDMARK_FIELDS, landmarks_to_array, landmark_box
+from baara_preprocessing.feature_extract import track_features
+from baara_preprocessing.landmark_detector import DETECTION_MODES, DETECT_MAX_SIDE, REDETECT_EVERY, LandmarkDetector
+from baara_preprocessing.video_io import VideoReader
+from benchmarks.synthetic import synthetic_frames
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "4k": (3840, 2160)}
+
+def load_frames(video, count, width, height):
+    """count frames of video resized to width x height, or synthetic frames without a video."""
+    if not video:
+        return list(synthetic_frames(count, width, height, seed=0))
+    reader = VideoReader(video)
+    frames = []
+    for _, frame in reader.frames():
+        frames.append(cv2.resize(frame, (width, height), interpolation=cv2.INTER_LINEAR))
+        if len(frames) == count:
+            break
+    reader.release()
+    return frames
+
+class RecordingDetector(LandmarkDetector):
+    """Keeps every frame's results so the boxes can be compared after the timed loop."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.results = []
+
+    def process(self, frame):
+        results = super().process(frame)
+        self.results.append(results)
+        return results
+
+def iou(a, b):
+    x0, y0, x1, y1 = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, x1 - x0) * max(0, y1 - y0)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union else 0.0
+
+def run_mode(frames, mode, max_side, redetect_every):
+    """(ms per frame, {"holistic", "crop"} ms per frame, per-frame boxes, detector stats) for one mode."""
+    height, width = frames[0].shape[:2]
+    timings = {}
+    boxes = []
+    with mp.solutions.holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic, \
+            RecordingDetector(holistic, mode, max_side, redetect_every) as detector:
+        blank = np.zeros((height, width, 3), dtype=np.uint8)
+        last_frames = {stream: blank for stream in LANDMARK_FIELDS}
+
+        start = time.perf_counter()
+        for frame in frames:
+            track_features(frame, detector, last_frames, width, height, timings=timings)
+        seconds = time.perf_counter() - start
+
+    for results in detector.results:
+        boxes.append({stream: landmark_box(landmarks_to_array(getattr(results, field)), width, height)
+                      for stream, field in LANDMARK_FIELDS.items() if getattr(results, field, None)})
+    per_frame = {stage: seconds * 1000 / len(frames) for stage, seconds in timings.items()}
+    return seconds * 1000 / len(frames), per_frame, boxes, detector.stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default=None, help="Clip to resize to each resolution (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument("--max-side", type=int, default=DETECT_MAX_SIDE, help="Longest side Holistic sees when downscaling")
+    parser.add_argument("--redetect-every", type=int, default=REDETECT_EVERY)
+    args = parser.parse_args()
+
+    for name in args.resolutions:
+        width, height = RESOLUTIONS[name]
+        frames = load_frames(args.video, args.frames, width, height)
+        print(f"\n🔹 {name} ({width}x{height}), {len(frames)} frames, max side {args.max_side}")
+        print(f"   {'mode':<10} {'ms/frame':>9} {'holistic':>9} {'crop':>7} {'speed-up':>9} {'box IoU':>8}  roi/full/lost")
+
+        reference = None
+        for mode in DETECTION_MODES:
+            ms, stages, boxes, stats = run_mode(frames, mode, args.max_side, args.redetect_every)
+            if reference is None:
+                reference = (ms, boxes)  # "full" is the current path
+
+            # Agreement with the full-resolution detection, over the boxes both found
+            scores = [iou(ref[stream], box[stream]) for ref, box in zip(reference[1], boxes) for stream in ref if stream in box]
+            agreement = f"{np.mean(scores):8.3f}" if scores else f"{'n/a':>8}"
+            roi = f"{stats['roi']}/{stats['full']}/{stats['roi_lost']}" if mode == "roi" else ""
+            print(f"   {mode:<10} {ms:9.2f} {stages.get('holistic', 0.0):9.2f} {stages.get('crop', 0.0):7.2f} "
+                  f"{reference[0] / ms:8.1f}x {agreement}  {roi}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-file Keras loading (load_img → img_to_array → expand_dims → /255, then
+concatenate) against image_loader.load_frames with one and several decode
+threads, and against memory-mapping the cached .npy. Also checks that every
+path produces the same array.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_image_loader --frames 300 --runs 5
+    python -m benchmarks.bench_image_loader --folder ../interpretation/preprocessed/face
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import cv2
+import numpy as np
+
+from baara_preprocessing.image_loader import load_frames, LOADER_WORKERS
+
+def keras_load(folder):
+    """The old emotion/sign preprocess_image + stack loop."""
+    try:
+        from tensorflow.keras.preprocessing.image import load_img, img_to_array
+    except ImportError:  # Same PIL path load_img takes, without TensorFlow
+        from PIL import Image
+
+        def load_img(path, target_size, color_mode):
+            return Image.open(path).convert("L").resize(target_size, Image.NEAREST)
+
+        def img_to_array(img):
+            return np.asarray(img, dtype=np.float32)[..., None]
+
+    arrays = []
+    for name in sorted(os.listdir(folder)):
+        img = load_img(os.path.join(folder, name), target_size=(64, 64), color_mode="grayscale")
+        arrays.append(np.expand_dims(img_to_array(img), axis=0) / 255.0)
+    return np.concatenate(arrays, axis=0)
+
+def write_frames(folder, count):
+    """Sharpened-looking 64x64 JPEGs like preprocessing_image.py writes."""
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        frame = cv2.GaussianBlur(rng.integers(0, 255, (64, 64, 3), dtype=np.uint8), (3, 3), 0)
+        cv2.imwrite(os.path.join(folder, f"test_face_frame_{i:04d}.jpg"), frame)
+
+def best_of(fn, runs):
+    result, best = None, float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default=None, help="Folder of preprocessed frames (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="signnsync_bench_")
+    try:
+        folder = args.folder
+        if not folder:
+            folder = os.path.join(workdir, "face")
+            write_frames(folder, args.frames)
+        else:
+            # Work on a copy so the .npy cache doesn't land next to real data
+            folder = shutil.copytree(folder, os.path.join(workdir, "face"))
+        count = len(os.listdir(folder))
+        print(f"🔹 {count} frames in {folder}")
+
+        reference, keras_seconds = best_of(lambda: keras_load(folder), args.runs)
+        print(f"   per-file load_img      {keras_seconds * 1000:8.1f} ms")
+
+        configs = [("bulk, 1 thread", dict(workers=1, use_cache=False)),
+                   (f"bulk, {LOADER_WORKERS} threads", dict(workers=LOADER_WORKERS, use_cache=False))]
+        load_frames(folder, use_cache=True)  # Builds face.npy for the memmap run
+        configs.append(("cached .npy (memmap)", dict(use_cache=True)))
+
+        for label, kwargs in configs:
+            batch, seconds = best_of(lambda: load_frames(folder, **kwargs), args.runs)
+            max_diff = float(np.abs(np.asarray(batch) - reference).max())
+            status = "✅ identical" if max_diff == 0 else f"⚠️ max diff {max_diff:.4f}"
+            print(f"   {label:<22} {seconds * 1000:8.1f} ms ({keras_seconds / seconds:5.1f}x) {status}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compares per-request prediction latency of the old subprocess path
+(`python emotion_prediction.py` / `python sign_prediction.py`) against the
+resident in-process inference engine.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_inference --runs 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+FLASK_API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_PATH = os.path.join(FLASK_API_DIR, "baara_preprocessing")
+DEFAULT_PREPROCESSED = os.path.join(os.path.dirname(FLASK_API_DIR), "interpretation", "preprocessed")
+
+def run_prediction_script(script_name, preprocessed_path):
+    """The per-request subprocess path the routes used before the resident engine."""
+    result = subprocess.run(
+        [sys.executable, os.path.join(SCRIPT_PATH, script_name), preprocessed_path],
+        cwd=SCRIPT_PATH,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip()}
+    return json.loads(result.stdout.strip())
+
+def time_runs(fn, runs):
+    """Returns (last result, list of per-run latencies in seconds)."""
+    latencies = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+    return result, latencies
+
+def summarize(name, latencies):
+    latencies = sorted(latencies)
+    mean = sum(latencies) / len(latencies)
+    print(f"{name:<22} mean {mean * 1000:9.1f} ms | min {latencies[0] * 1000:9.1f} ms | max {latencies[-1] * 1000:9.1f} ms")
+    return mean
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preprocessed", default=DEFAULT_PREPROCESSED, help="Folder with face/left_hand/right_hand frames")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"🔹 Preprocessed frames: {args.preprocessed}")
+
+    # Subprocess path: a fresh interpreter + model load for every request
+    sub_result, sub_latencies = time_runs(lambda: (
+        run_prediction_script("emotion_prediction.py", args.preprocessed),
+        run_prediction_script("sign_prediction.py", args.preprocessed),
+    ), args.runs)
+
+    # Resident path: models loaded and warmed up once, outside the timed loop. load_models() rather
+    # than inference_engine.warm_up(), which leaves loading to the first request unless EAGER_LOAD is set
+    start = time.perf_counter()
+    import model_loader
+    import inference_engine
+    model_loader.load_models()
+    print(f"🔹 Engine startup (import + load + warm-up): {time.perf_counter() - start:.2f}s")
+
+    engine_result, engine_latencies = time_runs(lambda: (
+        inference_engine.predict_emotion(args.preprocessed),
+        inference_engine.predict_sign(args.preprocessed),
+    ), args.runs)
+
+    sub_mean = summarize("subprocess", sub_latencies)
+    engine_mean = summarize("resident engine", engine_latencies)
+    print(f"🚀 Speedup per request: {sub_mean / engine_mean:.1f}x")
+
+    if sub_result != engine_result:
+        print(f"⚠️ Results differ: subprocess={sub_result} engine={engine_result}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Times the on-disk pipeline (extract_features → frame.py → preprocessing_image.py,
+with mp4/jpg files between stages), the on-disk pipeline with one crop store per
+stream instead of the JPEG folders, and the in-memory stream pipeline on one
+clip, and reports the files and bytes each disk variant writes per clip.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_pipeline_io --video ../interpretation/test.mp4
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import cv2
+import numpy as np
+
+from baara_preprocessing.feature_extract import extract_features
+from baara_preprocessing.frame import extract_sharpened_frames
+from baara_preprocessing.preprocessing_image import preprocess_images
+from baara_preprocessing.stream_pipeline import STREAMS, extract_stream_batches
+from baara_preprocessing.crop_store import store_streams, load_model_input
+
+FLASK_API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_VIDEO = os.path.join(os.path.dirname(FLASK_API_DIR), "interpretation", "test.mp4")
+
+def folder_usage(folder):
+    """Returns (file count, total bytes) under folder."""
+    files, size = 0, 0
+    for root, _, names in os.walk(folder):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+def load_gray_folder(folder):
+    names = sorted(os.listdir(folder))
+    frames = [cv2.imread(os.path.join(folder, name), cv2.IMREAD_GRAYSCALE) for name in names]
+    return np.stack(frames).astype(np.float32)[..., None] / 255.0 if frames else np.empty((0, 64, 64, 1), np.float32)
+
+def run_disk(video_path, workdir):
+    feature_path = os.path.join(workdir, "feature_extracted")
+    frame_path = os.path.join(workdir, "frames")
+    preprocessed_path = os.path.join(workdir, "preprocessed")
+    timings = {}
+
+    start = time.perf_counter()
+    extract_features(video_path, feature_path, run_frame_script=False)
+    timings["extract_features (mp4 encode)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for stream in STREAMS:
+        extract_sharpened_frames(os.path.join(feature_path, stream), os.path.join(frame_path, stream))
+    timings["extract_sharpened_frames (mp4 decode + jpg)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for stream in STREAMS:
+        os.makedirs(os.path.join(preprocessed_path, stream), exist_ok=True)
+        preprocess_images(os.path.join(frame_path, stream), os.path.join(preprocessed_path, stream))
+    timings["preprocess_images (jpg decode + jpg)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batches = {stream: load_gray_folder(os.path.join(preprocessed_path, stream)) for stream in STREAMS}
+    timings["load frames for model (jpg decode)"] = time.perf_counter() - start
+
+    return batches, timings, folder_usage(workdir)
+
+def run_store(video_path, workdir):
+    feature_path = os.path.join(workdir, "feature_extracted")
+    preprocessed_path = os.path.join(workdir, "preprocessed")
+    timings = {}
+
+    start = time.perf_counter()
+    extract_features(video_path, feature_path, run_frame_script=False)
+    timings["extract_features (mp4 encode)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stores = store_streams(feature_path, preprocessed_path, STREAMS)
+    timings["store_streams (mp4 decode + crop store)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batches = {stream: load_model_input(path) for stream, path in stores.items()}
+    timings["load frames for model (memmap)"] = time.perf_counter() - start
+
+    return batches, timings, folder_usage(workdir)
+
+def print_disk(title, timings, files, size):
+    total = sum(timings.values())
+    print(f"\n🔹 {title}")
+    for stage, seconds in timings.items():
+        print(f"   {stage:<46} {seconds:8.3f}s")
+    print(f"   {'total':<46} {total:8.3f}s  ({files} files, {size / 1e6:.1f} MB written)")
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default=DEFAULT_VIDEO)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="signnsync_bench_")
+    try:
+        disk_batches, disk_timings, (files, size) = run_disk(args.video, os.path.join(workdir, "jpeg"))
+        store_batches, store_timings, (store_files, store_size) = run_store(args.video, os.path.join(workdir, "store"))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    start = time.perf_counter()
+    memory_batches, memory_timings = extract_stream_batches(args.video)
+    memory_total = time.perf_counter() - start
+
+    disk_total = print_disk("Disk pipeline (JPEG folders)", disk_timings, files, size)
+    store_total = print_disk("Disk pipeline (crop stores)", store_timings, store_files, store_size)
+
+    print("\n🔹 In-memory pipeline")
+    for stage, value in memory_timings.items():
+        print(f"   {stage:<46} {value:8.3f}s" if isinstance(value, float) else f"   {stage:<46} {value:8d}")
+    print(f"   {'total':<46} {memory_total:8.3f}s  (0 files written)")
+
+    print(f"\n🚀 I/O saved per clip: {disk_total - memory_total:.3f}s ({disk_total / memory_total:.1f}x), "
+          f"crop stores save {disk_total - store_total:.3f}s ({disk_total / store_total:.1f}x)")
+    for stream in STREAMS:
+        a, b = disk_batches[stream], memory_batches[stream]
+        if a.shape == b.shape and len(a):
+            print(f"   {stream:<10} {len(b)} frames, mean |disk - memory| pixel diff {np.abs(a - b).mean():.4f} (JPEG loss)")
+        else:
+            print(f"   {stream:<10} frame count differs: disk {len(a)} vs memory {len(b)}")
+        c = store_batches.get(stream)
+        if c is not None and c.shape == b.shape:
+            print(f"   {stream:<10} mean |store - memory| pixel diff {np.abs(c - b).mean():.4f} (mp4 re-encode only)")
+
+if __name__ == "__main__":
+    main()
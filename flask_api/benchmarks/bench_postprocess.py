@@ -0,0 +1,82 @@
+"""
+Serial per-stream sharpen + resize (extract_sharpened_frames → preprocess_images,
+one stream after another) against baara_preprocessing.parallel.postprocess_streams
+for several worker counts, on synthetic extracted-feature videos. Also checks
+that every configuration writes byte-identical files.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_postprocess --seconds 60 --workers 1 2 4 8 16
+"""
+import os
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+
+from baara_preprocessing.frame import extract_sharpened_frames
+from baara_preprocessing.preprocessing_image import preprocess_images
+from baara_preprocessing.parallel import POSTPROCESS_EXECUTOR, postprocess_streams
+from benchmarks.synthetic import write_synthetic_video
+
+STREAMS = ("face", "left_hand", "right_hand")
+
+def folder_digest(folder):
+    digest = hashlib.sha256()
+    for root, _, names in sorted(os.walk(folder)):
+        for name in sorted(names):
+            digest.update(name.encode())
+            with open(os.path.join(root, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frame-rate", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--executor", choices=["process", "thread"], default=POSTPROCESS_EXECUTOR)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="signnsync_bench_")
+    try:
+        feature_path = os.path.join(workdir, "features")
+        for seed, stream in enumerate(STREAMS):
+            os.makedirs(os.path.join(feature_path, stream))
+            write_synthetic_video(os.path.join(feature_path, stream, f"test_{stream}.mp4"),
+                                  args.seconds, args.fps, args.width, args.height, seed)
+
+        def fresh(name):
+            return os.path.join(workdir, name, "frames"), os.path.join(workdir, name, "preprocessed")
+
+        frame_path, preprocessed_path = fresh("serial")
+        start = time.perf_counter()
+        for stream in STREAMS:
+            extract_sharpened_frames(os.path.join(feature_path, stream), os.path.join(frame_path, stream), args.frame_rate)
+            preprocess_images(os.path.join(frame_path, stream), os.path.join(preprocessed_path, stream))
+        serial = time.perf_counter() - start
+        reference = folder_digest(os.path.join(workdir, "serial"))
+
+        print(f"\n🔹 3 streams x {args.seconds:.0f}s at {args.width}x{args.height}, {args.fps:.0f} fps → {args.frame_rate} frames/sec")
+        print(f"   serial loops            {serial:8.3f}s")
+
+        for workers in args.workers:
+            frame_path, preprocessed_path = fresh(f"parallel_{workers}")
+            postprocess_streams(feature_path, frame_path, preprocessed_path, STREAMS, args.frame_rate,
+                                workers=workers, executor=args.executor)  # Pool start-up, not timed
+            shutil.rmtree(os.path.join(workdir, f"parallel_{workers}"))
+
+            start = time.perf_counter()
+            postprocess_streams(feature_path, frame_path, preprocessed_path, STREAMS, args.frame_rate,
+                                workers=workers, executor=args.executor)
+            elapsed = time.perf_counter() - start
+            same = folder_digest(os.path.join(workdir, f"parallel_{workers}")) == reference
+            print(f"   {workers:>3} {args.executor} workers  {elapsed:8.3f}s ({serial / elapsed:5.1f}x) {'✅ identical' if same else '⚠️ output differs'}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+End-to-end time of the disk pipeline when Holistic runs on every decoded frame
+(previous behaviour: frame.py drops most of them afterwards) versus only on the
+frames that will be scored, plus the in-memory pipeline with the same sampling.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_sampling --video ../interpretation/test.mp4 --frame-rate 5
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from baara_preprocessing.feature_extract import extract_features
+from baara_preprocessing.frame import extract_sharpened_frames
+from baara_preprocessing.preprocessing_image import preprocess_images
+from baara_preprocessing.stream_pipeline import STREAMS, extract_stream_batches
+
+FLASK_API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_VIDEO = os.path.join(os.path.dirname(FLASK_API_DIR), "interpretation", "test.mp4")
+
+def run_disk(video_path, frame_rate, sample_before_detection):
+    """Runs extract_features → frames → preprocess in a scratch folder, returns (seconds, frames per stream)."""
+    workdir = tempfile.mkdtemp(prefix="signnsync_bench_")
+    try:
+        start = time.perf_counter()
+        extract_features(video_path, os.path.join(workdir, "features"), run_frame_script=False,
+                         frame_rate=frame_rate if sample_before_detection else None)
+        for stream in STREAMS:
+            frame_folder = os.path.join(workdir, "frames", stream)
+            preprocessed_folder = os.path.join(workdir, "preprocessed", stream)
+            os.makedirs(preprocessed_folder, exist_ok=True)
+            extract_sharpened_frames(os.path.join(workdir, "features", stream), frame_folder, frame_rate)
+            preprocess_images(frame_folder, preprocessed_folder)
+        elapsed = time.perf_counter() - start
+        frames = len(os.listdir(os.path.join(workdir, "preprocessed", "face")))
+        return elapsed, frames
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default=DEFAULT_VIDEO)
+    parser.add_argument("--frame-rate", type=int, default=5)
+    args = parser.parse_args()
+
+    every_frame, every_frame_count = run_disk(args.video, args.frame_rate, sample_before_detection=False)
+    sampled, sampled_count = run_disk(args.video, args.frame_rate, sample_before_detection=True)
+
+    start = time.perf_counter()
+    batches, _ = extract_stream_batches(args.video, args.frame_rate)
+    memory = time.perf_counter() - start
+
+    print(f"\n🔹 Scoring {args.frame_rate} frames/sec of {args.video}")
+    print(f"   disk, Holistic on every frame     {every_frame:8.3f}s  ({every_frame_count} frames scored)")
+    print(f"   disk, Holistic on sampled frames  {sampled:8.3f}s  ({sampled_count} frames scored, {every_frame / sampled:.1f}x)")
+    print(f"   memory, sampled frames            {memory:8.3f}s  ({len(batches['face'])} frames scored, {every_frame / memory:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Pixel vs landmark sign input. Times extraction of the hand model input from one
+clip both ways (crop + resize + sharpen + 64x64 grayscale, against normalized
+21x3 hand landmarks from the same Holistic pass), with the peak NumPy/Python
+memory of each run and the bytes per frame that reach the sign model. Then
+compares classifier throughput: the sign .h5 (when it can be loaded) against
+the landmark classifier.
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_sign_input --seconds 10
+    python -m benchmarks.bench_sign_input --video ../interpretation/test.mp4 --landmark-model model/sign_landmark_model.npz
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+
+from baara_preprocessing.landmarks import HAND_STREAMS, FEATURE_SIZE, LandmarkClassifier, landmark_model_input
+from baara_preprocessing.stream_pipeline import extract_stream_batches
+from baara_preprocessing.sign_prediction import CLASS_LABELS
+from benchmarks.synthetic import write_synthetic_video
+
+def measure(fn):
+    """(result, seconds, peak traced MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+def classifier_throughput(model, batch, runs):
+    """Frames per second through model.predict_on_batch, best of runs."""
+    model.predict_on_batch(batch[:1])  # Warm-up
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.predict_on_batch(batch)
+        best = min(best, time.perf_counter() - start)
+    return len(batch) / best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default=None, help="Clip to process (synthetic clip if omitted)")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--frame-rate", type=int, default=5)
+    parser.add_argument("--landmark-model", default=None, help="LandmarkClassifier .npz (random 63-64-9 MLP if omitted)")
+    parser.add_argument("--batch", type=int, default=256, help="Frames per classifier batch")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="signnsync_bench_")
+    try:
+        video = args.video
+        if not video:
+            video = os.path.join(workdir, "clip.mp4")
+            write_synthetic_video(video, args.seconds, 30, 640, 480, seed=0)
+
+        pixel, pixel_seconds, pixel_peak = measure(
+            lambda: extract_stream_batches(video, args.frame_rate, streams=HAND_STREAMS)[0])
+        landmark, landmark_seconds, landmark_peak = measure(
+            lambda: extract_stream_batches(video, args.frame_rate, streams=(), hand_landmarks=True)[0])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    frames = len(pixel["left_hand"])
+    pixel_bytes = sum(pixel[stream].nbytes for stream in HAND_STREAMS) / max(1, frames)
+    landmark_bytes = sum(landmark_model_input(landmark, stream).nbytes for stream in HAND_STREAMS) / max(1, frames)
+
+    print(f"\n🔹 Hand model input from {frames} sampled frames")
+    print(f"   {'mode':<10} {'seconds':>9} {'frames/s':>10} {'peak MB':>9} {'bytes/frame':>12}")
+    for mode, seconds, peak, per_frame in (("pixel", pixel_seconds, pixel_peak, pixel_bytes),
+                                           ("landmark", landmark_seconds, landmark_peak, landmark_bytes)):
+        print(f"   {mode:<10} {seconds:9.3f} {frames / seconds:10.1f} {peak:9.1f} {per_frame:12.0f}")
+    print(f"   🚀 {pixel_bytes / max(1.0, landmark_bytes):.0f}x less data per frame, "
+          f"{pixel_seconds / landmark_seconds:.1f}x faster extraction")
+
+    # Classifier throughput on full batches
+    print(f"\n🔹 Classifier throughput ({args.batch} frames per batch)")
+    if args.landmark_model:
+        classifier = LandmarkClassifier.load(args.landmark_model)
+    else:
+        rng = np.random.default_rng(0)
+        classifier = LandmarkClassifier([rng.normal(size=(FEATURE_SIZE, 64)), rng.normal(size=(64, len(CLASS_LABELS)))],
+                                        [np.zeros(64), np.zeros(len(CLASS_LABELS))])
+    landmark_batch = np.random.default_rng(1).normal(size=(args.batch, FEATURE_SIZE)).astype(np.float32)
+    print(f"   landmark classifier     {classifier_throughput(classifier, landmark_batch, args.runs):12.0f} frames/s")
+
+    try:
+        import model_loader
+        pixel_model = model_loader.get_model("sign")
+    except Exception as e:
+        print(f"   sign .h5 model          skipped ({e})")
+    else:
+        pixel_batch = np.random.default_rng(1).random((args.batch, 64, 64, 1), dtype=np.float32)
+        print(f"   sign .h5 model          {classifier_throughput(pixel_model, pixel_batch, args.runs):12.0f} frames/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compares the old synchronous decode loop (cv2.VideoCapture read on the same
+thread as MediaPipe) against video_io.VideoReader with the OpenCV and PyAV
+backends, and the synchronous cv2.VideoWriter against AsyncVideoWriter.
+Holistic is stood in for by a fixed per-frame delay (--work-ms), so the
+numbers show how much decoding hides behind inference. Also checks that every
+reader returns the same frame indices (and, for OpenCV, identical pixels).
+
+Run from the flask_api folder:
+    python -m benchmarks.bench_video_io --videos clip1.mp4 clip2.mp4 --frame-rate 5 --work-ms 20
+    python -m benchmarks.bench_video_io --seconds 30 --width 1920 --height 1080
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import cv2
+import numpy as np
+
+from baara_preprocessing.feature_extract import sampling_interval
+from baara_preprocessing.video_io import VideoReader, AsyncVideoWriter
+from benchmarks.synthetic import write_synthetic_video
+
+def sync_loop(path, frame_interval, work_seconds):
+    """The loop feature_extract/frame.py used: read every frame, keep every n-th, process it inline."""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    frame_index = 0
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_index % frame_interval == 0:
+            time.sleep(work_seconds)
+            frames.append((frame_index, frame))
+        frame_index += 1
+    cap.release()
+    return frames
+
+def reader_loop(path, frame_interval, work_seconds, backend, keyframes_only=False):
+    reader = VideoReader(path, backend=backend)
+    frames = []
+    for frame_index, frame in reader.frames(frame_interval, keyframes_only=keyframes_only):
+        time.sleep(work_seconds)
+        frames.append((frame_index, frame))
+    reader.release()
+    return frames
+
+def time_writer(writer_cls, path, frames, fps, size):
+    start = time.perf_counter()
+    writer = writer_cls(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    for _, frame in frames:
+        writer.write(frame)
+    writer.release()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", nargs="*", default=None, help="Local sample clips (synthetic clip if omitted)")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frame-rate", type=int, default=5, help="Frames kept per second (0 = every frame)")
+    parser.add_argument("--work-ms", type=float, default=20, help="Simulated Holistic time per kept frame")
+    args = parser.parse_args()
+
+    try:
+        import av  # noqa: F401
+        backends = ["opencv", "pyav"]
+    except ImportError:
+        print("⏭️ PyAV not installed, skipping the pyav backend (pip install av).")
+        backends = ["opencv"]
+
+    workdir = tempfile.mkdtemp(prefix="signnsync_bench_")
+    try:
+        videos = args.videos
+        if not videos:
+            path = os.path.join(workdir, "synthetic.mp4")
+            write_synthetic_video(path, args.seconds, args.fps, args.width, args.height, seed=0)
+            videos = [path]
+
+        work_seconds = args.work_ms / 1000
+        for path in videos:
+            probe = cv2.VideoCapture(path)
+            fps = probe.get(cv2.CAP_PROP_FPS)
+            size = (int(probe.get(3)), int(probe.get(4)))
+            total = int(probe.get(cv2.CAP_PROP_FRAME_COUNT))
+            probe.release()
+            frame_interval = sampling_interval(fps, args.frame_rate)
+            print(f"🎥 {os.path.basename(path)}: {total} frames, {size[0]}x{size[1]} @ {fps:.1f} fps, every {frame_interval} frame(s)")
+
+            start = time.perf_counter()
+            baseline = sync_loop(path, frame_interval, work_seconds)
+            sync_seconds = time.perf_counter() - start
+            print(f"   sync read loop       {sync_seconds:7.2f}s ({len(baseline)} frames)")
+
+            runs = [(backend, False) for backend in backends] + ([("pyav", True)] if "pyav" in backends else [])
+            for backend, keyframes_only in runs:
+                start = time.perf_counter()
+                frames = reader_loop(path, frame_interval, work_seconds, backend, keyframes_only)
+                seconds = time.perf_counter() - start
+
+                label = f"{backend}{' keyframes' if keyframes_only else ''} reader"
+                if keyframes_only:
+                    status = f"{len(frames)} keyframes"
+                else:
+                    same_indices = [i for i, _ in frames] == [i for i, _ in baseline]
+                    max_diff = max((int(np.abs(a.astype(np.int16) - b).max()) for (_, a), (_, b) in zip(frames, baseline)),
+                                   default=0)
+                    status = "✅ same frames" if same_indices and max_diff == 0 else (
+                        f"✅ same indices, max pixel diff {max_diff}" if same_indices else "⚠️ different frames")
+                print(f"   {label:<20} {seconds:7.2f}s ({sync_seconds / seconds:4.2f}x) {status}")
+
+            sync_write = time_writer(cv2.VideoWriter, os.path.join(workdir, "sync.mp4"), baseline, fps, size)
+            async_write = time_writer(AsyncVideoWriter, os.path.join(workdir, "async.mp4"), baseline, fps, size)
+            print(f"   writer: sync {sync_write:6.2f}s | async {async_write:6.2f}s (incl. final flush)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+End-to-end benchmark suite. Generates synthetic clips at several resolutions,
+durations and frame rates, then per clip times each disk pipeline stage
+(extract_features, extract_sharpened_frames, preprocess_images, emotion/sign
+model predict) and the /predict/* routes through Flask's test client.
+Results are written as JSON and compared with a stored baseline:
+
+  - a timing more than --tolerance slower than the baseline (and at least
+    --min-delta seconds slower, so tiny stages don't flap) is a regression;
+    this is only counted when the host, CPU count, library versions and
+    pipeline settings match the baseline's, otherwise timings are informational
+  - a prediction that differs from the baseline is a parity failure; this is
+    only checked when the model files and runtimes match the baseline's
+
+Either makes the run exit with status 1. Faster timings are reported, so an
+optimization shows up together with whether it kept the outputs unchanged.
+No baseline is shipped: record one with --update-baseline on the reference
+machine (with the real MediaPipe/TensorFlow and model files installed).
+
+Run from the flask_api folder:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --clips 240p_3s_15fps 480p_5s_30fps --repeat 3 --output /tmp/bench.json
+    python -m benchmarks.suite --update-baseline
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import cv2
+import numpy as np
+
+import pipeline
+import model_loader
+import inference_engine
+from result_cache import model_version
+from baara_preprocessing.feature_extract import DEFAULT_FRAME_RATE, extract_features
+from baara_preprocessing.frame import extract_sharpened_frames
+from baara_preprocessing.preprocessing_image import preprocess_images
+from baara_preprocessing.stream_pipeline import STREAMS
+from benchmarks.synthetic import write_synthetic_video
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SCHEMA_VERSION = 1
+
+# ==========================
+# 🔹 Synthetic clip matrix
+# ==========================
+# name: (width, height, seconds, fps). Every clip is the moving square on noise from
+# synthetic.py; whether Holistic finds anything in it doesn't matter for timing or parity.
+CLIPS = {
+    "240p_3s_15fps": (426, 240, 3, 15),
+    "480p_5s_30fps": (640, 480, 5, 30),
+    "720p_5s_30fps": (1280, 720, 5, 30),
+    "720p_3s_60fps": (1280, 720, 3, 60),
+    "1080p_3s_25fps": (1920, 1080, 3, 25),
+}
+
+# environment() keys that must match the baseline's for a slowdown to count as a regression
+TIMING_ENVIRONMENT = ("host", "platform", "machine", "cpus", "versions", "pipeline_mode", "artifact_format", "postprocess_workers")
+
+STAGES = ("extract_features", "extract_sharpened_frames", "preprocess_images", "emotion_predict", "sign_predict")
+ROUTES = ("/predict/emotion", "/predict/sign", "/predict/both")
+
+def environment():
+    """What the timings and predictions depend on, stored with every result file."""
+    versions = {"python": platform.python_version(), "numpy": np.__version__, "opencv": cv2.__version__}
+    for module in ("mediapipe", "tensorflow"):
+        try:
+            versions[module] = getattr(__import__(module), "__version__", "unknown")
+        except ImportError:
+            versions[module] = "missing"
+    return {
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "versions": versions,
+        "pipeline_mode": pipeline.PIPELINE_MODE,
+        "artifact_format": pipeline.ARTIFACT_FORMAT,
+        "postprocess_workers": pipeline.POSTPROCESS_WORKERS,
+        "models": {name: model_version(path) for name, path in model_loader.model_files.items()},
+    }
+
+# ==========================
+# 🔹 Measurements
+# ==========================
+def time_stages(video_path, workdir, frame_rate):
+    """One disk pipeline run, stage by stage. Returns ({stage: seconds}, {task: prediction}, sampled frames)."""
+    feature_path = os.path.join(workdir, "feature_extracted")
+    frame_path = os.path.join(workdir, "frames")
+    preprocessed_path = os.path.join(workdir, "preprocessed")
+    timings = {}
+
+    start = time.perf_counter()
+    extraction = extract_features(video_path, feature_path, run_frame_script=False, frame_rate=frame_rate)
+    timings["extract_features"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for stream in STREAMS:
+        extract_sharpened_frames(os.path.join(feature_path, stream), os.path.join(frame_path, stream), frame_rate)
+    timings["extract_sharpened_frames"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for stream in STREAMS:
+        preprocess_images(os.path.join(frame_path, stream), os.path.join(preprocessed_path, stream))
+    timings["preprocess_images"] = time.perf_counter() - start
+
+    predictions = {}
+    for task, predict_fn in (("emotion", inference_engine.predict_emotion), ("sign", inference_engine.predict_sign)):
+        start = time.perf_counter()
+        predictions[task] = predict_fn(preprocessed_path)
+        timings[f"{task}_predict"] = time.perf_counter() - start
+
+    return timings, predictions, (extraction or {}).get("frames", 0)
+
+def time_routes(client, video_path, frame_rate):
+    """Every /predict route once through the test client. Returns ({route: seconds}, {route: JSON without timings})."""
+    timings, responses = {}, {}
+    for route in ROUTES:
+        with open(video_path, "rb") as video:
+            start = time.perf_counter()
+            response = client.post(route, data={"video": (video, "clip.mp4"), "frame_rate": str(frame_rate)},
+                                   content_type="multipart/form-data")
+            timings[route] = time.perf_counter() - start
+        body = response.get_json(silent=True) or {}
+        body.pop("timings", None)  # Seconds, not outputs
+        responses[route] = {"status": response.status_code, **body}
+    return timings, responses
+
+def run_clip(name, client, workdir, frame_rate, repeat):
+    """Median timings over repeat runs of the stages and routes for clip name, plus its predictions."""
+    width, height, seconds, fps = CLIPS[name]
+    clip_dir = os.path.join(workdir, name)
+    os.makedirs(clip_dir)
+    video_path = os.path.join(clip_dir, "clip.mp4")
+    write_synthetic_video(video_path, seconds, fps, width, height, seed=0)
+
+    stage_runs, route_runs = [], []
+    for run in range(repeat):
+        run_dir = os.path.join(clip_dir, f"run_{run}")
+        stage_timings, stage_predictions, frames = time_stages(video_path, run_dir, frame_rate)
+        shutil.rmtree(run_dir, ignore_errors=True)
+        route_timings, route_predictions = time_routes(client, video_path, frame_rate)
+        stage_runs.append(stage_timings)
+        route_runs.append(route_timings)
+
+    return {
+        "spec": {"width": width, "height": height, "seconds": seconds, "fps": fps, "frame_rate": frame_rate},
+        "frames_sampled": frames,
+        "stages": {stage: statistics.median(run[stage] for run in stage_runs) for stage in STAGES},
+        "routes": {route: statistics.median(run[route] for run in route_runs) for route in ROUTES},
+        "predictions": {"stages": stage_predictions, "routes": route_predictions},
+    }
+
+# ==========================
+# 🔹 Baseline comparison
+# ==========================
+def compare(results, baseline, tolerance, min_delta):
+    """Prints timing and parity differences against baseline. Returns the number of regressions + parity failures."""
+    failures = 0
+    env, base_env = results["environment"], baseline["environment"]
+    # Timings only mean something against a baseline from the same machine, runtimes and pipeline settings
+    same_timings = all(env.get(key) == base_env.get(key) for key in TIMING_ENVIRONMENT)
+    if not same_timings:
+        print(f"⚠️ Baseline was recorded on {base_env['host']} ({base_env['cpus']} CPUs), "
+              f"this run on {env['host']} ({env['cpus']} CPUs), or with other library versions or pipeline settings: "
+              f"timings are informational only, slowdowns are not counted")
+    same_outputs = env["models"] == base_env["models"] and env["versions"] == base_env["versions"]
+    if not same_outputs:
+        print("⚠️ Model files or library versions differ from the baseline: prediction parity not checked")
+
+    for name, clip in results["clips"].items():
+        base = baseline["clips"].get(name)
+        if base is None or base["spec"] != clip["spec"]:
+            print(f"\n🔹 {name}: not in the baseline (or recorded with different settings), skipped")
+            continue
+
+        print(f"\n🔹 {name}  ({clip['frames_sampled']} sampled frames)")
+        print(f"   {'timing':<28} {'baseline':>9} {'now':>9} {'change':>8}")
+        for group in ("stages", "routes"):
+            for key, seconds in clip[group].items():
+                before = base[group].get(key)
+                if before is None:
+                    continue
+                ratio = seconds / before if before else float("inf")
+                if ratio > 1 + tolerance and seconds - before >= min_delta and same_timings:
+                    verdict, failures = "❌ slower", failures + 1
+                elif ratio > 1 + tolerance and seconds - before >= min_delta:
+                    verdict = "⚠️ slower"
+                elif ratio < 1 / (1 + tolerance) and before - seconds >= min_delta:
+                    verdict = "🚀 faster"
+                else:
+                    verdict = ""
+                print(f"   {key:<28} {before:9.3f} {seconds:9.3f} {ratio - 1:+8.0%} {verdict}")
+
+        if same_outputs:
+            for group in ("stages", "routes"):
+                for key, prediction in clip["predictions"][group].items():
+                    expected = base["predictions"][group].get(key)
+                    if expected is not None and expected != prediction:
+                        failures += 1
+                        print(f"   ❌ {group} {key} prediction changed: {expected} → {prediction}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clips", nargs="+", choices=list(CLIPS), default=list(CLIPS))
+    parser.add_argument("--frame-rate", type=int, default=DEFAULT_FRAME_RATE)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per clip (timings are the median)")
+    parser.add_argument("--output", default=None, help="Write the results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="Ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args()
+
+    import app as flask_app
+    import routes
+
+    # Measure every run, not the result cache, and keep the models loaded between runs
+    pipeline.CACHE_ENABLED = False
+    for name in ("emotion", "sign"):
+        model_loader.get_model(name)
+
+    workdir = tempfile.mkdtemp(prefix="signnsync_suite_")
+    routes.JOBS_PATH = os.path.join(workdir, "jobs")
+    try:
+        client = flask_app.app.test_client()
+        results = {
+            "schema": SCHEMA_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": environment(),
+            "clips": {name: run_clip(name, client, workdir, args.frame_rate, args.repeat) for name in args.clips},
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\n✅ Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\n✅ Baseline stored in {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️ No baseline at {args.baseline}, record one with --update-baseline")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("schema") != SCHEMA_VERSION:
+        print(f"\n⚠️ Baseline schema {baseline.get('schema')} != {SCHEMA_VERSION}, record a new one with --update-baseline")
+        return 1
+
+    failures = compare(results, baseline, args.tolerance, args.min_delta)
+    print(f"\n{'❌' if failures else '✅'} {failures} regression(s) / parity failure(s) against {args.baseline}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+import cv2
+import numpy as np
+
+# ==========================
+# 🔹 Synthetic test clips
+# ==========================
+# Shared by the benchmarks so they run without sample recordings.
+
+def synthetic_frames(count, width, height, seed):
+    """Yields count BGR frames: a moving bright square on noise, so JPEG sizes and sharpening are realistic."""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        frame = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+        x = (i * 7) % (width - 100)
+        cv2.rectangle(frame, (x, height // 3), (x + 100, height // 3 + 100), (255, 255, 255), -1)
+        yield frame
+
+def write_synthetic_video(path, seconds, fps, width, height, seed, fourcc="mp4v"):
+    """Writes synthetic_frames as a video of the given length."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    for frame in synthetic_frames(int(seconds * fps), width, height, seed):
+        writer.write(frame)
+    writer.release()
@@ -0,0 +1,56 @@
+"""
+Stand-in for the Arduino on a pseudo-terminal (Linux/macOS), for trying the
+serial connection without a board. It prints a boot line like the sketch,
+then answers every command line with "OK <command>".
+
+Run from the flask_api folder:
+    python fake_arduino.py            # prints the port to use, e.g. /dev/pts/5
+    python fake_arduino.py --reply-delay 0.05 --no-ack
+then set SERIAL_PORT in routes_arduino.py to the printed port.
+"""
+import os
+import pty
+import tty
+import time
+import argparse
+
+def serve(master_fd, reply_delay=0.0, ack=True, boot_line="READY"):
+    """Answers commands on master_fd until the process is stopped."""
+    if boot_line:
+        os.write(master_fd, f"{boot_line}\n".encode())
+
+    buffer = b""
+    while True:
+        try:
+            data = os.read(master_fd, 1024)
+        except OSError:  # Other side closed
+            return
+        buffer += data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            command = line.decode(errors="replace").strip()
+            if not command:
+                continue
+            print(f"📥 {command}")
+            if ack:
+                time.sleep(reply_delay)
+                os.write(master_fd, f"OK {command}\n".encode())
+
+def open_fake_port():
+    """Returns (master_fd, port path) of a new pseudo-terminal pair."""
+    master_fd, slave_fd = pty.openpty()
+    tty.setraw(slave_fd)  # No echo / line editing, like a real serial port
+    return master_fd, os.ttyname(slave_fd)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reply-delay", type=float, default=0.0, help="Seconds before each reply")
+    parser.add_argument("--no-ack", action="store_true", help="Never reply (firmware without acknowledgments)")
+    args = parser.parse_args()
+
+    master_fd, port = open_fake_port()
+    print(f"🔌 Fake Arduino listening on {port}")
+    serve(master_fd, args.reply_delay, not args.no_ack)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import os
+import time
+import threading
+import cv2
+import numpy as np
+import mediapipe as mp
+
+import model_loader
+from baara_preprocessing.batch_predict import predict_classes, majority_vote
+from baara_preprocessing import feature_extract
+from baara_preprocessing.feature_extract import DEFAULT_FRAME_RATE, sampling_interval, track_features
+from baara_preprocessing.landmark_detector import LandmarkDetector
+from baara_preprocessing.image_ops import sharpen_frame, resize_frame, to_model_input
+from baara_preprocessing.emotion_prediction import CLASS_LABELS as EMOTION_LABELS
+from baara_preprocessing.sign_prediction import combine_hands
+
+# ==========================
+# 🔹 INCREMENTAL CAPTURE
+# ==========================
+# Processes a recording while it is still being made. A background thread
+# follows the video file the recorder is writing (or reads a camera directly),
+# crops and scores the sampled frames in small batches, and keeps the per-frame
+# classes. When recording stops only the last few frames and the vote remain,
+# so the wait after STOP no longer grows with the clip length.
+#
+# Following a file only works while it is readable mid-recording (MJPEG/AVI,
+# MKV, fragmented MP4). A plain MP4 becomes readable once the recorder closes
+# it; the frames are then processed on stop, like the batch path.
+
+TAIL_POLL_SECONDS = 0.25      # Wait between looks for new frames in the recorded file
+FINALIZE_IDLE_SECONDS = 1.0   # After stop, the file is done once no new frames appear for this long
+FINALIZE_TIMEOUT = 30         # Upper bound on the wait for the recorder to finish the file
+INCREMENTAL_BATCH_FRAMES = 16 # Sampled frames scored per forward pass while recording
+CAMERA_FPS = 30               # Assumed when a camera doesn't report its frame rate
+
+STREAMS = ("face", "left_hand", "right_hand")
+
+class IncrementalCapture:
+    """
+    Starts processing as soon as it is created. source is a video file path being
+    recorded (tailed) or a camera index for cv2.VideoCapture. finish() returns the
+    same {"emotion": {...}, "sign": {...}} dict as pipeline.predict_video.
+    """
+
+    def __init__(self, source, tasks=("emotion", "sign"), frame_rate=DEFAULT_FRAME_RATE):
+        self.source = source
+        self.tasks = list(tasks)
+        self.frame_rate = frame_rate
+
+        # A file left over from the previous recording must not be scored again
+        self.stale_mtime = os.path.getmtime(source) if isinstance(source, str) and os.path.exists(source) else None
+
+        self.pending = {stream: [] for stream in STREAMS}
+        self.preds = {stream: [] for stream in STREAMS}
+        self.stats = {"frames_read": 0, "frames_sampled": 0, "batches": 0, "detected": dict.fromkeys(STREAMS, 0)}
+        self.error = None
+
+        self.stopping = threading.Event()
+        self.worker = threading.Thread(target=self._run, name="incremental-capture", daemon=True)
+        self.worker.start()
+
+    # ==========================
+    # 🔹 Frame sources
+    # ==========================
+    def _file_ready(self):
+        if not os.path.exists(self.source):
+            return False
+        return self.stale_mtime is None or os.path.getmtime(self.source) != self.stale_mtime
+
+    @staticmethod
+    def _skip_to(cap, frame_index):
+        """Positions a freshly opened capture at frame_index. A file still being written often has
+        no index yet, so seeking is checked and falls back to grabbing (not decoding) frames.
+        Returns False when it had to grab forward from frame 0."""
+        if not frame_index:
+            return True
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame_index:
+            return True
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        for _ in range(frame_index):
+            if not cap.grab():
+                break
+        return False
+
+    def _tail_file(self):
+        """
+        Yields (frame, fps) for every frame of the growing file. One capture stays open across polls
+        and is only reopened (at the next unread frame) when the file grew but the capture stays at its
+        old end. If a reopen can't seek and has to grab forward from frame 0, later reopens wait for the
+        recording to finish, so the decode cost stays linear in the clip length.
+        """
+        cap = None
+        fps = 0.0
+        next_index = 0
+        can_reopen = True   # False once a reopen had to grab from frame 0
+        cap_size = None     # File size when the open capture last produced frames
+        last_size = None
+        last_growth = time.perf_counter()
+        deadline = None
+
+        try:
+            while True:
+                now = time.perf_counter()
+                size = os.path.getsize(self.source) if self._file_ready() else None
+                if size != last_size:
+                    last_size, last_growth = size, now
+                if self.stopping.is_set():
+                    deadline = deadline or now + FINALIZE_TIMEOUT
+                # The recorder is done once the file stops growing: read whatever is left, then finish
+                final = self.stopping.is_set() and size is not None and now - last_growth >= FINALIZE_IDLE_SECONDS
+
+                if cap is None and size is not None and (can_reopen or final):
+                    cap = cv2.VideoCapture(self.source)
+                    cap_size = size
+                    if cap.isOpened():
+                        fps = cap.get(cv2.CAP_PROP_FPS)
+                        can_reopen = self._skip_to(cap, next_index) and can_reopen
+                    else:
+                        cap.release()
+                        cap = None
+
+                new_frames = 0
+                if cap is not None:
+                    while True:
+                        ret, frame = cap.read()
+                        if not ret:
+                            break
+                        next_index += 1
+                        new_frames += 1
+                        yield frame, fps
+                    if new_frames:
+                        cap_size = size
+                    elif size != cap_size:
+                        cap.release()  # The file grew past what this capture can see
+                        cap = None
+
+                if (final and cap is not None) or (deadline and now >= deadline):
+                    return
+                if not new_frames:
+                    time.sleep(TAIL_POLL_SECONDS)
+        finally:
+            if cap is not None:
+                cap.release()
+
+    def _read_camera(self):
+        """Yields (frame, fps) from a camera until stop."""
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            raise RuntimeError(f"❌ Unable to open capture source {self.source}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or CAMERA_FPS
+        try:
+            while not self.stopping.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame, fps
+        finally:
+            cap.release()
+
+    # ==========================
+    # 🔹 Worker thread
+    # ==========================
+    def _run(self):
+        try:
+            models = {task: model_loader.get_model(task) for task in self.tasks}
+            frames = self._read_camera() if isinstance(self.source, int) else self._tail_file()
+
+            last_frames = None
+            frame_interval = None
+            mp_holistic = mp.solutions.holistic
+            with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic, \
+                    LandmarkDetector(holistic) as detector:
+                for frame_index, (frame, fps) in enumerate(frames):
+                    self.stats["frames_read"] += 1
+                    if frame_interval is None:
+                        frame_interval = sampling_interval(fps, self.frame_rate)
+                    if frame_index % frame_interval:
+                        continue
+
+                    height, width = frame.shape[:2]
+                    if last_frames is None:
+                        blank_frame = np.zeros((height, width, 3), dtype=np.uint8)
+                        last_frames = {"face": blank_frame, "right_hand": blank_frame, "left_hand": blank_frame}
+
+                    crops, detected = track_features(frame, detector, last_frames, width, height)
+                    for stream in STREAMS:
+                        self.stats["detected"][stream] += detected[stream]
+                        if feature_extract.SKIP_FILLER_FRAMES and not detected[stream]:
+                            continue  # Filler frame, same as the clip pipeline
+                        self.pending[stream].append(resize_frame(sharpen_frame(crops[stream])))
+                    self.stats["frames_sampled"] += 1
+
+                    if self.stats["frames_sampled"] % INCREMENTAL_BATCH_FRAMES == 0:
+                        self._score(models)
+                self._score(models)
+        except Exception as e:
+            print(f"⚠️ Incremental capture failed: {e}")
+            self.error = str(e)
+
+    def _score(self, models):
+        """Runs the pending sampled frames through the models and keeps their classes."""
+        if not any(self.pending.values()):
+            return
+        if "emotion" in models:
+            self.preds["face"].extend(predict_classes(models["emotion"], to_model_input(self.pending["face"])))
+        if "sign" in models:
+            self.preds["left_hand"].extend(predict_classes(models["sign"], to_model_input(self.pending["left_hand"])))
+            self.preds["right_hand"].extend(predict_classes(models["sign"], to_model_input(self.pending["right_hand"])))
+        self.pending = {stream: [] for stream in STREAMS}
+        self.stats["batches"] += 1
+
+    # ==========================
+    # 🔹 Stop & vote
+    # ==========================
+    def finish(self):
+        """Waits for the remaining frames, then returns the majority vote per task (or {"error": ...})."""
+        self.stopping.set()
+        start = time.perf_counter()
+        self.worker.join()
+        self.stats["finalize_seconds"] = time.perf_counter() - start
+
+        print(f"⏱️ Incremental capture: {self.stats}")
+        if self.error:
+            return {"error": self.error}
+        if not self.stats["frames_sampled"]:
+            return {"error": "❌ No recorded frames were found."}
+
+        sampled = self.stats["frames_sampled"]
+        coverage = {stream: round(count / sampled, 4) for stream, count in self.stats["detected"].items()}
+
+        results = {}
+        if "emotion" in self.tasks:
+            emotion = majority_vote(self.preds["face"])
+            if emotion is None:
+                results["emotion"] = {"error": "❌ No preprocessed face frames found!"}
+            else:
+                results["emotion"] = {"emotion_prediction": EMOTION_LABELS[emotion]}
+            results["emotion"]["coverage"] = {"face": coverage["face"]}
+        if "sign" in self.tasks:
+            left = majority_vote(self.preds["left_hand"])
+            right = majority_vote(self.preds["right_hand"])
+            results["sign"] = {"sign_prediction": combine_hands(left, right),
+                               "coverage": {stream: coverage[stream] for stream in ("left_hand", "right_hand")}}
+        return results
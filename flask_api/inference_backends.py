@@ -0,0 +1,99 @@
+import os
+import threading
+import numpy as np
+
+# ==========================
+# 🔹 PLUGGABLE INFERENCE BACKENDS
+# ==========================
+# Every backend exposes predict_on_batch(batch) -> (N, classes) probabilities,
+# the same call batch_predict.predict_classes makes on a Keras model, so the
+# predictors don't care which runtime is behind it. Only the selected
+# backend's runtime is imported: tflite_runtime and onnxruntime start much
+# faster and use far less memory than full TensorFlow.
+#
+# Converted files are produced by model_export.py next to the .h5 files.
+
+BACKENDS = ("keras", "tflite", "onnxruntime")
+TFLITE_VARIANTS = (None, "fp16", "int8")  # None = float32
+
+def model_file(h5_path, backend, variant=None):
+    """Path of the model file a backend loads, e.g. emotion_model.h5 → emotion_model_fp16.tflite."""
+    if backend == "keras":
+        return h5_path
+    base = os.path.splitext(h5_path)[0]
+    if backend == "tflite":
+        return f"{base}_{variant}.tflite" if variant else f"{base}.tflite"
+    if backend == "onnxruntime":
+        return f"{base}.onnx"
+    raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+
+class KerasBackend:
+    name = "keras"
+
+    def __init__(self, path):
+        import tensorflow as tf
+        tf.get_logger().setLevel("ERROR")
+        self.model = tf.keras.models.load_model(path, compile=False)
+
+    def predict_on_batch(self, batch):
+        return np.asarray(self.model.predict_on_batch(batch))
+
+class TFLiteBackend:
+    name = "tflite"
+
+    def __init__(self, path, num_threads=None):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:  # Fall back to the interpreter bundled with TensorFlow
+            from tensorflow.lite import Interpreter
+        self.interpreter = Interpreter(model_path=path, num_threads=num_threads or os.cpu_count())
+        self._input = self.interpreter.get_input_details()[0]
+        self._output_index = self.interpreter.get_output_details()[0]["index"]
+        self._batch_size = None
+        self._lock = threading.Lock()  # An interpreter must not be invoked from two threads at once
+
+    def predict_on_batch(self, batch):
+        with self._lock:
+            if len(batch) != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input["index"], batch.shape)
+                self.interpreter.allocate_tensors()
+                self._batch_size = len(batch)
+
+            # Fully quantized models take int8/uint8 input
+            scale, zero_point = self._input["quantization"]
+            if self._input["dtype"] != np.float32 and scale:
+                batch = np.round(batch / scale + zero_point).astype(self._input["dtype"])
+
+            self.interpreter.set_tensor(self._input["index"], batch.astype(self._input["dtype"], copy=False))
+            self.interpreter.invoke()
+            output_details = self.interpreter.get_output_details()[0]
+            output = self.interpreter.get_tensor(self._output_index)
+
+        scale, zero_point = output_details["quantization"]
+        if output.dtype != np.float32 and scale:
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+class OnnxBackend:
+    name = "onnxruntime"
+
+    def __init__(self, path):
+        import onnxruntime as ort
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self._input_name = self.session.get_inputs()[0].name
+
+    def predict_on_batch(self, batch):
+        return self.session.run(None, {self._input_name: batch.astype(np.float32, copy=False)})[0]
+
+def load_backend(backend, h5_path, variant=None):
+    """Loads the model behind h5_path with the chosen backend. Raises FileNotFoundError if its file is missing."""
+    path = model_file(h5_path, backend, variant)
+    if not os.path.exists(path):
+        hint = " (run model_export.py first)" if backend != "keras" else ""
+        raise FileNotFoundError(f"[ERROR] {backend} model not found at {path}{hint}")
+
+    if backend == "keras":
+        return KerasBackend(path)
+    if backend == "tflite":
+        return TFLiteBackend(path)
+    return OnnxBackend(path)
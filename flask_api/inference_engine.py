@@ -0,0 +1,89 @@
+import os
+import time
+
+# Models are loaded once, on first use, by the model_loader registry
+import model_loader
+from baara_preprocessing.batch_predict import MAX_BATCH_SIZE
+from baara_preprocessing.emotion_prediction import emotion_from_folder, emotion_from_batch
+from baara_preprocessing.sign_prediction import sign_from_folders, sign_from_batches, sign_from_landmarks
+from baara_preprocessing.crop_store import find_store, load_model_input
+from baara_preprocessing.landmarks import LANDMARKS_FILE, load_landmarks
+
+# ==========================
+# 🔹 RESIDENT INFERENCE ENGINE
+# ==========================
+# The Flask routes call these functions directly instead of starting a new
+# Python interpreter (and reloading TensorFlow + the .h5 files) per request.
+
+def warm_up():
+    """Loads and warms up every enabled model at startup when model_loader.EAGER_LOAD is set.
+    Otherwise each model is loaded (and warmed up) by the first request that needs it."""
+    if not model_loader.EAGER_LOAD:
+        print(f"[INFO] Models load on first use: {', '.join(model_loader.ENABLED_MODELS)}.")
+        return
+
+    start = time.perf_counter()
+    model_loader.load_models()
+    print(f"[INFO] Inference engine warmed up in {time.perf_counter() - start:.2f}s.")
+
+def _get_model(name):
+    """The shared model, or an error dict the routes can return as-is."""
+    try:
+        return model_loader.get_model(name)
+    except (FileNotFoundError, RuntimeError) as e:
+        return {"error": str(e)}
+
+def predict_emotion(preprocessed_path, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the emotion from <preprocessed_path>/face.crops.npy, or the <preprocessed_path>/face folder, and returns a dict."""
+    model = _get_model("emotion")
+    if isinstance(model, dict):
+        return model
+    store = find_store(preprocessed_path, "face")
+    if store:
+        return emotion_from_batch(model, load_model_input(store), max_batch_size)
+    return emotion_from_folder(model, os.path.join(preprocessed_path, "face"), max_batch_size)
+
+def predict_sign(preprocessed_path, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the sign from the left_hand and right_hand crop stores (or folders) in preprocessed_path and returns a dict."""
+    model = _get_model("sign")
+    if isinstance(model, dict):
+        return model
+    left_store, right_store = find_store(preprocessed_path, "left_hand"), find_store(preprocessed_path, "right_hand")
+    if left_store or right_store:
+        # A hand that was never detected has no store and stays out of the vote
+        return sign_from_batches(model, load_model_input(left_store) if left_store else [],
+                                 load_model_input(right_store) if right_store else [], max_batch_size)
+    return sign_from_folders(
+        model,
+        os.path.join(preprocessed_path, "left_hand"),
+        os.path.join(preprocessed_path, "right_hand"),
+        max_batch_size,
+    )
+
+def predict_emotion_from_batches(batches, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the emotion from in-memory model inputs ({"face": (N, 64, 64, 1) array, ...})."""
+    model = _get_model("emotion")
+    if isinstance(model, dict):
+        return model
+    return emotion_from_batch(model, batches["face"], max_batch_size)
+
+def predict_sign_from_batches(batches, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the sign from in-memory model inputs ({"left_hand": array, "right_hand": array, ...})."""
+    model = _get_model("sign")
+    if isinstance(model, dict):
+        return model
+    return sign_from_batches(model, batches["left_hand"], batches["right_hand"], max_batch_size)
+
+def predict_sign_landmarks(preprocessed_path, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the sign from <preprocessed_path>/hand_landmarks.npz with the landmark classifier."""
+    landmark_path = os.path.join(preprocessed_path, LANDMARKS_FILE)
+    if not os.path.exists(landmark_path):
+        return {"error": "❌ No hand landmarks found!"}
+    return predict_sign_from_landmarks(load_landmarks(landmark_path), max_batch_size)
+
+def predict_sign_from_landmarks(batches, max_batch_size=MAX_BATCH_SIZE):
+    """Predicts the sign from in-memory hand landmark arrays ({"left_hand_landmarks": (N, 21, 3) array, ...})."""
+    model = _get_model("sign_landmarks")
+    if isinstance(model, dict):
+        return model
+    return sign_from_landmarks(model, batches, max_batch_size)
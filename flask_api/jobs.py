@@ -0,0 +1,112 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ==========================
+# 🔹 ASYNCHRONOUS JOB QUEUE
+# ==========================
+# Long videos are processed by a bounded pool of worker threads instead of
+# inside the HTTP request. Clients submit a job, poll its status and fetch the
+# result when it is done.
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds the maximum number of pending jobs."""
+
+class Job:
+    """State of one submitted video: status, per-stage progress/timings and the final result."""
+
+    def __init__(self, job_id, task, params=None):
+        self.job_id = job_id
+        self.task = task
+        self.params = params or {}
+        self.status = "queued"  # queued → running → done | failed
+        self.stages = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def update_stage(self, stage, state, seconds=None):
+        """Progress callback for the pipeline: state is "running" or "done"."""
+        with self._lock:
+            self.stages[stage] = {"status": state, "seconds": seconds}
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "task": self.task,
+                "status": self.status,
+                "stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "error": self.error,
+                "queued_seconds": (self.started_at or time.time()) - self.created_at,
+                "run_seconds": ((self.finished_at or time.time()) - self.started_at) if self.started_at else None,
+            }
+
+class JobQueue:
+    """
+    Runs jobs on max_workers threads. At most max_pending jobs may be queued or running
+    at once; submit() raises QueueFullError beyond that so callers can apply backpressure.
+    Finished jobs are kept for keep_finished_seconds so their results can be fetched.
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, keep_finished_seconds=3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.keep_finished_seconds = keep_finished_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._jobs = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, job, fn, on_finish=None):
+        """Queues fn(job); its return value becomes job.result. on_finish(job) always runs afterwards."""
+        with self._lock:
+            self._purge_finished()
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+            self._pending += 1
+            self._jobs[job.job_id] = job
+
+        self._executor.submit(self._run, job, fn, on_finish)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        """Queue depth and limits."""
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == "running")
+            return {
+                "queued": self._pending - running,
+                "running": running,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+            }
+
+    def _run(self, job, fn, on_finish):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = fn(job)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+            if on_finish:
+                on_finish(job)
+
+    def _purge_finished(self):
+        """Forgets finished jobs older than keep_finished_seconds (call with the lock held)."""
+        cutoff = time.time() - self.keep_finished_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,229 @@
+import time
+import bisect
+import threading
+
+# ==========================
+# 🔹 PROMETHEUS-STYLE METRICS
+# ==========================
+# Counters, gauges and histograms served as Prometheus text (format 0.0.4) on
+# GET /metrics, without the prometheus_client dependency. Cheap enough to
+# leave on: an observation is one bisect and a few additions under the
+# metric's lock, and nothing is formatted until /metrics is scraped.
+# Pipeline stages are observed once per job (seconds summed over the job's
+# frames), model forward passes once per batch.
+
+METRICS_ENABLED = True
+PREFIX = "signnsync_"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SIZE_BUCKETS = tuple(mb * 1024 * 1024 for mb in (0.1, 0.5, 1, 5, 10, 25, 50, 100, 250, 500))
+
+REGISTRY = []
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = PREFIX + name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self):
+        """[(suffix, label values, extra label pairs, value)] for render()."""
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.label_names, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def values(self):
+        """{label value tuple: count} snapshot."""
+        with self._lock:
+            return dict(self._values)
+
+class Gauge(_Metric):
+    """A value that goes up and down. With set_function the value is read at scrape time instead."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._function = None
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn):
+        """fn() returns the value, or {label value tuple: value} for a labelled gauge."""
+        self._function = fn
+
+    def _samples(self):
+        if self._function is None:
+            return super()._samples()
+        try:
+            values = self._function()
+        except Exception:
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [("", key, (), value) for key, value in sorted(values.items())]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # Per-bucket counts (non-cumulative, +Inf last), then sum
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def time(self, **labels):
+        """Context manager observing the seconds spent in its block."""
+        return _Timer(self, labels)
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += count
+                samples.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+            samples.append(("_sum", key, (), counts[-1]))
+            samples.append(("_count", key, (), cumulative))
+        return samples
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+def render():
+    """Every registered metric in Prometheus text format."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+# ==========================
+# 🔹 Metrics
+# ==========================
+upload_bytes = Histogram("upload_bytes", "Size of uploaded videos in bytes.", ("endpoint",), SIZE_BUCKETS)
+stage_seconds = Histogram("stage_seconds", "Seconds per job spent in each pipeline stage "
+                          "(decode, holistic, crop, sharpen, resize, and the disk/in-memory stage graph nodes).", ("stage",))
+model_forward_seconds = Histogram("model_forward_seconds", "Seconds per model forward pass (one batch).", ("model",))
+model_forward_frames = Counter("model_forward_frames_total", "Frames run through each model.", ("model",))
+request_seconds = Histogram("http_request_seconds", "Request handling time.", ("endpoint", "method", "status"))
+
+frames_processed = Counter("frames_processed_total", "Sampled frames processed per stream.", ("stream",))
+frames_detected = Counter("frames_detected_total", "Sampled frames in which the stream's landmarks were detected.", ("stream",))
+detection_ratio = Gauge("detection_ratio", "frames_detected_total / frames_processed_total per stream.", ("stream",))
+detection_ratio.set_function(lambda: {
+    key: frames_detected.value(stream=key[0]) / processed
+    for key, processed in frames_processed.values().items() if processed
+})
+
+requests_in_flight = Gauge("requests_in_flight", "HTTP requests being handled right now.")
+jobs_queued = Gauge("jobs_queued", "Jobs waiting for a worker.")
+jobs_running = Gauge("jobs_running", "Jobs being processed.")
+active_streams = Gauge("active_streams", "Open /stream WebSocket sessions.")
+
+# ==========================
+# 🔹 Recording helpers
+# ==========================
+def record_stages(stage_timings):
+    """Observes {stage: seconds} for one job (non-numeric and missing entries are skipped)."""
+    for stage, seconds in stage_timings.items():
+        if isinstance(seconds, float):
+            stage_seconds.observe(seconds, stage=stage)
+
+def record_frames(frames, detected):
+    """Adds one job's sampled frame count per stream ({stream: n}) and detections ({stream: n})."""
+    for stream, count in frames.items():
+        frames_processed.inc(count, stream=stream)
+    for stream, count in detected.items():
+        frames_detected.inc(count, stream=stream)
+
+def instrument_app(app, skip=("/metrics",)):
+    """Tracks in-flight requests and request time for every route of app except skip."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request():
+        if request.path in skip:
+            return
+        g.metrics_start = time.perf_counter()
+        requests_in_flight.inc()
+
+    @app.after_request
+    def _observe_request(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            request_seconds.observe(time.perf_counter() - start, endpoint=endpoint, method=request.method,
+                                    status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def _end_request(_exc):
+        if request.path not in skip:
+            requests_in_flight.dec()
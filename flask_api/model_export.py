@@ -0,0 +1,112 @@
+"""
+Exports the Keras .h5 models to faster inference runtimes. The files are
+written next to the .h5 files, where model_loader looks for them when
+INFERENCE_BACKEND is "tflite" or "onnxruntime".
+
+    emotion_model.tflite        float32 TFLite
+    emotion_model_fp16.tflite   float16 weights (half the size, same accuracy in practice)
+    emotion_model_int8.tflite   int8 weights/activations, calibrated on real preprocessed frames
+    emotion_model.onnx          ONNX (needs tf2onnx)
+
+Run from the flask_api folder:
+    python model_export.py --tflite --fp16 --int8 --onnx --calibration ../interpretation/preprocessed
+"""
+import os
+import argparse
+import cv2
+import numpy as np
+
+import tensorflow as tf
+
+from inference_backends import model_file
+from baara_preprocessing.image_ops import to_model_input
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, "model")
+MODEL_FILES = {
+    "emotion": os.path.join(MODEL_PATH, "emotion_model.h5"),
+    "sign": os.path.join(MODEL_PATH, "sign_language_model.h5"),
+}
+
+CALIBRATION_FRAMES = 200  # Frames fed through the model to pick int8 ranges
+ONNX_OPSET = 13
+
+def load_calibration_frames(folder, limit=CALIBRATION_FRAMES):
+    """(N, 64, 64, 1) model inputs from the images under folder (e.g. a preprocessed/ tree), random if none."""
+    frames = []
+    if folder and os.path.isdir(folder):
+        for root, _, files in sorted(os.walk(folder)):
+            for name in sorted(files):
+                frame = cv2.imread(os.path.join(root, name), cv2.IMREAD_GRAYSCALE)
+                if frame is not None:
+                    frames.append(cv2.resize(frame, (64, 64)))
+                if len(frames) >= limit:
+                    return to_model_input(frames)
+
+    if frames:
+        return to_model_input(frames)
+
+    print("⚠️ No calibration frames found, using random input (int8 accuracy will suffer).")
+    return np.random.default_rng(0).random((limit, 64, 64, 1), dtype=np.float32)
+
+def export_tflite(model, h5_path, variant=None, calibration=None):
+    """Converts a Keras model to TFLite. variant: None (float32), "fp16" or "int8"."""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+    if variant == "fp16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == "int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([calibration[i:i + 1]] for i in range(len(calibration)))
+        # Input/output stay float32 so the backend can be swapped without touching preprocessing
+
+    output_path = model_file(h5_path, "tflite", variant)
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    return output_path
+
+def export_onnx(model, h5_path):
+    """Converts a Keras model to ONNX with a dynamic batch dimension."""
+    import tf2onnx  # Optional dependency, only needed for this export
+
+    output_path = model_file(h5_path, "onnxruntime")
+    input_signature = [tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name="input")]
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=ONNX_OPSET, output_path=output_path)
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", choices=sorted(MODEL_FILES), default=sorted(MODEL_FILES))
+    parser.add_argument("--tflite", action="store_true", help="float32 TFLite")
+    parser.add_argument("--fp16", action="store_true", help="float16 TFLite")
+    parser.add_argument("--int8", action="store_true", help="int8 TFLite (uses --calibration)")
+    parser.add_argument("--onnx", action="store_true", help="ONNX via tf2onnx")
+    parser.add_argument("--calibration", default=None, help="Folder of preprocessed frames for int8 calibration")
+    args = parser.parse_args()
+
+    if not (args.tflite or args.fp16 or args.int8 or args.onnx):
+        parser.error("Choose at least one of --tflite, --fp16, --int8, --onnx")
+
+    calibration = load_calibration_frames(args.calibration) if args.int8 else None
+
+    for name in args.models:
+        h5_path = MODEL_FILES[name]
+        model = tf.keras.models.load_model(h5_path, compile=False)
+        print(f"🔹 {name}: {h5_path}")
+
+        outputs = []
+        if args.tflite:
+            outputs.append(export_tflite(model, h5_path))
+        if args.fp16:
+            outputs.append(export_tflite(model, h5_path, "fp16"))
+        if args.int8:
+            outputs.append(export_tflite(model, h5_path, "int8", calibration))
+        if args.onnx:
+            outputs.append(export_onnx(model, h5_path))
+
+        for path in outputs:
+            print(f"✅ {os.path.basename(path):<32} {os.path.getsize(path) / 1024:9.1f} KB")
+
+if __name__ == "__main__":
+    main()
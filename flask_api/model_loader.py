@@ -1,5 +1,11 @@
 import os
-import tensorflow as tf
+import sys
+import time
+import threading
+import numpy as np
+import metrics
+from inference_backends import load_backend, model_file
+from baara_preprocessing.landmarks import FEATURE_SIZE, LandmarkClassifier
 
 # Get the absolute path to the 'model' directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -8,42 +14,179 @@ MODEL_PATH = os.path.join(BASE_DIR, "model")
 # Paths to model files
 emotion_model_path = os.path.join(MODEL_PATH, "emotion_model.h5")
 sign_model_path = os.path.join(MODEL_PATH, "sign_language_model.h5")
+sign_landmark_model_path = os.path.join(MODEL_PATH, "sign_landmark_model.npz")
+MODEL_PATHS = {"emotion": emotion_model_path, "sign": sign_model_path, "sign_landmarks": sign_landmark_model_path}
+
+# Hand-landmark classifiers (landmarks.LandmarkClassifier weights), loaded with NumPy whatever the backend
+LANDMARK_MODELS = ("sign_landmarks",)
+
+# ========================
+# ✅ Inference backend
+# ========================
+# "keras" loads the .h5 files with full TensorFlow. "tflite" and "onnxruntime"
+# load the files written by model_export.py and skip TensorFlow entirely when
+# tflite_runtime / onnxruntime are installed.
+INFERENCE_BACKEND = "keras"
+BACKEND_VARIANT = None  # tflite only: None (float32), "fp16" or "int8"
+
+# Files actually loaded, used to version cached results
+model_files = {
+    name: path if name in LANDMARK_MODELS else model_file(path, INFERENCE_BACKEND, BACKEND_VARIANT)
+    for name, path in MODEL_PATHS.items()
+}
+
+# ========================
+# ✅ Model registry
+# ========================
+# Each model is loaded once, on first use, and shared by every route and
+# thread. A deployment that only serves /predict/emotion never loads the sign
+# model (and never fails on a missing sign model file).
+ENABLED_MODELS = ("emotion", "sign")  # Models this deployment may load (add "sign_landmarks" for landmark sign input)
+EAGER_LOAD = False                    # True = load + warm up ENABLED_MODELS at startup instead of on first use
+MEMORY_BUDGET_MB = None               # Warn when process memory passes this after a load, None = no limit
+MODEL_INPUT_SHAPE = (1, 64, 64, 1)    # One grayscale 64x64 frame, used for the warm-up pass
+LANDMARK_INPUT_SHAPE = (1, FEATURE_SIZE)  # One hand's 21 x (x, y, z) landmarks
+
+_models = {}
+_model_stats = {}
+_registry_lock = threading.Lock()
 
 # ========================
 # ✅ GPU Memory Handling
 # ========================
 # Prevent TensorFlow from allocating all GPU memory
-gpus = tf.config.experimental.list_physical_devices("GPU")
-if gpus:
+_gpu_configured = False
+
+def configure_gpu():
+    global _gpu_configured
+    if _gpu_configured or INFERENCE_BACKEND != "keras":
+        return
+    _gpu_configured = True
+
+    import tensorflow as tf
+    gpus = tf.config.experimental.list_physical_devices("GPU")
+    if gpus:
+        try:
+            for gpu in gpus:
+                tf.config.experimental.set_memory_growth(gpu, True)  # Allocate memory dynamically
+            print("[INFO] GPU detected. Memory growth enabled.")
+        except RuntimeError as e:
+            print(f"[WARNING] GPU memory configuration failed: {e}")
+    else:
+        print("[INFO] No GPU found. Running on CPU.")
+
+def current_rss_mb():
+    """Resident memory of this process in MB (peak RSS where psutil isn't installed), None if unknown."""
     try:
-        for gpu in gpus:
-            tf.config.experimental.set_memory_growth(gpu, True)  # Allocate memory dynamically
-        print("[INFO] GPU detected. Memory growth enabled.")
-    except RuntimeError as e:
-        print(f"[WARNING] GPU memory configuration failed: {e}")
-else:
-    print("[INFO] No GPU found. Running on CPU.")
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows without psutil
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
 
-# ========================
-# ✅ Check if model files exist
-# ========================
-if not os.path.exists(emotion_model_path):
-    raise FileNotFoundError(f"[ERROR] Emotion model not found at {emotion_model_path}")
+class TimedModel:
+    """Wraps a loaded model so every forward pass is observed in /metrics (per model name)."""
 
-if not os.path.exists(sign_model_path):
-    raise FileNotFoundError(f"[ERROR] Sign language model not found at {sign_model_path}")
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+
+    def predict_on_batch(self, batch):
+        start = time.perf_counter()
+        probs = self.model.predict_on_batch(batch)
+        metrics.model_forward_seconds.observe(time.perf_counter() - start, model=self.name)
+        metrics.model_forward_frames.inc(len(batch), model=self.name)
+        return probs
+
+    def __getattr__(self, attr):
+        return getattr(self.model, attr)
 
 # ========================
 # ✅ Load the models safely
 # ========================
-try:
-    emotion_model = tf.keras.models.load_model(emotion_model_path, compile=False)
-    print("[INFO] Emotion model loaded successfully.")
-except Exception as e:
-    raise RuntimeError(f"[ERROR] Failed to load emotion model: {str(e)}")
-
-try:
-    sign_model = tf.keras.models.load_model(sign_model_path, compile=False)
-    print("[INFO] Sign language model loaded successfully.")
-except Exception as e:
-    raise RuntimeError(f"[ERROR] Failed to load sign language model: {str(e)}")
+def _load(name):
+    """Loads and warms up one model, recording its load time and memory."""
+    landmark_model = name in LANDMARK_MODELS
+    if not landmark_model:
+        configure_gpu()
+    rss_before = current_rss_mb()
+
+    backend = "numpy" if landmark_model else INFERENCE_BACKEND
+    start = time.perf_counter()
+    try:
+        if landmark_model:
+            model = LandmarkClassifier.load(MODEL_PATHS[name])
+        else:
+            model = load_backend(INFERENCE_BACKEND, MODEL_PATHS[name], BACKEND_VARIANT)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"[ERROR] Failed to load {name} model: {str(e)}")
+    load_seconds = time.perf_counter() - start
+
+    # Dummy batch so the first real request doesn't pay graph-tracing / tensor-allocation cost
+    start = time.perf_counter()
+    model.predict_on_batch(np.zeros(LANDMARK_INPUT_SHAPE if landmark_model else MODEL_INPUT_SHAPE, dtype=np.float32))
+    warmup_seconds = time.perf_counter() - start
+
+    rss_after = current_rss_mb()
+    stats = {
+        "backend": backend,
+        "file": model_files[name],
+        "file_mb": os.path.getsize(model_files[name]) / (1024 * 1024),
+        "load_seconds": load_seconds,
+        "warmup_seconds": warmup_seconds,
+        "rss_delta_mb": rss_after - rss_before if rss_before is not None else None,
+        "rss_mb": rss_after,
+    }
+    print(f"[INFO] {name.capitalize()} model loaded ({backend}) in {load_seconds:.2f}s, "
+          f"warm-up {warmup_seconds:.2f}s" + (f", +{stats['rss_delta_mb']:.0f} MB" if rss_before is not None else ""))
+
+    if MEMORY_BUDGET_MB and rss_after and rss_after > MEMORY_BUDGET_MB:
+        print(f"[WARNING] Process memory {rss_after:.0f} MB is over the {MEMORY_BUDGET_MB} MB budget after loading {name}.")
+    return TimedModel(name, model), stats
+
+def model_available(name):
+    """True if name is enabled on this server and its model file exists (get_model would not fail for lack of it)."""
+    return name in ENABLED_MODELS and os.path.exists(model_files[name])
+
+def get_model(name):
+    """Returns the shared instance of a model, loading it on first use. Thread-safe."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in ENABLED_MODELS:
+        raise RuntimeError(f"[ERROR] The {name} model is not enabled on this server.")
+
+    with _registry_lock:
+        if name not in _models:  # Another thread may have loaded it while we waited
+            _models[name], _model_stats[name] = _load(name)
+    return _models[name]
+
+def load_models(names=None):
+    """Eagerly loads the given models (default ENABLED_MODELS)."""
+    for name in names or ENABLED_MODELS:
+        get_model(name)
+
+def model_stats():
+    """Per-model load statistics plus which enabled models are still unloaded."""
+    return {
+        "backend": INFERENCE_BACKEND,
+        "eager_load": EAGER_LOAD,
+        "loaded": dict(_model_stats),
+        "not_loaded": [name for name in ENABLED_MODELS if name not in _models],
+        "rss_mb": current_rss_mb(),
+        "memory_budget_mb": MEMORY_BUDGET_MB,
+    }
+
+def __getattr__(name):
+    """Keeps `model_loader.emotion_model` / `model_loader.sign_model` working; they now load on first access."""
+    if name in ("emotion_model", "sign_model"):
+        return get_model(name[:-len("_model")])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
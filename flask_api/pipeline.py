@@ -0,0 +1,307 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Resident models (loaded once per process)
+import inference_engine
+import model_loader
+import metrics
+from result_cache import LRUCache, file_sha256, make_key, model_version
+from stage_graph import StageGraph
+
+# Importing preprocessing functions
+from baara_preprocessing import feature_extract, landmark_detector
+from baara_preprocessing.feature_extract import DEFAULT_FRAME_RATE, extract_features
+from baara_preprocessing.frame import extract_sharpened_frames
+from baara_preprocessing.preprocessing_image import preprocess_images
+from baara_preprocessing.stream_pipeline import STREAMS, extract_stream_batches
+from baara_preprocessing.parallel import POSTPROCESS_WORKERS, sharpen_streams, resize_streams
+from baara_preprocessing.crop_store import store_streams, export_jpegs
+from baara_preprocessing.landmarks import LANDMARKS_FILE
+from baara_preprocessing.detections import coverage
+
+# ==========================
+# 🔹 PIPELINE MODES
+# ==========================
+# "memory": crops stay NumPy arrays from MediaPipe through sharpen/resize into the models
+# "disk":   every stage writes mp4/jpg files that the next stage reads back
+PIPELINE_MODES = ("memory", "disk")
+PIPELINE_MODE = "memory"
+
+# Disk mode artifacts after feature extraction:
+# "jpeg":  frames/ and preprocessed/ folders with one JPEG per frame (frame.py + preprocessing_image.py)
+# "store": one <stream>.crops.npy per stream in preprocessed/, memory-mapped by the predictors
+ARTIFACT_FORMATS = ("jpeg", "store")
+ARTIFACT_FORMAT = "jpeg"
+
+# Sign model input:
+# "pixel":    64x64 grayscale hand crops into sign_language_model.h5
+# "landmark": normalized 21x3 hand landmarks into the landmark classifier (model_loader "sign_landmarks"),
+#             the hands are never cropped, resized or written
+SIGN_INPUTS = ("pixel", "landmark")
+SIGN_INPUT = "pixel"
+
+# Emotion and sign inference for the same video run at the same time on these threads
+# (TensorFlow releases the GIL while a forward pass runs)
+INFERENCE_THREADS = 4
+
+# Streams each task's model reads; their detection coverage is reported with its result
+TASK_STREAMS = {"emotion": ("face",), "sign": ("left_hand", "right_hand")}
+_inference_pool = ThreadPoolExecutor(max_workers=INFERENCE_THREADS, thread_name_prefix="inference")
+
+# ==========================
+# 🔹 RESULT CACHE
+# ==========================
+# Results are keyed by the uploaded bytes + model file versions + pipeline parameters.
+# In memory mode the per-stream crop arrays are cached too, so /predict/sign after
+# /predict/emotion on the same clip skips extraction.
+CACHE_ENABLED = True
+CACHE_DISK_PATH = None  # Folder for the optional on-disk tier (survives restarts), None = memory only
+
+MODEL_FILES = model_loader.model_files
+
+result_cache = LRUCache(
+    "results", max_entries=512, ttl_seconds=24 * 3600,
+    disk_dir=os.path.join(CACHE_DISK_PATH, "results") if CACHE_DISK_PATH else None, disk_format="json"
+)
+crop_cache = LRUCache(
+    "crops", max_entries=32, max_bytes=256 * 1024 * 1024, ttl_seconds=3600,
+    disk_dir=os.path.join(CACHE_DISK_PATH, "crops") if CACHE_DISK_PATH else None, disk_format="npz"
+)
+
+def cache_stats():
+    """Hit/miss counters for both cache tiers."""
+    return {"enabled": CACHE_ENABLED, "results": result_cache.stats(), "crops": crop_cache.stats()}
+
+# ==========================
+# 🔹 DISK VIDEO PROCESSING STAGES
+# ==========================
+def add_disk_stages(graph, video_path, feature_path, frame_path, preprocessed_path, frame_rate=DEFAULT_FRAME_RATE,
+                    artifact_format=None, debug_artifacts=False, streams=STREAMS, landmark_path=None):
+    """
+    Declares the disk preprocessing stages on graph (feature_extract → sharpen → resize, or
+    feature_extract → crop_store) and returns the name of the last one, whose output is
+    {stream: preprocessed folder or crop store}.
+    streams: crop streams to produce; landmark_path: also save the hand landmarks there.
+    """
+    artifact_format = artifact_format or ARTIFACT_FORMAT
+
+    # Decode + Holistic + landmark crops. Only the frames that will be scored go through Holistic.
+    graph.add("feature_extract", lambda: extract_features(
+        video_path, feature_path, run_frame_script=False, frame_rate=frame_rate, streams=streams, landmark_path=landmark_path
+    ))
+
+    if artifact_format == "store":
+        def crop_store(_features):
+            # Sharpen + resize straight into one crop store per stream, no per-frame files
+            stores = store_streams(feature_path, preprocessed_path, streams, frame_rate)
+            if debug_artifacts:
+                for key, store in stores.items():
+                    export_jpegs(store, os.path.join(frame_path, key), f"test_{key}")
+            return stores
+
+        graph.add("crop_store", crop_store, needs=("feature_extract",))
+        return "crop_store"
+
+    def sharpen(_features):
+        """Samples + sharpens the feature videos into JPEG frames (frame.py)."""
+        if POSTPROCESS_WORKERS > 1:
+            # Chunked across cores, all streams at once
+            return sharpen_streams(feature_path, frame_path, streams, frame_rate)
+
+        frame_paths = {}
+        for key in streams:
+            vid_path = os.path.join(feature_path, key, f"test_{key}.mp4")
+            if os.path.exists(vid_path):
+                frame_folder = os.path.join(frame_path, key)
+                extract_sharpened_frames(os.path.dirname(vid_path), frame_folder, frame_rate)
+                frame_paths[key] = frame_folder
+        return frame_paths
+
+    def resize(frame_paths):
+        """Resizes the sharpened frames to 64x64 model input (preprocessing_image.py)."""
+        if POSTPROCESS_WORKERS > 1:
+            return resize_streams(frame_path, preprocessed_path, streams)
+
+        preprocessed_paths = {}
+        for key, frame_folder in frame_paths.items():
+            if os.listdir(frame_folder):
+                output_folder = os.path.join(preprocessed_path, key)
+                preprocess_images(frame_folder, output_folder)
+                preprocessed_paths[key] = output_folder
+        return preprocessed_paths
+
+    graph.add("sharpen", sharpen, needs=("feature_extract",))
+    graph.add("resize", resize, needs=("sharpen",))
+    return "resize"
+
+def process_video(video_path, feature_path, frame_path, preprocessed_path, frame_rate=DEFAULT_FRAME_RATE,
+                  artifact_format=None, debug_artifacts=False, streams=STREAMS, landmark_path=None):
+    """Extracts features, frames, preprocesses images, and returns extracted file paths (disk stages only)."""
+    try:
+        graph = StageGraph("disk")
+        last_stage = add_disk_stages(graph, video_path, feature_path, frame_path, preprocessed_path, frame_rate,
+                                     artifact_format, debug_artifacts, streams, landmark_path)
+        outputs, _ = graph.run()
+        return outputs[last_stage]
+
+    except Exception as e:
+        return {"error": str(e)}
+
+# ==========================
+# 🔹 METRICS
+# ==========================
+FRAME_STAGES = ("decode", "holistic", "crop", "sharpen", "resize")  # Per-frame work, summed over the job
+
+def record_metrics(mode, outputs, stage_timings):
+    """Feeds one job's stage seconds and per-stream frame/detection counts to /metrics."""
+    metrics.record_stages(stage_timings)
+    if mode == "memory":
+        extraction = outputs["stream_extract"][1]  # Empty when the crops came from the cache
+        sampled, detected, frame_timings = extraction.get("frames_sampled"), extraction.get("detected", {}), extraction
+    else:
+        extraction = outputs["feature_extract"] or {}
+        sampled, detected, frame_timings = extraction.get("frames"), extraction.get("detected_features", {}), extraction.get("timings", {})
+
+    # Disk mode's sharpen/resize are stage graph nodes, already recorded above
+    metrics.record_stages({stage: frame_timings[stage] for stage in FRAME_STAGES if stage in frame_timings})
+    if sampled:
+        metrics.record_frames(dict.fromkeys(STREAMS, sampled), detected)
+
+# ==========================
+# 🔹 VIDEO → PREDICTIONS
+# ==========================
+def predict_video(video_path, tasks, workspace, mode=None, debug_artifacts=False, frame_rate=DEFAULT_FRAME_RATE,
+                  progress=None, sign_input=None):
+    """
+    Runs the pipeline once for video_path and the requested tasks ("emotion", "sign"),
+    scoring frame_rate frames per second of video.
+
+    workspace: the job's folders (see workspace.workspace_paths); intermediate files only go there.
+    In memory mode nothing is written unless debug_artifacts is set, in which case the
+    64x64 frames are saved to workspace["frames"] for inspection.
+    progress: optional callback progress(stage, state, seconds) with state "running" or "done", called for
+        every stage of the job's stage graph (stream_extract or feature_extract/sharpen/resize, then <task>_model).
+    sign_input: "pixel" or "landmark" (defaults to SIGN_INPUT), see SIGN_INPUTS.
+
+    Returns ({task: prediction dict}, timings in seconds).
+    """
+    mode = mode or PIPELINE_MODE
+    if mode not in PIPELINE_MODES:
+        raise ValueError(f"Unknown pipeline mode '{mode}', expected one of {PIPELINE_MODES}")
+    if ARTIFACT_FORMAT not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format '{ARTIFACT_FORMAT}', expected one of {ARTIFACT_FORMATS}")
+    variant = mode if mode == "memory" else f"{mode}-{ARTIFACT_FORMAT}"  # JPEG round trips change pixel values
+    frames_kept = "detected" if feature_extract.SKIP_FILLER_FRAMES else "filled"  # Filler frames change the vote
+    detection = landmark_detector.DETECTION_MODE  # Downscaled / ROI detection can move the landmarks
+    if detection != "full":
+        detection = f"{detection}-{landmark_detector.DETECT_MAX_SIDE}-{landmark_detector.REDETECT_EVERY}"
+    sign_input = sign_input or SIGN_INPUT
+    if sign_input not in SIGN_INPUTS:
+        raise ValueError(f"Unknown sign input '{sign_input}', expected one of {SIGN_INPUTS}")
+    model_names = {"emotion": "emotion", "sign": "sign_landmarks" if sign_input == "landmark" else "sign"}
+
+    # ✅ Finished results for this exact clip, models and parameters
+    results = {}
+    result_keys = {}
+    video_hash = None
+    if CACHE_ENABLED:
+        video_hash = file_sha256(video_path)
+        for task in tasks:
+            model = model_names[task]
+            result_keys[task] = make_key("result", video_hash, model, variant, frames_kept, detection, frame_rate, model_version(MODEL_FILES[model]))
+            cached = result_cache.get(result_keys[task])
+            if cached is not None:
+                results[task] = cached
+        tasks = [task for task in tasks if task not in results]
+
+    timings = {}
+    if not tasks:
+        timings["cache_hits"] = len(results)
+        return results, timings
+
+    # Landmark sign input only needs the face cropped (and only for emotion)
+    hand_landmarks = "sign" in tasks and sign_input == "landmark"
+    if sign_input == "landmark":
+        streams = ("face",) if "emotion" in tasks else ()
+    else:
+        streams = STREAMS
+    # The cached batches differ by which streams were cropped and whether hand landmarks were kept
+    crop_key_parts = ("landmark", hand_landmarks) + streams if sign_input == "landmark" else ()
+
+    # Every stage of this job, run once each: preprocessing, then the models side by side
+    graph = StageGraph(f"{mode}/{sign_input}")
+    if mode == "memory":
+        # Debug runs always extract so their frames get written
+        crop_key = make_key("crops", video_hash, frames_kept, detection, frame_rate, *crop_key_parts) if video_hash and not debug_artifacts else None
+
+        def stream_extract():
+            """Decode → landmark crop → sharpen/sample → resize, streamed frame by frame in memory."""
+            batches = crop_cache.get(crop_key) if crop_key else None
+            if batches is not None:
+                return batches, {}
+            batches, extract_timings = extract_stream_batches(
+                video_path, frame_rate, debug_folder=workspace["frames"] if debug_artifacts else None,
+                streams=streams, hand_landmarks=hand_landmarks
+            )
+            if crop_key:
+                crop_cache.put(crop_key, batches)
+            return batches, extract_timings
+
+        graph.add("stream_extract", stream_extract)
+        model_stage_input = "stream_extract"
+        predictors = {
+            "emotion": inference_engine.predict_emotion_from_batches,
+            "sign": inference_engine.predict_sign_from_landmarks if hand_landmarks else inference_engine.predict_sign_from_batches,
+        }
+    else:
+        landmark_path = os.path.join(workspace["preprocessed"], LANDMARKS_FILE) if hand_landmarks else None
+        model_stage_input = add_disk_stages(graph, video_path, workspace["feature"], workspace["frames"], workspace["preprocessed"],
+                                            frame_rate, debug_artifacts=debug_artifacts, streams=streams, landmark_path=landmark_path)
+        predictors = {
+            "emotion": inference_engine.predict_emotion,
+            "sign": inference_engine.predict_sign_landmarks if hand_landmarks else inference_engine.predict_sign,
+        }
+
+    # Fan the single decode out to the models: face → emotion, hands → sign
+    for task in tasks:
+        if mode == "memory":
+            run = lambda extracted, predict_fn=predictors[task]: predict_fn(extracted[0])
+        else:
+            run = lambda _paths, predict_fn=predictors[task]: predict_fn(workspace["preprocessed"])
+        graph.add(f"{task}_model", run, needs=(model_stage_input,))
+
+    # Ready stages share the inference pool, so the two forward passes overlap
+    start = time.perf_counter()
+    outputs, stage_timings = graph.run(progress=progress, executor=_inference_pool)
+    wall = time.perf_counter() - start
+
+    record_metrics(mode, outputs, stage_timings)
+
+    # Per-frame detection masks of the sampled frames (also present for cached crops)
+    if mode == "memory":
+        detections = outputs["stream_extract"][0]
+    else:
+        detections = (outputs["feature_extract"] or {}).get("detections")
+
+    model_stages = [f"{task}_model" for task in tasks]
+    if mode == "memory":
+        timings.update(outputs["stream_extract"][1])  # Per-stage split of the streamed extraction
+    timings.update(stage_timings)
+    timings["preprocessing"] = sum(seconds for stage, seconds in stage_timings.items() if stage not in model_stages)
+    timings["inference_wall"] = wall - timings["preprocessing"]
+
+    for task in tasks:
+        # Share of the sampled frames the task's streams were detected in (the only frames classified)
+        result = {**outputs[f"{task}_model"], "coverage": coverage(detections, TASK_STREAMS[task])}
+        results[task] = result
+        # Errors may be transient, only successful predictions are cached
+        if task in result_keys and "error" not in result:
+            result_cache.put(result_keys[task], result)
+    timings["total"] = wall
+    timings["cache_hits"] = len(results) - len(tasks)
+
+    print(f"⏱️ Pipeline ({mode}, {sign_input} sign input) timings: " + ", ".join(
+        f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in timings.items()
+    ))
+    return results, timings
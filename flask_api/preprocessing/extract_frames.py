@@ -1,25 +1,15 @@
-import cv2
+from baara_preprocessing.video_io import VideoReader
 
 def extract_frames(video_path, frame_interval=5):
-    cap = cv2.VideoCapture(video_path)
+    cap = VideoReader(video_path)
     
     # Check if video opened correctly
     if not cap.isOpened():
         print("❌ Error opening video file!")
         return []
 
-    frames = []
-    frame_count = 0
-
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        if frame_count % frame_interval == 0:
-            frames.append(frame)
-
-        frame_count += 1
+    # Skipped frames are grabbed, not decoded; decoding runs ahead on a background thread
+    frames = [frame for _, frame in cap.frames(frame_interval)]
 
     cap.release()
     print(f"✅ Extracted {len(frames)} frames.")
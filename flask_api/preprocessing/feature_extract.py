@@ -2,6 +2,8 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from baara_preprocessing.crop import landmarks_to_array, raw_box, pad_box
+
 # Initialize Mediapipe Holistic model once
 mp_holistic = mp.solutions.holistic
 holistic_model = mp_holistic.Holistic(
@@ -19,13 +21,12 @@ def extract_features_from_frame(frame):
     results = holistic_model.process(image)
 
     def crop_landmarks(landmarks):
-        x_min, y_min, x_max, y_max = w, h, 0, 0
-        for lm in landmarks.landmark:
-            x, y = int(lm.x * w), int(lm.y * h)
-            x_min, x_max = min(x_min, x), max(x_max, x)
-            y_min, y_max = min(y_min, y), max(y_max, y)
-        return frame[max(0, y_min - padding):min(h, y_max + padding),
-                     max(0, x_min - padding):min(w, x_max + padding)] if y_max > y_min and x_max > x_min else None
+        box = raw_box(landmarks_to_array(landmarks), w, h)
+        x_min, y_min, x_max, y_max = box
+        if not (y_max > y_min and x_max > x_min):
+            return None
+        x_min, y_min, x_max, y_max = pad_box(box, w, h, padding)
+        return frame[y_min:y_max, x_min:x_max]
 
     return (
         crop_landmarks(results.face_landmarks) if results.face_landmarks else None,
@@ -0,0 +1,193 @@
+import os
+import io
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# ==========================
+# 🔹 CONTENT-HASH RESULT CACHE
+# ==========================
+# Re-submitted clips (retries, "predict" pressed twice, demo videos) are
+# recognised by the hash of their bytes. Keys also include the model file
+# versions and pipeline parameters, so a new model or a different frame rate
+# never returns a stale answer.
+
+PIPELINE_VERSION = 1  # Bump when a pipeline change alters outputs, to invalidate on-disk entries
+
+_model_versions = {}
+_model_versions_lock = threading.Lock()
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Hex SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def model_version(path):
+    """Short content hash of a model file, recomputed only when its size or mtime changes."""
+    if not os.path.exists(path):
+        return "missing"
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime)
+    with _model_versions_lock:
+        cached = _model_versions.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+    version = file_sha256(path)[:16]
+    with _model_versions_lock:
+        _model_versions[path] = (signature, version)
+    return version
+
+def make_key(*parts):
+    """Combines key parts (video hash, task, parameters...) into one filesystem-safe key."""
+    return hashlib.sha256("|".join(str(part) for part in (PIPELINE_VERSION,) + parts).encode()).hexdigest()
+
+def _nbytes(value):
+    """Approximate memory used by a cached value (arrays are counted exactly)."""
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(json.dumps(value, default=str))
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count, total bytes and age (TTL), with an
+    optional on-disk tier. disk_format is "json" for result dicts or "npz" for
+    {name: array} dicts such as per-stream crop batches.
+    """
+
+    def __init__(self, name, max_entries=128, max_bytes=None, ttl_seconds=3600, disk_dir=None, disk_format="json"):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.disk_format = disk_format
+        self._entries = OrderedDict()  # key -> (stored_at, nbytes, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Returns the cached value or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry:
+                self._evict(key)
+
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._memory_put(key, value)
+        return value
+
+    def put(self, key, value):
+        self._memory_put(key, value)
+        self._disk_put(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    # ---------- memory tier ----------
+    def _memory_put(self, key, value):
+        nbytes = _nbytes(value)
+        if self.max_bytes and nbytes > self.max_bytes:
+            return  # Larger than the whole cache
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (time.time(), nbytes, value)
+            self._bytes += nbytes
+            while self._entries and (
+                len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                self._evict(next(iter(self._entries)))
+
+    def _evict(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    # ---------- disk tier ----------
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.{self.disk_format}")
+
+    def _disk_get(self, key, now):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if now - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            if self.disk_format == "npz":
+                with np.load(path) as data:
+                    return {name: data[name] for name in data.files}
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, key, value):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            if self.disk_format == "npz":
+                buffer = io.BytesIO()
+                np.savez(buffer, **value)
+                with open(tmp_path, "wb") as f:
+                    f.write(buffer.getvalue())
+            else:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(value, f)
+            os.replace(tmp_path, path)  # Readers never see a half-written file
+            self._disk_prune()
+        except OSError as e:
+            print(f"⚠️ Could not write {self.name} cache entry: {e}")
+
+    def _disk_prune(self):
+        """Keeps at most max_entries files on disk, oldest removed first."""
+        files = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir)
+                 if name.endswith(f".{self.disk_format}")]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1,13 +1,12 @@
 import os
-import shutil
-import subprocess
-import json
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 
-# Importing preprocessing functions
-from baara_preprocessing.feature_extract import extract_features
-from baara_preprocessing.frame import extract_sharpened_frames
-from baara_preprocessing.preprocessing_image import preprocess_images
+# Shared video → prediction pipeline
+import pipeline
+import model_loader
+import metrics
+from jobs import Job, JobQueue, QueueFullError
+from workspace import job_workspace, create_workspace, remove_workspace
 
 # Flask Blueprint for routes
 routes = Blueprint("routes", __name__)
@@ -16,88 +15,63 @@ routes = Blueprint("routes", __name__)
 # 🔹 BASE DIRECTORIES
 # ==========================
 BASE_PATH = "A:/Softwares/laragon/www/signnsync/interpretation/"
-FEATURE_PATH = os.path.join(BASE_PATH, "feature_extracted")
-FRAME_PATH = os.path.join(BASE_PATH, "frames")
-PREPROCESSED_PATH = os.path.join(BASE_PATH, "preprocessed")
-SCRIPT_PATH = "A:/Softwares/laragon/www/signnsync/flask_api/baara_preprocessing"
+JOBS_PATH = os.path.join(BASE_PATH, "jobs")  # One sub-folder per request, removed when it finishes
 
-# ==========================
-# 🔹 FUNCTION TO CLEAR OLD DATA
-# ==========================
-def clear_old_data():
-    """Deletes old extracted files before processing a new video."""
-    try:
-        for folder in [FEATURE_PATH, FRAME_PATH, PREPROCESSED_PATH]:
-            if os.path.exists(folder):
-                shutil.rmtree(folder)  # Delete old data
-            os.makedirs(folder, exist_ok=True)  # Recreate empty directories
-
-            for subfolder in ["face", "left_hand", "right_hand"]:
-                os.makedirs(os.path.join(folder, subfolder), exist_ok=True)
-    except Exception as e:
-        print(f"⚠️ Error clearing old data: {e}")
+# Keep the job folder (and save the 64x64 frames even when the pipeline runs in memory)
+DEBUG_ARTIFACTS = False
 
 # ==========================
-# 🔹 VIDEO PROCESSING FUNCTION
+# 🔹 JOB QUEUE CONFIGURATION
 # ==========================
-def process_video(video_path):
-    """Extracts features, frames, preprocesses images, and returns extracted file paths."""
-    try:
-        extract_features(video_path, FEATURE_PATH)
-
-        extracted_videos = {
-            "face": os.path.join(FEATURE_PATH, "face", "test_face.mp4"),
-            "left_hand": os.path.join(FEATURE_PATH, "left_hand", "test_left_hand.mp4"),
-            "right_hand": os.path.join(FEATURE_PATH, "right_hand", "test_right_hand.mp4"),
-        }
-
-        frame_paths = {}
-        for key, vid_path in extracted_videos.items():
-            if os.path.exists(vid_path):
-                frame_folder = os.path.join(FRAME_PATH, key)
-                extract_sharpened_frames(vid_path, frame_folder)
-                frame_paths[key] = frame_folder
-
-        preprocessed_paths = {}
-        for key, frame_folder in frame_paths.items():
-            if os.listdir(frame_folder):
-                output_folder = os.path.join(PREPROCESSED_PATH, key)
-                preprocess_images(frame_folder, output_folder)
-                preprocessed_paths[key] = output_folder
-
-        return preprocessed_paths
+MAX_JOB_WORKERS = 2         # Videos processed at the same time by /jobs
+MAX_PENDING_JOBS = 8        # Queued + running jobs before POST /jobs answers 429
+KEEP_FINISHED_JOBS = 3600   # Seconds a finished job's result stays available
 
-    except Exception as e:
-        return {"error": str(e)}
+job_queue = JobQueue(MAX_JOB_WORKERS, MAX_PENDING_JOBS, KEEP_FINISHED_JOBS)
+metrics.jobs_queued.set_function(lambda: job_queue.stats()["queued"])
+metrics.jobs_running.set_function(lambda: job_queue.stats()["running"])
+
+# Pipeline tasks behind each prediction type
+TASKS = {"emotion": ["emotion"], "sign": ["sign"], "both": ["emotion", "sign"]}
 
 # ==========================
-# 🔹 FUNCTION TO RUN PREDICTION SCRIPTS
+# 🔹 VIDEO PROCESSING FUNCTION
 # ==========================
-def run_prediction_script(script_name):
-    """Runs a prediction script and returns its JSON output."""
-    script_file = os.path.join(SCRIPT_PATH, script_name)
-    
-    if not os.path.exists(script_file):
-        return {"error": f"❌ Script {script_name} not found at {SCRIPT_PATH}"}
-
-    try:
-        result = subprocess.run(
-            ["python", script_file],
-            cwd=SCRIPT_PATH,  
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            return {"error": f"⚠️ Error in {script_name}: {result.stderr.strip()}"}
-
-        try:
-            return json.loads(result.stdout.strip())
-        except json.JSONDecodeError:
-            return {"error": f"⚠️ Invalid JSON output from {script_name}: {result.stdout.strip()}"}
-
-    except Exception as e:
-        return {"error": f"⚠️ Exception running {script_name}: {str(e)}"}
+def predict_video(workspace, tasks, frame_rate=pipeline.DEFAULT_FRAME_RATE, sign_input=None):
+    """Runs the shared pipeline on the job's uploaded video and returns ({task: prediction dict}, timings)."""
+    return pipeline.predict_video(
+        workspace["video"], tasks, workspace, debug_artifacts=DEBUG_ARTIFACTS, frame_rate=frame_rate,
+        sign_input=sign_input
+    )
+
+def format_result(task, results, timings=None):
+    """Shapes pipeline results into the JSON each /predict/<task> route returns."""
+    if task == "emotion":
+        return results["emotion"]
+    if task == "sign":
+        return results["sign"]
+    output = {
+        "emotion_prediction_output": results["emotion"],
+        "sign_prediction_output": results["sign"]
+    }
+    if timings is not None:
+        output["timings"] = timings  # Per-stage seconds for the shared single-pass run
+    return output
+
+def get_frame_rate():
+    """Optional "frame_rate" form field: frames scored per second of video. Returns None if invalid."""
+    frame_rate = request.form.get("frame_rate", pipeline.DEFAULT_FRAME_RATE, type=int)
+    return frame_rate if frame_rate and frame_rate > 0 else None
+
+def available_sign_inputs():
+    """SIGN_INPUTS this server can serve: "landmark" needs the sign_landmarks model enabled and its weights on disk."""
+    return [sign_input for sign_input in pipeline.SIGN_INPUTS
+            if sign_input != "landmark" or model_loader.model_available("sign_landmarks")]
+
+def get_sign_input():
+    """Optional "sign_input" form field: "pixel" (hand crops) or "landmark" (hand landmarks). Returns None if invalid or unavailable."""
+    sign_input = request.form.get("sign_input", pipeline.SIGN_INPUT)
+    return sign_input if sign_input in available_sign_inputs() else None
 
 # ==========================
 # 🔹 EMOTION DETECTION ROUTE
@@ -108,19 +82,22 @@ def predict_emotion_route():
         if "video" not in request.files:
             return jsonify({"error": "❌ No video file received"}), 400
 
-        clear_old_data()
+        frame_rate = get_frame_rate()
+        if frame_rate is None:
+            return jsonify({"error": "❌ frame_rate must be a positive integer"}), 400
 
-        video_file = request.files["video"]
-        test_path = os.path.join(BASE_PATH, "test.mp4")
-        video_file.save(test_path)
+        with job_workspace(JOBS_PATH, keep=DEBUG_ARTIFACTS) as workspace:
+            video_file = request.files["video"]
+            video_file.save(workspace["video"])
 
-        if not os.path.exists(test_path):
-            return jsonify({"error": "❌ Failed to save uploaded video"}), 500
+            if not os.path.exists(workspace["video"]):
+                return jsonify({"error": "❌ Failed to save uploaded video"}), 500
+            metrics.upload_bytes.observe(os.path.getsize(workspace["video"]), endpoint=request.path)
 
-        process_video(test_path)
-        emotion_result = run_prediction_script("emotion_prediction.py")
+            results, _ = predict_video(workspace, TASKS["emotion"], frame_rate)
+            result = format_result("emotion", results)
 
-        return jsonify(emotion_result)
+        return jsonify(result)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -134,19 +111,26 @@ def predict_sign_route():
         if "video" not in request.files:
             return jsonify({"error": "❌ No video file received"}), 400
 
-        clear_old_data()
+        frame_rate = get_frame_rate()
+        if frame_rate is None:
+            return jsonify({"error": "❌ frame_rate must be a positive integer"}), 400
 
-        video_file = request.files["video"]
-        test_path = os.path.join(BASE_PATH, "test.mp4")
-        video_file.save(test_path)
+        sign_input = get_sign_input()
+        if sign_input is None:
+            return jsonify({"error": f"❌ sign_input must be one of {available_sign_inputs()} on this server"}), 400
 
-        if not os.path.exists(test_path):
-            return jsonify({"error": "❌ Failed to save uploaded video"}), 500
+        with job_workspace(JOBS_PATH, keep=DEBUG_ARTIFACTS) as workspace:
+            video_file = request.files["video"]
+            video_file.save(workspace["video"])
 
-        process_video(test_path)
-        sign_result = run_prediction_script("sign_prediction.py")
+            if not os.path.exists(workspace["video"]):
+                return jsonify({"error": "❌ Failed to save uploaded video"}), 500
+            metrics.upload_bytes.observe(os.path.getsize(workspace["video"]), endpoint=request.path)
 
-        return jsonify(sign_result)
+            results, _ = predict_video(workspace, TASKS["sign"], frame_rate, sign_input)
+            result = format_result("sign", results)
+
+        return jsonify(result)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -160,25 +144,133 @@ def predict_both_route():
         if "video" not in request.files:
             return jsonify({"error": "❌ No video file received"}), 400
 
-        clear_old_data()
+        frame_rate = get_frame_rate()
+        if frame_rate is None:
+            return jsonify({"error": "❌ frame_rate must be a positive integer"}), 400
+
+        sign_input = get_sign_input()
+        if sign_input is None:
+            return jsonify({"error": f"❌ sign_input must be one of {available_sign_inputs()} on this server"}), 400
 
-        video_file = request.files["video"]
-        test_path = os.path.join(BASE_PATH, "test.mp4")
-        video_file.save(test_path)
+        with job_workspace(JOBS_PATH, keep=DEBUG_ARTIFACTS) as workspace:
+            video_file = request.files["video"]
+            video_file.save(workspace["video"])
 
-        if not os.path.exists(test_path):
-            return jsonify({"error": "❌ Failed to save uploaded video"}), 500
+            if not os.path.exists(workspace["video"]):
+                return jsonify({"error": "❌ Failed to save uploaded video"}), 500
+            metrics.upload_bytes.observe(os.path.getsize(workspace["video"]), endpoint=request.path)
 
-        process_video(test_path)
+            # One decode shared by both models, whose inference runs concurrently
+            results, timings = predict_video(workspace, TASKS["both"], frame_rate, sign_input)
+            result = format_result("both", results, timings)
 
-        # Run both predictions
-        emotion_result = run_prediction_script("emotion_prediction.py")
-        sign_result = run_prediction_script("sign_prediction.py")
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+# ==========================
+# 🔹 ASYNCHRONOUS JOB ROUTES
+# ==========================
+def run_job(job):
+    """Worker: runs the pipeline for a queued job and returns the same JSON as /predict/<task>."""
+    workspace = job.params["workspace"]
+    results, timings = pipeline.predict_video(
+        workspace["video"], TASKS[job.task], workspace, debug_artifacts=DEBUG_ARTIFACTS,
+        frame_rate=job.params["frame_rate"], progress=job.update_stage, sign_input=job.params["sign_input"]
+    )
+    return format_result(job.task, results, timings)
+
+def cleanup_job(job):
+    if not DEBUG_ARTIFACTS:
+        remove_workspace(job.params["workspace"])
+
+@routes.route("/jobs", methods=["POST"])
+def submit_job_route():
+    try:
+        if "video" not in request.files:
+            return jsonify({"error": "❌ No video file received"}), 400
+
+        task = request.form.get("task", "both")
+        if task not in TASKS:
+            return jsonify({"error": f"❌ task must be one of {list(TASKS)}"}), 400
+
+        frame_rate = get_frame_rate()
+        if frame_rate is None:
+            return jsonify({"error": "❌ frame_rate must be a positive integer"}), 400
+
+        sign_input = get_sign_input()
+        if sign_input is None:
+            return jsonify({"error": f"❌ sign_input must be one of {available_sign_inputs()} on this server"}), 400
+
+        workspace = create_workspace(JOBS_PATH)
+        # Until the queue owns the job (and cleanup_job removes its folder), every failure removes it here
+        try:
+            request.files["video"].save(workspace["video"])
+            metrics.upload_bytes.observe(os.path.getsize(workspace["video"]), endpoint=request.path)
+
+            job = Job(workspace["job_id"], task, {"workspace": workspace, "frame_rate": frame_rate, "sign_input": sign_input})
+            job_queue.submit(job, run_job, on_finish=cleanup_job)
+        except QueueFullError as e:
+            remove_workspace(workspace)
+            response = jsonify({"error": f"⚠️ {e}. Try again later.", **job_queue.stats()})
+            response.headers["Retry-After"] = "5"
+            return response, 429
+        except Exception as e:
+            remove_workspace(workspace)
+            return jsonify({"error": str(e)}), 500
 
         return jsonify({
-            "emotion_prediction_output": emotion_result,
-            "sign_prediction_output": sign_result
-        })
+            "job_id": job.job_id,
+            "status": job.status,
+            "status_url": f"/jobs/{job.job_id}",
+            "result_url": f"/jobs/{job.job_id}/result"
+        }), 202
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@routes.route("/jobs/<job_id>", methods=["GET"])
+def job_status_route(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "❌ Unknown job ID"}), 404
+    return jsonify(job.to_dict())
+
+@routes.route("/jobs/<job_id>/result", methods=["GET"])
+def job_result_route(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "❌ Unknown job ID"}), 404
+    if job.status == "failed":
+        return jsonify({"error": job.error}), 500
+    if job.status != "done":
+        return jsonify(job.to_dict()), 202
+    return jsonify(job.result)
+
+@routes.route("/jobs", methods=["GET"])
+def job_queue_route():
+    """Queue depth and limits."""
+    return jsonify(job_queue.stats())
+
+# ==========================
+# 🔹 RESULT CACHE STATS ROUTE
+# ==========================
+@routes.route("/cache/stats", methods=["GET"])
+def cache_stats_route():
+    return jsonify(pipeline.cache_stats())
+
+# ==========================
+# 🔹 MODEL REGISTRY STATS ROUTE
+# ==========================
+@routes.route("/models", methods=["GET"])
+def models_route():
+    """Which models are loaded, their load/warm-up time and memory."""
+    return jsonify(model_loader.model_stats())
+
+# ==========================
+# 🔹 PROMETHEUS METRICS ROUTE
+# ==========================
+@routes.route("/metrics", methods=["GET"])
+def metrics_route():
+    """Per-stage latency histograms, frame/detection counters, queue depth and in-flight requests."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
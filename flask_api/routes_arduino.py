@@ -1,15 +1,12 @@
 import os
-import shutil
-import subprocess
-import json
-import serial
-import time
+import threading
 from flask import Blueprint, request, jsonify
 
-# Importing preprocessing functions
-from baara_preprocessing.feature_extract import extract_features
-from baara_preprocessing.frame import extract_sharpened_frames
-from baara_preprocessing.preprocessing_image import preprocess_images
+# Shared video → prediction pipeline
+import pipeline
+from workspace import job_workspace
+from incremental_capture import IncrementalCapture
+from serial_manager import SerialManager
 
 # Flask Blueprint for routes
 routes = Blueprint("routes", __name__)
@@ -18,97 +15,86 @@ routes = Blueprint("routes", __name__)
 # 🔹 BASE DIRECTORIES
 # ==========================
 BASE_PATH = "A:/Softwares/laragon/www/signnsync/interpretation/"
-FEATURE_PATH = os.path.join(BASE_PATH, "feature_extracted")
-FRAME_PATH = os.path.join(BASE_PATH, "frames")
-PREPROCESSED_PATH = os.path.join(BASE_PATH, "preprocessed")
-SCRIPT_PATH = "A:/Softwares/laragon/www/signnsync/flask_api/baara_preprocessing"
+JOBS_PATH = os.path.join(BASE_PATH, "jobs")  # One sub-folder per recording, removed when it finishes
 VIDEO_PATH = os.path.join(BASE_PATH, "test.mp4")
 
+# Keep the job folder (and save the 64x64 frames even when the pipeline runs in memory)
+DEBUG_ARTIFACTS = False
+
+# ==========================
+# 🔹 CAPTURE MODE
+# ==========================
+# "incremental": score frames in the background while recording, /arduino/stop only finalizes the vote
+# "batch":       process the whole recording after /arduino/stop
+CAPTURE_MODE = "incremental"
+CAPTURE_SOURCE = None  # None = follow the file at VIDEO_PATH, or a camera index (e.g. 0) to read frames directly
+
+_capture = None
+_capture_lock = threading.Lock()
+
 # ==========================
 # 🔹 ARDUINO SERIAL CONFIGURATION
 # ==========================
 SERIAL_PORT = "COM3"  # Change this to match your Arduino port
 BAUD_RATE = 9600
 
-def send_to_arduino(command):
-    try:
-        with serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1) as ser:
-            ser.write(f"{command}\n".encode())
-            time.sleep(1)
-    except Exception as e:
-        print(f"⚠️ Error communicating with Arduino: {e}")
+_serial = None
+_serial_lock = threading.Lock()
 
-# ==========================
-# 🔹 FUNCTION TO CLEAR OLD DATA
-# ==========================
-def clear_old_data():
-    """Deletes old extracted files before processing a new video."""
-    try:
-        for folder in [FEATURE_PATH, FRAME_PATH, PREPROCESSED_PATH]:
-            if os.path.exists(folder):
-                shutil.rmtree(folder)
-            os.makedirs(folder, exist_ok=True)
-            for subfolder in ["face", "left_hand", "right_hand"]:
-                os.makedirs(os.path.join(folder, subfolder), exist_ok=True)
-        print("✅ Old data cleared successfully.")
-    except Exception as e:
-        print(f"⚠️ Error clearing old data: {e}")
+def get_serial():
+    """The shared SerialManager, created (and the port opened) on first use."""
+    global _serial
+    with _serial_lock:
+        if _serial is None:
+            _serial = SerialManager(SERIAL_PORT, BAUD_RATE)
+        return _serial
+
+def send_to_arduino(command):
+    """Sends a command over the persistent connection and returns the result dict (errors are logged, not raised)."""
+    result = get_serial().send(command)
+    if not result["ok"]:
+        print(f"⚠️ Arduino {command}: {result['error']}")
+    return result
 
 # ==========================
 # 🔹 VIDEO PROCESSING FUNCTION
 # ==========================
 def process_video():
-    """Extracts features, frames, preprocesses images, and returns extracted file paths."""
+    """Runs the shared pipeline on the recorded video and returns {"emotion": ..., "sign": ...} predictions."""
     try:
-        extract_features(VIDEO_PATH, FEATURE_PATH)
-       
-        extracted_videos = {
-            "face": os.path.join(FEATURE_PATH, "face", "test_face.mp4"),
-            "left_hand": os.path.join(FEATURE_PATH, "left_hand", "test_left_hand.mp4"),
-            "right_hand": os.path.join(FEATURE_PATH, "right_hand", "test_right_hand.mp4"),
-        }
-       
-        frame_paths = {}
-        for key, vid_path in extracted_videos.items():
-            if os.path.exists(vid_path):
-                frame_folder = os.path.join(FRAME_PATH, key)
-                extract_sharpened_frames(vid_path, frame_folder)
-                frame_paths[key] = frame_folder
-
-        preprocessed_paths = {}
-        for key, frame_folder in frame_paths.items():
-            if os.listdir(frame_folder):
-                output_folder = os.path.join(PREPROCESSED_PATH, key)
-                preprocess_images(frame_folder, output_folder)
-                preprocessed_paths[key] = output_folder
-
+        with job_workspace(JOBS_PATH, keep=DEBUG_ARTIFACTS) as workspace:
+            results, _ = pipeline.predict_video(
+                VIDEO_PATH, ["emotion", "sign"], workspace, debug_artifacts=DEBUG_ARTIFACTS
+            )
         print("✅ Video processing completed successfully.")
-        return preprocessed_paths
+        return results
     except Exception as e:
         print(f"⚠️ Error processing video: {e}")
         return {"error": str(e)}
 
-# ==========================
-# 🔹 FUNCTION TO RUN PREDICTION SCRIPTS
-# ==========================
-def run_prediction_script(script_name):
-    """Runs a prediction script and returns its JSON output."""
-    script_file = os.path.join(SCRIPT_PATH, script_name)
-   
-    if not os.path.exists(script_file):
-        return {"error": f"❌ Script {script_name} not found at {SCRIPT_PATH}"}
-   
-    try:
-        result = subprocess.run([
-            "python", script_file
-        ], cwd=SCRIPT_PATH, capture_output=True, text=True)
+def start_capture():
+    """Starts background processing of the new recording (incremental mode only)."""
+    global _capture
+    if CAPTURE_MODE != "incremental":
+        return
+    with _capture_lock:
+        if _capture is not None:
+            _capture.finish()  # A previous recording was never stopped
+        _capture = IncrementalCapture(CAPTURE_SOURCE if CAPTURE_SOURCE is not None else VIDEO_PATH)
 
-        if result.returncode != 0:
-            return {"error": f"⚠️ Error in {script_name}: {result.stderr.strip()}"}
+def finish_capture():
+    """Returns the incremental results, or None when the recording has to be processed as a batch."""
+    global _capture
+    with _capture_lock:
+        capture, _capture = _capture, None
+    if capture is None:
+        return None
 
-        return json.loads(result.stdout.strip())
-    except Exception as e:
-        return {"error": f"⚠️ Exception running {script_name}: {str(e)}"}
+    results = capture.finish()
+    if "error" in results and CAPTURE_SOURCE is None:
+        print(f"⚠️ Incremental capture gave no result ({results['error']}), processing the whole video instead.")
+        return None
+    return results
 
 # ==========================
 # 🔹 ARDUINO START RECORDING ROUTE
@@ -116,7 +102,8 @@ def run_prediction_script(script_name):
 @routes.route("/arduino/start", methods=["POST"])
 def arduino_start():
     try:
-        clear_old_data()
+        # Before START, so the previous recording's file is told apart from the one about to be written
+        start_capture()
         send_to_arduino("START")
         return jsonify({"message": "✅ Recording started."})
     except Exception as e:
@@ -129,14 +116,18 @@ def arduino_start():
 def arduino_stop():
     try:
         send_to_arduino("STOP")
-       
-        if not os.path.exists(VIDEO_PATH):
-            return jsonify({"error": "❌ No recorded video found."}), 500
-       
-        process_video()
-       
-        emotion_result = run_prediction_script("emotion_prediction.py")
-        sign_result = run_prediction_script("sign_prediction.py")
+
+        results = finish_capture()
+        if results is None:
+            if not os.path.exists(VIDEO_PATH):
+                return jsonify({"error": "❌ No recorded video found."}), 500
+            results = process_video()
+
+        if "error" in results:
+            return jsonify(results), 500
+
+        emotion_result = results["emotion"]
+        sign_result = results["sign"]
        
         return jsonify({
             "emotion": emotion_result.get("emotion", "No face detected"),
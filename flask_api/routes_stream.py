@@ -0,0 +1,65 @@
+import json
+from flask import request
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
+
+import streaming
+import metrics
+
+# WebSocket routes, attached to the app with sock.init_app(app)
+sock = Sock()
+metrics.active_streams.set_function(streaming.active_stream_count)
+
+TASKS = {"emotion": ["emotion"], "sign": ["sign"], "both": ["emotion", "sign"]}
+
+# ==========================
+# 🔹 LIVE STREAM ROUTE
+# ==========================
+@sock.route("/stream")
+def stream_route(ws):
+    """
+    ws://<host>/stream?task=both&window=15&emit_every=5
+
+    The client sends each webcam frame as a binary message (JPEG or PNG bytes) and
+    receives JSON text messages with rolling predictions over the last `window` frames.
+    Sending the text message "end" (or closing the socket) ends the session.
+    """
+    task = request.args.get("task", "both")
+    if task not in TASKS:
+        ws.send(json.dumps({"error": f"❌ Unknown task '{task}', expected one of {sorted(TASKS)}"}))
+        return
+
+    if not streaming.open_stream_slot():
+        ws.send(json.dumps({"error": "❌ Too many live streams, try again later."}))
+        return
+
+    def send(message):
+        try:
+            ws.send(json.dumps(message))
+        except ConnectionClosed:
+            pass  # Client went away, the receive loop below ends the session
+
+    session = streaming.StreamSession(
+        TASKS[task],
+        send,
+        window_frames=request.args.get("window", streaming.STREAM_WINDOW_FRAMES, type=int),
+        emit_every=request.args.get("emit_every", streaming.STREAM_EMIT_EVERY, type=int),
+    )
+    try:
+        while True:
+            data = ws.receive()
+            if isinstance(data, str):
+                if data.strip() == "end":
+                    break
+                continue  # No other text commands
+            if session.closed:
+                break  # The worker hit an error (already sent to the client)
+            session.push(data)
+    except ConnectionClosed:
+        pass
+    finally:
+        session.close()
+        streaming.release_stream_slot()
+
+    print(f"🔌 Stream closed: {session.stats()}")
+    send({"done": True, **session.stats()})
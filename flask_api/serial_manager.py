@@ -0,0 +1,149 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+import serial
+
+# ==========================
+# 🔹 PERSISTENT SERIAL CONNECTION
+# ==========================
+# Opening the port resets most Arduino boards, so the connection is opened
+# once and kept. A single writer thread owns the port: commands are queued,
+# written in order and, with EXPECT_ACK, each one waits for the board's reply
+# line (with a timeout) instead of a fixed sleep. A dropped connection (unplugged cable,
+# board reset) is reopened on the next command.
+
+ACK_TIMEOUT = 1.0      # Seconds to wait for the reply line after a command
+EXPECT_ACK = False     # The current sketch doesn't answer commands; True for firmware that replies with a line
+BOOT_TIMEOUT = 2.0     # After opening, wait up to this long for the board's first line (boot message)
+RECONNECT_DELAY = 1.0  # Pause before reopening a port that failed
+SEND_TIMEOUT = 10.0    # send(): longest a request waits for its command (queue + reconnect + boot + ack)
+READ_TIMEOUT = 0.05    # pyserial read timeout, keeps the writer thread responsive
+
+class SerialManager:
+    """
+    Long-lived connection to the board. send() queues a command and (by default) waits
+    for its result: {"command", "ok", "reply", "seconds"} or {"command", "ok": False, "error"}.
+    serial_factory builds the port (serial.Serial by default), so a pty stand-in can be used.
+    """
+
+    def __init__(self, port, baud_rate, ack_timeout=ACK_TIMEOUT, expect_ack=EXPECT_ACK, serial_factory=serial.Serial):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.ack_timeout = ack_timeout
+        self.expect_ack = expect_ack
+        self.serial_factory = serial_factory
+
+        self.ser = None
+        self.commands = queue.Queue()
+        self.stats = {"sent": 0, "acked": 0, "timeouts": 0, "errors": 0, "connects": 0}
+
+        self.writer = threading.Thread(target=self._run, name="serial-writer", daemon=True)
+        self.writer.start()
+
+    # ==========================
+    # 🔹 Public API
+    # ==========================
+    def send(self, command, wait=True, timeout=SEND_TIMEOUT):
+        """Queues command. With wait=True blocks until the board answered (or the ack or timeout ran out)."""
+        future = Future()
+        self.commands.put((command, future))
+        if not wait:
+            return future
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            return {"command": command, "ok": False, "error": "⏳ Serial writer is busy."}
+
+    def close(self):
+        """Stops the writer thread and closes the port."""
+        self.commands.put(None)
+        self.writer.join()
+
+    # ==========================
+    # 🔹 Writer thread
+    # ==========================
+    def _connect(self):
+        self.ser = self.serial_factory(self.port, self.baud_rate, timeout=READ_TIMEOUT)
+        self.stats["connects"] += 1
+        print(f"🔌 Serial port {self.port} opened.")
+
+        # The board usually resets on open and prints a line once it is ready
+        boot_line = self._read_line(BOOT_TIMEOUT)
+        if boot_line:
+            print(f"🔌 Board ready: {boot_line}")
+        self.ser.reset_input_buffer()
+
+    def _disconnect(self):
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            except Exception:
+                pass
+        self.ser = None
+
+    def _read_line(self, timeout):
+        """Next non-empty line from the board, None on timeout."""
+        deadline = time.perf_counter() + timeout
+        buffer = b""
+        while time.perf_counter() < deadline:
+            buffer += self.ser.readline()
+            if buffer.endswith(b"\n"):
+                line = buffer.decode(errors="replace").strip()
+                if line:
+                    return line
+                buffer = b""
+        return None
+
+    def _write(self, command):
+        """Writes one command (connecting first if needed) and returns the reply line or None."""
+        if self.ser is None:
+            self._connect()
+        self.ser.reset_input_buffer()  # Drop stale output so the reply belongs to this command
+        self.ser.write(f"{command}\n".encode())
+        self.ser.flush()
+        return self._read_line(self.ack_timeout) if self.expect_ack else None
+
+    def _run(self):
+        # Open the port right away so the board's reset happens before the first request
+        try:
+            self._connect()
+        except Exception as e:
+            self._disconnect()
+            print(f"⚠️ Serial port {self.port} not available yet: {e}")
+
+        while True:
+            item = self.commands.get()
+            if item is None:
+                break
+            command, future = item
+
+            start = time.perf_counter()
+            for attempt in range(2):  # One reconnect per command
+                try:
+                    reply = self._write(command)
+                    self.stats["sent"] += 1
+                    if self.expect_ack and reply is None:
+                        self.stats["timeouts"] += 1
+                        result = {"command": command, "ok": False, "error": f"⏳ No reply within {self.ack_timeout}s."}
+                    else:
+                        self.stats["acked"] += self.expect_ack
+                        result = {"command": command, "ok": True, "reply": reply}
+                    break
+                except (serial.SerialException, OSError) as e:
+                    self._disconnect()
+                    self.stats["errors"] += 1
+                    result = {"command": command, "ok": False, "error": f"⚠️ Error communicating with Arduino: {e}"}
+                    if attempt == 0:
+                        time.sleep(RECONNECT_DELAY)
+                except Exception as e:
+                    # Anything else isn't worth a reconnect, but must not kill the thread with futures pending
+                    self._disconnect()
+                    self.stats["errors"] += 1
+                    result = {"command": command, "ok": False, "error": f"⚠️ Error communicating with Arduino: {e}"}
+                    break
+
+            result["seconds"] = time.perf_counter() - start
+            future.set_result(result)
+
+        self._disconnect()
@@ -0,0 +1,85 @@
+import time
+
+# ==========================
+# 🔹 STAGE GRAPH
+# ==========================
+# One job's pipeline as declared stages (decode + landmark crop, sharpen/sample,
+# resize, predict). A stage names the stages it needs and receives their
+# outputs as arguments; run() executes every stage exactly once, in dependency
+# order, in this process, and records its wall time. Stages that are ready at
+# the same time (e.g. the emotion and sign models) can share an executor.
+#
+# Stages must be declared after the stages they need, so a graph can never
+# contain a cycle.
+
+class Stage:
+    def __init__(self, name, fn, needs=()):
+        self.name = name
+        self.fn = fn
+        self.needs = tuple(needs)
+        self.runs = 0
+
+class StageGraph:
+    """Declared stages of one job. Build a new graph per job; run() may only be called once."""
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+        self.outputs = {}
+        self.timings = {}
+
+    def add(self, name, fn, needs=()):
+        """Declares stage name: fn(*outputs of needs) runs once all of needs are done."""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already declared in {self.name}")
+        missing = [need for need in needs if need not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' needs undeclared stage(s) {missing} in {self.name}")
+        self.stages[name] = Stage(name, fn, needs)
+        return self
+
+    def _run_stage(self, stage, progress):
+        if stage.runs:
+            raise RuntimeError(f"Stage '{stage.name}' already ran in {self.name}")
+        stage.runs += 1
+
+        if progress:
+            progress(stage.name, "running", None)
+        start = time.perf_counter()
+        output = stage.fn(*(self.outputs[need] for need in stage.needs))
+        seconds = time.perf_counter() - start
+        if progress:
+            progress(stage.name, "done", seconds)
+        return output, seconds
+
+    def run(self, progress=None, executor=None):
+        """
+        Runs every stage once. progress(stage, state, seconds) is called with "running"/"done";
+        with an executor, stages that become ready together run concurrently on it.
+        Returns ({stage: output}, {stage: seconds}).
+        """
+        if self.timings:
+            raise RuntimeError(f"{self.name} already ran")
+
+        remaining = list(self.stages.values())
+        while remaining:
+            ready = [stage for stage in remaining if all(need in self.outputs for need in stage.needs)]
+            if executor and len(ready) > 1:
+                futures = {stage.name: executor.submit(self._run_stage, stage, progress) for stage in ready}
+                finished = {name: future.result() for name, future in futures.items()}
+            else:
+                finished = {stage.name: self._run_stage(stage, progress) for stage in ready}
+
+            for name, (output, seconds) in finished.items():
+                self.outputs[name] = output
+                self.timings[name] = seconds
+            remaining = [stage for stage in remaining if stage.name not in self.outputs]
+
+        self.log()
+        return self.outputs, self.timings
+
+    def log(self):
+        """One line with every stage's wall time and run count."""
+        print(f"🧩 Stage graph {self.name}: " + ", ".join(
+            f"{name}={self.timings[name]:.3f}s x{stage.runs}" for name, stage in self.stages.items()
+        ))
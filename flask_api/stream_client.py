@@ -0,0 +1,81 @@
+"""
+Replays an mp4 file against the /stream WebSocket endpoint as if it came from
+a webcam, and prints the rolling predictions as they arrive.
+
+Run from the flask_api folder while app.py is serving:
+    python stream_client.py path/to/video.mp4 --task both --fps 5
+"""
+import json
+import time
+import argparse
+import threading
+import cv2
+from simple_websocket import Client, ConnectionClosed
+
+def receive_loop(ws, done):
+    """Prints every message from the server until it reports the session is done."""
+    try:
+        while True:
+            message = json.loads(ws.receive())
+            if "error" in message:
+                print(f"❌ {message}")
+            elif message.get("done"):
+                print(f"✅ Session stats: {message}")
+                break
+            else:
+                predictions = {k: v for k, v in message.items() if k.endswith("_prediction")}
+                print(f"🔹 frame {message['frame']:5d} | {predictions} | latency {message['latency_ms']:6.1f} ms "
+                      f"| dropped {message['dropped']}")
+    except ConnectionClosed:
+        pass
+    done.set()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--url", default="ws://127.0.0.1:5000/stream")
+    parser.add_argument("--task", default="both", choices=["emotion", "sign", "both"])
+    parser.add_argument("--fps", type=float, default=5, help="Frames sent per second of video")
+    parser.add_argument("--window", type=int, default=None, help="Sliding window in frames (server default if unset)")
+    parser.add_argument("--no-pacing", action="store_true", help="Send as fast as possible (stress test frame dropping)")
+    args = parser.parse_args()
+
+    url = f"{args.url}?task={args.task}" + (f"&window={args.window}" if args.window else "")
+    ws = Client.connect(url)
+    done = threading.Event()
+    threading.Thread(target=receive_loop, args=(ws, done), daemon=True).start()
+
+    cap = cv2.VideoCapture(args.video)
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    interval = max(1, int(source_fps / args.fps))
+    sent = 0
+    start = time.perf_counter()
+
+    frame_index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_index % interval == 0:
+            ok, encoded = cv2.imencode(".jpg", frame)
+            if ok:
+                ws.send(encoded.tobytes())
+                sent += 1
+            if not args.no_pacing:
+                # Send at the pace the camera would have produced the frame
+                delay = frame_index / source_fps - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+        frame_index += 1
+    cap.release()
+
+    print(f"📤 Sent {sent} frames in {time.perf_counter() - start:.1f}s")
+    ws.send("end")
+    done.wait(timeout=30)
+    try:
+        ws.close()
+    except ConnectionClosed:
+        pass  # Server already closed the socket
+
+if __name__ == "__main__":
+    main()
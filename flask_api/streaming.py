@@ -0,0 +1,211 @@
+import time
+import threading
+from collections import Counter, deque
+import cv2
+import numpy as np
+import mediapipe as mp
+
+import model_loader
+from baara_preprocessing import feature_extract
+from baara_preprocessing.feature_extract import track_features
+from baara_preprocessing.landmark_detector import LandmarkDetector
+from baara_preprocessing.image_ops import sharpen_frame, resize_frame, to_model_input
+from baara_preprocessing.emotion_prediction import CLASS_LABELS as EMOTION_LABELS
+from baara_preprocessing.sign_prediction import combine_hands
+
+# ==========================
+# 🔹 LIVE STREAM RECOGNITION
+# ==========================
+# The webcam sends encoded frames (JPEG/PNG bytes) one by one. Each connection
+# gets a StreamSession: a worker thread crops the newest frames with its own
+# Holistic instance, runs both models on them and votes over a sliding window
+# of the last per-frame classes instead of the whole clip.
+#
+# The frame buffer is bounded. When inference falls behind, the oldest
+# buffered frames are dropped, so predictions describe what the camera shows
+# now instead of lagging further and further behind.
+
+STREAM_WINDOW_FRAMES = 15      # Per-frame classes the rolling vote covers (3s at 5 frames/sec)
+STREAM_EMIT_EVERY = 5          # Send a prediction after every n processed frames
+STREAM_MAX_BUFFERED_FRAMES = 4 # Frames waiting for the worker before the oldest are dropped
+MAX_STREAMS = 4                # Concurrent connections (each holds a Holistic graph)
+
+_active_streams = 0
+_streams_lock = threading.Lock()
+
+def open_stream_slot():
+    """Reserves one of MAX_STREAMS connections. Returns False if the server is full."""
+    global _active_streams
+    with _streams_lock:
+        if _active_streams >= MAX_STREAMS:
+            return False
+        _active_streams += 1
+        return True
+
+def release_stream_slot():
+    global _active_streams
+    with _streams_lock:
+        _active_streams -= 1
+
+def active_stream_count():
+    return _active_streams
+
+def window_vote(preds):
+    """(majority class, share of the window that voted for it), (None, 0.0) for an empty window."""
+    if not preds:
+        return None, 0.0
+    cls, count = Counter(preds).most_common(1)[0]
+    return cls, count / len(preds)
+
+class StreamSession:
+    """
+    One live connection. push() is called with each encoded frame as it arrives,
+    send(message_dict) is called from the worker thread with every rolling prediction.
+    """
+
+    def __init__(self, tasks, send, window_frames=STREAM_WINDOW_FRAMES, emit_every=STREAM_EMIT_EVERY,
+                 max_buffered=STREAM_MAX_BUFFERED_FRAMES):
+        self.tasks = list(tasks)
+        self.send = send
+        self.emit_every = max(1, emit_every)
+        self.windows = {stream: deque(maxlen=max(1, window_frames)) for stream in ("face", "left_hand", "right_hand")}
+
+        self.buffer = deque(maxlen=max(1, max_buffered))
+        self.condition = threading.Condition()
+        self.closed = False
+
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+
+        self.worker = threading.Thread(target=self._run, name="stream-session", daemon=True)
+        self.worker.start()
+
+    def push(self, data):
+        """Queues one encoded frame. If the buffer is full the oldest frame is dropped (and every frame once the session is closed)."""
+        with self.condition:
+            if self.closed:
+                self.dropped += 1
+                return
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append((self.received, time.perf_counter(), data))
+            self.received += 1
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.worker.join()
+        self.dropped += len(self.buffer)  # Frames still waiting when the client hung up
+        self.buffer.clear()
+
+    def stats(self):
+        return {"received": self.received, "processed": self.processed, "dropped": self.dropped, "errors": self.errors}
+
+    # ==========================
+    # 🔹 Worker thread
+    # ==========================
+    def _next_frame(self):
+        with self.condition:
+            while not self.buffer and not self.closed:
+                self.condition.wait()
+            if self.closed:
+                return None
+            return self.buffer.popleft()
+
+    def _run(self):
+        """Worker body. Any exception (model load, Holistic start-up, a frame) is sent to the client and ends the
+        session; otherwise the worker would die silently while the client keeps streaming into a full buffer."""
+        try:
+            self._process_frames()
+        except Exception as e:
+            self.errors += 1
+            self.send({"error": f"⚠️ Stream error: {str(e)}"})
+            self._stop()
+
+    def _process_frames(self):
+        models = {task: model_loader.get_model(task) for task in self.tasks}
+
+        last_frames = None
+        mp_holistic = mp.solutions.holistic
+        with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic, \
+                LandmarkDetector(holistic) as detector:
+            while True:
+                item = self._next_frame()
+                if item is None:
+                    break
+                frame_number, received_at, data = item
+
+                frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if frame is None:
+                    self.errors += 1
+                    self.send({"frame": frame_number, "error": "❌ Could not decode frame."})
+                    continue
+
+                height, width = frame.shape[:2]
+                if last_frames is None or last_frames["face"].shape[:2] != (height, width):
+                    blank_frame = np.zeros((height, width, 3), dtype=np.uint8)
+                    last_frames = {"face": blank_frame, "right_hand": blank_frame, "left_hand": blank_frame}
+
+                crops, detected = track_features(frame, detector, last_frames, width, height)
+                self._score(models, crops, detected)
+                self.processed += 1
+
+                if self.processed % self.emit_every == 0:
+                    message = self._prediction()
+                    message.update({
+                        "frame": frame_number,
+                        "detected": detected,
+                        "latency_ms": (time.perf_counter() - received_at) * 1000,
+                        **self.stats(),
+                    })
+                    self.send(message)
+
+    def _stop(self):
+        """Ends the session from the worker: push() ignores further frames and the route stops receiving."""
+        with self.condition:
+            self.closed = True
+            self.dropped += len(self.buffer)
+            self.buffer.clear()
+
+    def _score(self, models, crops, detected):
+        """
+        Adds this frame's class per stream to the sliding windows (same preprocessing as the clip pipeline).
+        Streams that weren't detected in this frame (filler crops) are skipped, like in the clip pipeline.
+        """
+        streams = (["face"] if "emotion" in models else []) + (["left_hand", "right_hand"] if "sign" in models else [])
+        if feature_extract.SKIP_FILLER_FRAMES:
+            streams = [stream for stream in streams if detected[stream]]
+        inputs = {stream: to_model_input([resize_frame(sharpen_frame(crops[stream]))]) for stream in streams}
+
+        if "face" in inputs:
+            probs = np.asarray(models["emotion"].predict_on_batch(inputs["face"]))
+            self.windows["face"].append(int(np.argmax(probs[0])))
+
+        hands = [stream for stream in ("left_hand", "right_hand") if stream in inputs]
+        if hands:
+            # Both hands in one forward pass
+            probs = np.asarray(models["sign"].predict_on_batch(np.concatenate([inputs[stream] for stream in hands])))
+            for i, stream in enumerate(hands):
+                self.windows[stream].append(int(np.argmax(probs[i])))
+
+    def _prediction(self):
+        """Rolling predictions over the current window, same output keys as /predict/*."""
+        message = {}
+        if "emotion" in self.tasks:
+            emotion, share = window_vote(list(self.windows["face"]))
+            message["emotion_prediction"] = EMOTION_LABELS[emotion] if emotion is not None else None
+            message["emotion_confidence"] = share
+        if "sign" in self.tasks:
+            left, left_share = window_vote(list(self.windows["left_hand"]))
+            right, right_share = window_vote(list(self.windows["right_hand"]))
+            message["sign_prediction"] = combine_hands(left, right)
+            # Only hands that were detected in the window voted (a hand out of view doesn't zero the confidence)
+            shares = [share for vote, share in ((left, left_share), (right, right_share)) if vote is not None]
+            message["sign_confidence"] = min(shares) if shares else 0.0
+        streams = (["face"] if "emotion" in self.tasks else []) + (["left_hand", "right_hand"] if "sign" in self.tasks else [])
+        message["window_frames"] = max(len(self.windows[stream]) for stream in streams)
+        return message
@@ -1,5 +1,5 @@
-import cv2
 import os
+from baara_preprocessing.video_io import VideoReader
 
 # Path to extracted face video
 face_video_path = "A:/Softwares/laragon/www/signnsync/interpretation/feature_extracted/face/face_test.mp4"
@@ -7,15 +7,12 @@ face_video_path = "A:/Softwares/laragon/www/signnsync/interpretation/feature_ext
 if os.path.exists(face_video_path):
     print(f"[DEBUG] Face video exists: {face_video_path}")
 
-    cap = cv2.VideoCapture(face_video_path)
+    cap = VideoReader(face_video_path)
     if not cap.isOpened():
         print("[ERROR] OpenCV failed to open extracted video!")
 
     frame_count = 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
+    for _ in cap.frames():
         frame_count += 1
 
     cap.release()
@@ -0,0 +1,57 @@
+import os
+import re
+import uuid
+import shutil
+from contextlib import contextmanager
+
+# ==========================
+# 🔹 PER-REQUEST JOB WORKSPACES
+# ==========================
+# Every request gets its own folder (keyed by a job ID) for the uploaded video
+# and any intermediate files, so overlapping requests never delete or overwrite
+# each other's data. The folder is removed when the request finishes.
+
+SAFE_JOB_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+def new_job_id():
+    """Returns a random, filesystem-safe job ID."""
+    return uuid.uuid4().hex
+
+def workspace_paths(root, job_id):
+    """Returns the paths used by one job inside root (nothing is created)."""
+    if not SAFE_JOB_ID.match(job_id):
+        raise ValueError(f"Invalid job ID '{job_id}'")
+
+    job_path = os.path.join(root, job_id)
+    return {
+        "job_id": job_id,
+        "root": job_path,
+        "video": os.path.join(job_path, "test.mp4"),
+        "feature": os.path.join(job_path, "feature_extracted"),
+        "frames": os.path.join(job_path, "frames"),
+        "preprocessed": os.path.join(job_path, "preprocessed"),
+    }
+
+def create_workspace(root, job_id=None):
+    """Creates <root>/<job_id>/ and returns its paths. Stage folders are created by the stages that write to them."""
+    paths = workspace_paths(root, job_id or new_job_id())
+    os.makedirs(paths["root"], exist_ok=False)
+    return paths
+
+def remove_workspace(paths):
+    """Deletes a job folder and everything in it."""
+    shutil.rmtree(paths["root"], ignore_errors=True)
+
+@contextmanager
+def job_workspace(root, job_id=None, keep=False):
+    """
+    Creates <root>/<job_id>/ and yields its paths (see workspace_paths), removing it afterwards.
+
+    keep: leave the folder on disk afterwards (debugging).
+    """
+    paths = create_workspace(root, job_id)
+    try:
+        yield paths
+    finally:
+        if not keep:
+            remove_workspace(paths)